@@ -15,11 +15,34 @@ class Settings(BaseSettings):
     database_url: str = Field(
         default="sqlite:///./backend/procurahub.db", env="DATABASE_URL"
     )
+    # Derived from DATABASE_URL (aiosqlite / asyncpg) when not set explicitly.
+    async_database_url: Optional[str] = Field(default=None, env="ASYNC_DATABASE_URL")
+    # Optional read replica used by analytics, listing and download endpoints.
+    database_read_url: Optional[str] = Field(default=None, env="DATABASE_READ_URL")
+    # How long a client stays pinned to the primary after it writes. The pin is
+    # returned as X-Read-Primary-Until and must be echoed by the client.
+    database_read_sticky_seconds: int = Field(default=10, env="DATABASE_READ_STICKY_SECONDS")
+    # Apply Alembic migrations on startup. Defaults to on outside production;
+    # production runs `alembic upgrade head` once per deploy instead. Workers
+    # serialise on a database lock, so only the first one does the work.
+    auto_migrate: Optional[bool] = Field(default=None, env="AUTO_MIGRATE")
     secret_key: str = Field(
         default="change-me-in-production", env="SECRET_KEY"
     )
     access_token_expire_minutes: int = Field(default=60, env="ACCESS_TOKEN_EXPIRE_MINUTES")
     algorithm: str = Field(default="HS256", env="JWT_ALGORITHM")
+    # Verified JWT claims are cached per worker until the token's exp.
+    # TOKEN_CACHE_ENABLED=false is the kill switch: every call decodes again.
+    token_cache_enabled: bool = Field(default=True, env="TOKEN_CACHE_ENABLED")
+    token_cache_size: int = Field(default=4096, ge=0, env="TOKEN_CACHE_SIZE")
+    # bcrypt cost factor; stored hashes with a different cost are rehashed at login.
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31, env="BCRYPT_ROUNDS")
+    # Processes verifying passwords off the event loop, per uvicorn worker: a
+    # host runs WEB_CONCURRENCY x PASSWORD_HASH_WORKERS of them.
+    password_hash_workers: int = Field(default=2, ge=1, env="PASSWORD_HASH_WORKERS")
+    # Logins allowed to wait for or occupy the pool before new ones get a 503.
+    password_hash_max_pending: int = Field(default=64, ge=1, env="PASSWORD_HASH_MAX_PENDING")
+    password_hash_retry_after_seconds: int = Field(default=2, env="PASSWORD_HASH_RETRY_AFTER_SECONDS")
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -33,6 +56,10 @@ class Settings(BaseSettings):
             raise ValueError(
                 "CRITICAL SECURITY ERROR: SECRET_KEY must be at least 32 characters long in production!"
             )
+        if self.environment == "production" and self.metrics_enabled and not self.metrics_token:
+            raise ValueError(
+                "SECURITY ERROR: METRICS_TOKEN must be set to serve /metrics in production"
+            )
 
     email_sender: str = Field(default="noreply@procurahub.local", env="EMAIL_SENDER")
     email_console_fallback: bool = Field(default=True, env="EMAIL_CONSOLE_FALLBACK")
@@ -44,9 +71,84 @@ class Settings(BaseSettings):
     smtp_password: Optional[str] = Field(default=None, env="SMTP_PASSWORD")
     smtp_use_tls: bool = Field(default=True, env="SMTP_USE_TLS")
 
+    # Role-to-recipient lists are cached per worker and cleared when users change.
+    notification_recipient_cache_seconds: int = Field(default=60, env="NOTIFICATION_RECIPIENT_CACHE_SECONDS")
+    # Maximum Bcc recipients per fan-out message (SMTP providers cap this).
+    notification_bcc_batch_size: int = Field(default=50, env="NOTIFICATION_BCC_BATCH_SIZE")
+    # How often each worker flushes due hourly/daily digests (0 disables the
+    # in-process loop; run scripts/send_notification_digests.py from cron instead).
+    notification_digest_poll_seconds: int = Field(default=300, env="NOTIFICATION_DIGEST_POLL_SECONDS")
+    # How long a flush may hold digest events before another one can take them
+    # over (covers a worker that died mid-send).
+    notification_digest_lease_seconds: int = Field(default=900, env="NOTIFICATION_DIGEST_LEASE_SECONDS")
+    # Local hour (in each user's timezone) at which daily digests go out.
+    notification_daily_digest_hour: int = Field(default=7, env="NOTIFICATION_DAILY_DIGEST_HOUR")
+
+    # Per-worker cache of a supplier's profile id, categories and invited RFQs.
+    supplier_context_cache_seconds: int = Field(default=60, env="SUPPLIER_CONTEXT_CACHE_SECONDS")
+
+    # Per-worker cache of invited supplier ids per RFQ for access checks.
+    rfq_access_cache_seconds: int = Field(default=300, env="RFQ_ACCESS_CACHE_SECONDS")
+    rfq_access_cache_size: int = Field(default=2048, env="RFQ_ACCESS_CACHE_SIZE")
+
+    # Per-worker cache of the grouped department statistics.
+    department_stats_cache_seconds: int = Field(default=120, env="DEPARTMENT_STATS_CACHE_SECONDS")
+
+    # Token-bucket rate limits: memory:// (per worker), sqlite:///path.db (one
+    # host, all workers) or redis://host:6379/0 (every instance).
+    rate_limit_enabled: bool = Field(default=True, env="RATE_LIMIT_ENABLED")
+    rate_limit_storage: str = Field(default="memory://", env="RATE_LIMIT_STORAGE")
+
+    # Server-Timing header with total and database time on every response.
+    server_timing_enabled: bool = Field(default=True, env="SERVER_TIMING_ENABLED")
+    # X-DB-Query-Count / X-DB-Time-Ms / X-DB-Max-Repeats response headers.
+    # Defaults to on outside production.
+    query_report_headers: Optional[bool] = Field(default=None, env="QUERY_REPORT_HEADERS")
+    # Log a possible N+1 when one statement shape runs this often in a request (0 disables).
+    query_repeat_threshold: int = Field(default=5, ge=0, env="QUERY_REPEAT_THRESHOLD")
+    # Fail requests that exceed their route's @query_budget with a 500 (CI and local runs).
+    query_budget_strict: bool = Field(default=False, env="QUERY_BUDGET_STRICT")
+
+    # Prometheus metrics at /metrics. With several workers set
+    # PROMETHEUS_MULTIPROC_DIR (see app/utils/metrics.py). When METRICS_TOKEN is
+    # set, scrapes must send it as a bearer token. Defaults to on outside
+    # production; enabling it in production requires METRICS_TOKEN.
+    metrics_enabled: Optional[bool] = Field(default=None, env="METRICS_ENABLED")
+    metrics_token: Optional[str] = Field(default=None, env="METRICS_TOKEN")
+
+    # On-demand profiling: a superadmin adds ?__profile=1 (or an "X-Profile: 1"
+    # header) to a request to have it sampled; the newest reports are listed
+    # at /api/admin/profiles as speedscope JSON. Reports are files in
+    # PROFILING_DIR, so every worker sharing that directory serves them all.
+    profiling_enabled: bool = Field(default=False, env="PROFILING_ENABLED")
+    profiling_interval_ms: float = Field(default=1.0, gt=0, env="PROFILING_INTERVAL_MS")
+    profiling_buffer_size: int = Field(default=20, ge=1, env="PROFILING_BUFFER_SIZE")
+    profiling_dir: Optional[Path] = Field(default=None, env="PROFILING_DIR")
+
+    # Response compression: brotli when the client accepts it and the optional
+    # package is installed, gzip otherwise. Only the listed media types are
+    # compressed (entries ending in "/" match a family); smaller bodies are not.
+    compression_enabled: bool = Field(default=True, env="COMPRESSION_ENABLED")
+    compression_minimum_size: int = Field(default=1024, ge=0, env="COMPRESSION_MINIMUM_SIZE")
+    compression_gzip_level: int = Field(default=6, ge=1, le=9, env="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=4, ge=0, le=11, env="COMPRESSION_BROTLI_QUALITY")
+    compression_content_types: List[str] = Field(
+        default_factory=lambda: [
+            "application/json",
+            "application/javascript",
+            "application/xml",
+            "image/svg+xml",
+            "text/",
+        ],
+        env="COMPRESSION_CONTENT_TYPES",
+    )
+
     upload_dir: Optional[Path] = Field(default=None, env="UPLOAD_DIR")
 
     invitation_batch_size: int = Field(default=25, env="INVITATION_BATCH_SIZE")
+    # Added to a supplier's category rotation score for every invitation left
+    # unanswered at the deadline, so non-responders are invited less often.
+    supplier_non_response_penalty: float = Field(default=0.5, env="SUPPLIER_NON_RESPONSE_PENALTY")
     cors_allow_origins: List[str] = Field(
         default_factory=lambda: ["http://localhost:5173", "http://127.0.0.1:5173"],
         env="CORS_ALLOW_ORIGINS",
@@ -64,6 +166,35 @@ class Settings(BaseSettings):
         project_root = Path(__file__).resolve().parents[2]
         return project_root / "uploads"
 
+    @property
+    def resolved_profiling_dir(self) -> Path:
+        """Resolve the directory request profiles are written to (not served like uploads)."""
+        if self.profiling_dir:
+            return Path(self.profiling_dir).resolve()
+        project_root = Path(__file__).resolve().parents[2]
+        return project_root / "profiles"
+
+    @property
+    def should_auto_migrate(self) -> bool:
+        """Whether the app applies pending migrations itself at startup."""
+        if self.auto_migrate is not None:
+            return self.auto_migrate
+        return self.environment != "production"
+
+    @property
+    def should_serve_metrics(self) -> bool:
+        """Whether /metrics is served and requests are measured."""
+        if self.metrics_enabled is not None:
+            return self.metrics_enabled
+        return self.environment != "production"
+
+    @property
+    def should_report_queries(self) -> bool:
+        """Whether responses carry the X-DB-* query headers."""
+        if self.query_report_headers is not None:
+            return self.query_report_headers
+        return self.environment != "production"
+
     @property
     def resolved_cors_origins(self) -> list[str]:
         """Return sanitized CORS origins list compatible with CORSMiddleware."""
@@ -1,32 +1,139 @@
 """Database connectivity and session management."""
 
+import math
+import time
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.sql.expression import UpdateBase
 
 from .config import get_settings
 
 
 settings = get_settings()
 
-connect_args = {}
 database_url = settings.database_url
+read_database_url = settings.database_read_url
 
-if database_url.startswith("sqlite"):
-    connect_args["check_same_thread"] = False
-    sqlite_path = database_url.split("sqlite:///")[-1]
-    db_file = Path(sqlite_path).resolve()
-    db_file.parent.mkdir(parents=True, exist_ok=True)
 
+def _connect_args(url: str) -> dict:
+    """Driver arguments for ``url``, creating the SQLite directory if needed."""
+    connect_args = {}
+    if url.startswith("sqlite"):
+        connect_args["check_same_thread"] = False
+        sqlite_path = url.split("sqlite:///")[-1]
+        db_file = Path(sqlite_path).resolve()
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+    return connect_args
+
+
+connect_args = _connect_args(database_url)
 engine = create_engine(database_url, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+read_engine: Optional[Engine] = (
+    create_engine(read_database_url, connect_args=_connect_args(read_database_url))
+    if read_database_url
+    else None
+)
+
+
+class RoutingSession(Session):
+    """Session that can send plain reads to a read replica.
+
+    Reads go to ``replica`` only when the session was opened with
+    ``info={"read_only": True}``. Flushes, bulk UPDATE/DELETE/INSERT
+    statements and every query after the session has flushed use the
+    primary, so a handler always reads its own writes. A single statement
+    can insist on the primary with ``bind_arguments={"primary": True}``.
+    """
+
+    def __init__(self, *args, replica: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, primary=False, **kw):
+        if (
+            self.replica is not None
+            and not primary
+            and self.info.get("read_only")
+            and not self.info.get("wrote")
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_session_wrote(session: Session, _flush_context) -> None:
+    session.info["wrote"] = True
+
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replica=read_engine
+)
 
 Base = declarative_base()
 
 
-def get_db() -> Generator:
+# Async drivers used for the non-blocking request path.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Translate a sync database URL into its async-driver equivalent."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+async_database_url = settings.async_database_url or to_async_url(database_url)
+async_engine = create_async_engine(async_database_url)
+async_read_engine = create_async_engine(to_async_url(read_database_url)) if read_database_url else None
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    replica=async_read_engine.sync_engine if async_read_engine else None,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+# ==================== Read-your-writes stickiness ====================
+# After a client writes, its reads stay on the primary for
+# ``database_read_sticky_seconds`` so replica lag never hides that write.
+# The pin travels with the client (see app/middleware/read_your_writes.py),
+# so it holds whichever worker or instance serves the next request.
+
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    """Return True when the client wrote recently and must read the primary.
+
+    The timestamp comes from the client, so only one within the sticky
+    window counts; a far-future or non-finite value would pin it for good.
+    """
+    if read_engine is None:
+        return True
+    try:
+        until = float(request.headers.get(READ_PRIMARY_HEADER, 0))
+    except ValueError:
+        return False
+    now = time.time()
+    return math.isfinite(until) and now < until <= now + settings.database_read_sticky_seconds
+
+
+def get_db(request: Request) -> Generator:
     """Yield a database session within a managed transaction scope."""
     db = SessionLocal()
     try:
@@ -38,3 +145,45 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+
+def get_read_db(request: Request) -> Generator:
+    """Yield a session whose reads may be served by the read replica.
+
+    Falls back to the primary when no replica is configured or the client
+    wrote within the sticky window.
+    """
+    db = SessionLocal(info={"read_only": not is_pinned_to_primary(request)})
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async database session within a managed transaction scope.
+
+    Relationships are never lazy-loaded on this path, so handlers must
+    eager-load (``selectinload``) everything they serialise.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of :func:`get_read_db`."""
+    async with AsyncSessionLocal(info={"read_only": not is_pinned_to_primary(request)}) as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
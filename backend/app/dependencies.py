@@ -1,21 +1,30 @@
 """Reusable FastAPI dependencies."""
 
-from fastapi import Depends, HTTPException, status
+from typing import Optional, TypeVar
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from .database import get_db
+from .database import get_async_db, get_db
 from .models import SupplierProfile, User, UserRole
+from .services.supplier_context import (
+    SupplierContext,
+    supplier_context_for,
+    supplier_context_for_async,
+)
 from .utils.security import decode_token
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
+_Profile = TypeVar("_Profile", SupplierProfile, SupplierContext)
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
-    """Return the currently authenticated user."""
+
+def _user_id_from_token(token: str) -> int:
+    """Decode the bearer token and return the subject user id."""
     payload = decode_token(token)
     if not payload or "sub" not in payload:
         raise HTTPException(
@@ -23,14 +32,46 @@ def get_current_user(
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return int(payload["sub"])
+
 
-    user_id = int(payload["sub"])
-    user = db.get(User, user_id)
+def _ensure_active(user: User | None) -> User:
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
     return user
 
 
+def _ensure_role(current_user: User, roles: tuple[UserRole, ...]) -> User:
+    # Ensure we are comparing enum values or the enum object itself
+    user_role_value = current_user.role.value if isinstance(current_user.role, UserRole) else current_user.role
+
+    allowed_role_values = [role.value for role in roles]
+
+    if user_role_value not in allowed_role_values and current_user.role not in roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not authorized. Role '{user_role_value}' is not in allowed roles."
+        )
+    return current_user
+
+
+def _ensure_supplier_profile(profile: Optional[_Profile]) -> _Profile:
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Supplier profile not found",
+        )
+    return profile
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> User:
+    """Return the currently authenticated user."""
+    user_id = _user_id_from_token(token)
+    return _ensure_active(db.get(User, user_id))
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -44,17 +85,7 @@ def require_roles(*roles: UserRole):
     """Dependency to enforce role-based access control."""
 
     def dependency(current_user: User = Depends(get_current_active_user)) -> User:
-        # Ensure we are comparing enum values or the enum object itself
-        user_role_value = current_user.role.value if isinstance(current_user.role, UserRole) else current_user.role
-        
-        allowed_role_values = [role.value for role in roles]
-        
-        if user_role_value not in allowed_role_values and current_user.role not in roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, 
-                detail=f"Not authorized. Role '{user_role_value}' is not in allowed roles."
-            )
-        return current_user
+        return _ensure_role(current_user, roles)
 
     return dependency
 
@@ -65,16 +96,68 @@ def get_current_supplier_profile(
 ) -> SupplierProfile:
     """Fetch the supplier profile for the current supplier user."""
     from sqlalchemy.orm import joinedload
-    
+
     profile = (
         db.query(SupplierProfile)
         .options(joinedload(SupplierProfile.categories))
         .filter(SupplierProfile.user_id == current_user.id)
         .first()
     )
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Supplier profile not found",
-        )
-    return profile
+    return _ensure_supplier_profile(profile)
+
+
+def get_current_supplier_context(
+    request: Request,
+    current_user: User = Depends(require_roles(UserRole.supplier)),
+    db: Session = Depends(get_db),
+) -> SupplierContext:
+    """Cached profile id, categories and invited RFQs for the current supplier.
+
+    Prefer this over :func:`get_current_supplier_profile` when the handler
+    does not need the full ORM profile.
+    """
+    return _ensure_supplier_profile(supplier_context_for(request, db, current_user.id))
+
+
+# ==================== Async variants ====================
+# Used by handlers running on the AsyncSession path so that authentication
+# does not pull a threadpool worker back into the request.
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Return the currently authenticated user using the async session."""
+    user_id = _user_id_from_token(token)
+    return _ensure_active(await db.get(User, user_id))
+
+
+def require_roles_async(*roles: UserRole):
+    """Async counterpart of :func:`require_roles`."""
+
+    async def dependency(current_user: User = Depends(get_current_user_async)) -> User:
+        return _ensure_role(current_user, roles)
+
+    return dependency
+
+
+async def get_current_supplier_profile_async(
+    current_user: User = Depends(require_roles_async(UserRole.supplier)),
+    db: AsyncSession = Depends(get_async_db),
+) -> SupplierProfile:
+    """Fetch the supplier profile for the current supplier user (async)."""
+    result = await db.execute(
+        select(SupplierProfile)
+        .options(selectinload(SupplierProfile.categories))
+        .where(SupplierProfile.user_id == current_user.id)
+    )
+    return _ensure_supplier_profile(result.scalars().first())
+
+
+async def get_current_supplier_context_async(
+    request: Request,
+    current_user: User = Depends(require_roles_async(UserRole.supplier)),
+    db: AsyncSession = Depends(get_async_db),
+) -> SupplierContext:
+    """Async counterpart of :func:`get_current_supplier_context`."""
+    return _ensure_supplier_profile(await supplier_context_for_async(request, db, current_user.id))
@@ -1,19 +1,31 @@
 """FastAPI application entrypoint for ProcuraHub."""
 
+import asyncio
 import logging
+import secrets
 import sys
+import time
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, Response
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 
 from .config import get_settings
-from .database import Base, engine
+from .database import READ_PRIMARY_HEADER, engine
+from .middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+    SecurityHeadersMiddleware,
+)
 from .routers import api_router
-from .utils.migrations import run_startup_migrations
+from .utils.metrics import mark_process_dead, render_latest
+from .utils.migrations import check_schema_revision, upgrade_database
 
 logger = logging.getLogger("procurahub")
 # Ensure INFO logs are visible in development to aid diagnostics
@@ -24,52 +36,54 @@ logging.basicConfig(
 )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    digest_task = None
+    if settings.notification_digest_poll_seconds > 0:
+        from .services.notifications import digest_worker
+
+        digest_task = asyncio.create_task(digest_worker(settings.notification_digest_poll_seconds))
+    try:
+        yield
+    finally:
+        if digest_task is not None:
+            digest_task.cancel()
+        from .services.password_hashing import shutdown_pool
+
+        shutdown_pool()
+        mark_process_dead()
+
+
 def create_app() -> FastAPI:
+    # Per-phase wall time in milliseconds, reported by `python -m app.startup_profile`.
+    phases: dict[str, float] = {"imports": round((time.perf_counter() - _import_started) * 1000, 2)}
+    phase_started = time.perf_counter()
+
+    def end_phase(name: str) -> None:
+        nonlocal phase_started
+        now = time.perf_counter()
+        phases[name] = round((now - phase_started) * 1000, 2)
+        phase_started = now
+
     settings = get_settings()
 
-    app = FastAPI(title=settings.app_name)
-    
-    # Initialize rate limiter
-    limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-    # Security headers middleware
-    @app.middleware("http")
-    async def add_security_headers(request: Request, call_next):
-        response = await call_next(request)
-        
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-        
-        # XSS protection (legacy but still useful)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # HTTPS enforcement (only in production)
-        if settings.environment == "production":
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        
-        # Content Security Policy
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' data:; "
-            "connect-src 'self'; "
-            "frame-ancestors 'none';"
-        )
-        
-        # Restrict browser features
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        
-        # Referrer policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        return response
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
+    app.state.startup_phases = phases
+
+    # Innermost, so a profile shows the route rather than the middleware stack.
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware, interval=settings.profiling_interval_ms / 1000)
+    app.add_middleware(
+        QueryStatsMiddleware,
+        server_timing=settings.server_timing_enabled,
+        report_headers=settings.should_report_queries,
+        repeat_threshold=settings.query_repeat_threshold,
+        strict=settings.query_budget_strict,
+    )
+    app.add_middleware(SecurityHeadersMiddleware, hsts=settings.environment == "production")
+    if settings.database_read_url:
+        app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=settings.database_read_sticky_seconds)
 
     app.add_middleware(
         CORSMiddleware,
@@ -77,19 +91,40 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
         allow_headers=["*"],  # Allow all headers for form submissions
-        expose_headers=["Content-Disposition"],
+        expose_headers=["Content-Disposition", READ_PRIMARY_HEADER],
     )
     
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+            content_types=settings.compression_content_types,
+        )
+    # Outermost, so request durations include every other middleware.
+    if settings.should_serve_metrics:
+        app.add_middleware(MetricsMiddleware)
+
     # Log CORS configuration for debugging
     logger.info(f"CORS configured with origins: {settings.resolved_cors_origins}")
     logger.info(f"CORS raw config: {settings.cors_allow_origins}")
-
-    Base.metadata.create_all(bind=engine)
-    run_startup_migrations(engine)
+    end_phase("app_and_middleware")
+
+    # Schema changes are versioned with Alembic and applied once per deploy
+    # (`alembic upgrade head`); workers only verify the revision. With
+    # AUTO_MIGRATE they apply it themselves, one at a time under the
+    # migration lock.
+    if settings.should_auto_migrate:
+        upgrade_database(engine)
+    else:
+        check_schema_revision(engine)
+    end_phase("schema_check")
 
     upload_dir = settings.resolved_upload_dir
     upload_dir.mkdir(parents=True, exist_ok=True)
     app.mount("/uploads", StaticFiles(directory=upload_dir), name="uploads")
+    end_phase("uploads_mount")
 
     app.include_router(api_router)
 
@@ -97,6 +132,18 @@ def create_app() -> FastAPI:
     def healthcheck() -> dict[str, str]:
         return {"status": "ok"}
 
+    if settings.should_serve_metrics:
+        @app.get("/metrics", include_in_schema=False)
+        def metrics(request: Request) -> Response:
+            expected = f"Bearer {settings.metrics_token}"
+            if settings.metrics_token and not secrets.compare_digest(
+                request.headers.get("authorization", "").encode(), expected.encode()
+            ):
+                raise HTTPException(status_code=401, detail="Invalid metrics token")
+            body, content_type = render_latest()
+            return Response(content=body, media_type=content_type)
+
+    end_phase("routers")
     return app
 
 
@@ -0,0 +1,17 @@
+"""ASGI middleware for ProcuraHub."""
+
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .query_stats import QueryStatsMiddleware
+from .read_your_writes import ReadYourWritesMiddleware
+from .security_headers import SecurityHeadersMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "QueryStatsMiddleware",
+    "ReadYourWritesMiddleware",
+    "SecurityHeadersMiddleware",
+]
@@ -0,0 +1,194 @@
+"""gzip / brotli response compression.
+
+A pure ASGI middleware (no ``BaseHTTPMiddleware`` task per request) that
+compresses a response when all of these hold:
+
+* the client accepts ``br`` or ``gzip`` (brotli is preferred and needs the
+  optional ``brotli`` package);
+* the media type is on the allow-list. PDFs, ZIPs and images served by
+  ``FileResponse`` are already compressed and are left alone;
+* the response has no ``Content-Encoding`` yet, so anything precompressed
+  upstream passes through untouched, and no ``Content-Range``;
+* the body reaches ``minimum_size`` bytes. Small bodies cost more to
+  compress than they save.
+
+Bodies are buffered only until the threshold is reached. A response that
+completes within the buffer is compressed in one go and keeps a
+``Content-Length``; longer streams are compressed chunk by chunk. A strong
+``ETag`` on a compressed response is weakened.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None  # type: ignore[assignment]
+
+
+DEFAULT_CONTENT_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted, refused = set(), set()
+    for part in header.split(","):
+        coding, *params = (piece.strip() for piece in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            (accepted if quality > 0 else refused).add(coding.lower())
+    if "*" in accepted:
+        # "*" covers only the codings the client did not name with q=0.
+        accepted.update({"br", "gzip"} - refused)
+    return accepted - refused
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Iterable[str] = DEFAULT_CONTENT_TYPES,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        # Entries ending in "/" match a whole family ("text/").
+        self.content_types = tuple(content_type.strip().lower() for content_type in content_types)
+
+    def _choose_encoding(self, scope: Scope) -> Optional[str]:
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        if media_type == "text/event-stream":
+            # Compressors hold back output; events must reach the client as sent.
+            return False
+        return bool(media_type) and any(
+            media_type.startswith(allowed) if allowed.endswith("/") else media_type == allowed
+            for allowed in self.content_types
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        buffered: list[bytes] = []
+        buffered_size = 0
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_start(compressed: bool, content_length: Optional[int] = None) -> None:
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if compressed:
+                headers["Content-Encoding"] = encoding
+                # The compressed bytes differ from what a strong ETag (e.g. a
+                # FileResponse's) describes; a weak one still revalidates.
+                etag = headers.get("ETag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                if content_length is None:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(content_length)
+            await send(start)
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, buffered_size, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                passthrough = not self._compressible(Headers(raw=message["headers"]))
+                if passthrough:
+                    await send(message)
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                chunk = compressor.compress(body) if body else b""
+                if not more_body:
+                    chunk += compressor.finish()
+                if chunk or not more_body:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            buffered.append(body)
+            buffered_size += len(body)
+            if buffered_size < self.minimum_size:
+                if more_body:
+                    return
+                # Finished below the threshold: send it as it was.
+                await send_start(compressed=False)
+                await send({"type": "http.response.body", "body": b"".join(buffered)})
+                return
+
+            compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+            data = compressor.compress(b"".join(buffered))
+            buffered.clear()
+            if not more_body:
+                data += compressor.finish()
+                await send_start(compressed=True, content_length=len(data))
+                await send({"type": "http.response.body", "body": data})
+                return
+            await send_start(compressed=True)
+            await send({"type": "http.response.body", "body": data, "more_body": True})
+
+        await self.app(scope, receive, send_compressed)
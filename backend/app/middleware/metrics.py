@@ -0,0 +1,67 @@
+"""Per-route request metrics.
+
+A pure ASGI middleware recording, for every HTTP request, the status code
+and the time until the response body was fully sent, labelled with the
+route template (``/api/rfqs/{rfq_id}``) rather than the raw path so the
+number of series stays bounded. Requests that match no route share the
+``unmatched`` label.
+
+The application call returns only after the body has been sent and the
+work that follows it is done: the response's background tasks and the
+teardown of yield dependencies, such as the session commit in ``get_db``.
+A middleware cannot tell those apart, so every request in that window is
+counted as finishing.
+"""
+
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils import metrics
+
+
+def _route_label(scope: Scope) -> str:
+    # Routers are included lazily, so the matched route only knows its path
+    # relative to its own router; FastAPI keeps the full template alongside.
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path_format", None) or getattr(scope.get("route"), "path_format", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        body_sent = False
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, body_sent
+            await send(message)
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                body_sent = True
+                method, route = scope["method"], _route_label(scope)
+                metrics.HTTP_REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - started)
+                metrics.HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+                metrics.HTTP_REQUESTS_FINISHING.inc()
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            if body_sent:
+                metrics.HTTP_REQUESTS_FINISHING.dec()
+            else:
+                # The app failed or the client left before the response ended.
+                route = _route_label(scope)
+                metrics.HTTP_REQUESTS.labels(scope["method"], route, str(status_code)).inc()
+                metrics.HTTP_REQUEST_SECONDS.labels(scope["method"], route).observe(time.perf_counter() - started)
@@ -0,0 +1,109 @@
+"""On-demand profiling of single requests.
+
+A pure ASGI middleware, installed only when ``PROFILING_ENABLED`` is set.
+A request carrying ``?__profile=1`` or an ``X-Profile: 1`` header from an
+active superadmin is run under :class:`~app.utils.profiling.StackSampler`.
+The report is written to ``PROFILING_DIR`` and its id is returned in the
+``X-Profile-Id`` response header, to be fetched from
+``/api/admin/profiles/{id}`` through any worker. For anyone else the markers are ignored.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..database import AsyncSessionLocal
+from ..models import User, UserRole
+from ..utils import profiling, query_stats
+from ..utils.security import decode_token
+
+
+logger = logging.getLogger("procurahub.profiling")
+
+TRUTHY = {"1", "true", "yes"}
+
+
+def _wants_profile(scope: Scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == b"x-profile" and value.decode("latin-1").lower() in TRUTHY:
+            return True
+    query = scope.get("query_string", b"").decode("latin-1")
+    return any(key == "__profile" and value.lower() in TRUTHY for key, value in parse_qsl(query))
+
+
+async def _superadmin_id(scope: Scope) -> Optional[int]:
+    """The id of the superadmin who sent the request, if it was one."""
+    authorization = ""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            authorization = value.decode("latin-1")
+            break
+    scheme, _, token = authorization.partition(" ")
+    payload = decode_token(token) if scheme.lower() == "bearer" and token else None
+    if not payload or "sub" not in payload:
+        return None
+    # Not the route's work: keep it out of its statement count and budget.
+    with query_stats.untracked():
+        async with AsyncSessionLocal() as db:
+            user = await db.get(User, int(payload["sub"]))
+    if not user or not user.is_active:
+        return None
+    role = user.role.value if isinstance(user.role, UserRole) else user.role
+    return user.id if role == UserRole.superadmin.value else None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, interval: float = 0.001) -> None:
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        user_id = await _superadmin_id(scope)
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        report_id = profiling.new_report_id()
+        sampler = profiling.StackSampler(sys._getframe(), self.interval)
+        status_code = 500
+
+        async def send_profiled(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", ()), (b"x-profile-id", report_id.encode())]}
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Background tasks run after this; they are not part of the response time.
+                sampler.stop()
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_profiled)
+        finally:
+            sampler.stop()
+            label = f"{scope['method']} {scope['path']}"
+            report = profiling.ProfileReport(
+                id=report_id,
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                duration_ms=round(sampler.duration * 1000, 1),
+                sample_count=sampler.sample_count,
+                user_id=user_id,
+            )
+            try:
+                await asyncio.to_thread(profiling.save_report, report, sampler.to_speedscope(label))
+            except OSError:
+                logger.exception("Could not store the profile of %s", label)
+            else:
+                logger.info("Profiled %s in %.1f ms (%s)", label, sampler.duration * 1000, report_id)
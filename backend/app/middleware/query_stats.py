@@ -0,0 +1,105 @@
+"""Per-request database instrumentation.
+
+A pure ASGI middleware that collects :mod:`app.utils.query_stats` for
+each request. When the response headers go out it:
+
+* adds ``Server-Timing``: the time until the headers were sent
+  (``total``) and the database time (``db``, with the statement count);
+* adds ``X-DB-Query-Count``, ``X-DB-Time-Ms`` and ``X-DB-Max-Repeats``
+  when ``report_headers`` is on (outside production by default);
+* logs a warning for each statement fingerprint repeated at least
+  ``repeat_threshold`` times (a likely N+1), and for a route that went
+  over its :func:`~app.utils.query_stats.query_budget`;
+* in ``strict`` mode, replaces the response of a route that went over its
+  budget with a 500. CI and local runs use this so regressions fail loudly.
+
+Statements issued while a streaming body is being sent are not counted.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils import query_stats
+
+
+logger = logging.getLogger("procurahub.queries")
+
+
+class QueryStatsMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        server_timing: bool = True,
+        report_headers: bool = False,
+        repeat_threshold: int = 5,
+        strict: bool = False,
+    ) -> None:
+        self.app = app
+        self.server_timing = server_timing
+        self.report_headers = report_headers
+        self.repeat_threshold = repeat_threshold
+        self.strict = strict
+
+    def _check(self, scope: Scope, stats: query_stats.QueryStats) -> bool:
+        """Log what the request did; return False when it broke a strict budget."""
+        label = f"{scope.get('method')} {scope.get('path')}"
+        for statement, count in stats.repeated(self.repeat_threshold):
+            logger.warning("Possible N+1 in %s: %d x %s", label, count, statement[:300])
+        budget = query_stats.budget_for(scope.get("endpoint"))
+        if budget is not None and stats.count > budget:
+            logger.warning("%s issued %d SQL statements (budget %d)", label, stats.count, budget)
+            return not self.strict
+        logger.debug("%s issued %d SQL statements in %.1f ms", label, stats.count, stats.seconds * 1000)
+        return True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats, token = query_stats.track(fingerprints=self.report_headers or self.repeat_threshold > 0)
+        rejected = False
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal rejected
+            if rejected:
+                return
+            if message["type"] != "http.response.start":
+                await send(message)
+                return
+
+            headers = list(message.get("headers", ()))
+            if not self._check(scope, stats):
+                rejected = True
+                budget = query_stats.budget_for(scope.get("endpoint"))
+                body = json.dumps(
+                    {"detail": f"Query budget exceeded: {stats.count} SQL statements (budget {budget})"}
+                ).encode()
+                headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+                message = {"type": "http.response.start", "status": 500}
+            if self.server_timing:
+                total_ms = (time.perf_counter() - started) * 1000
+                headers.append((
+                    b"server-timing",
+                    f'total;dur={total_ms:.1f}, db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'.encode(),
+                ))
+            if self.report_headers:
+                headers.extend((
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.seconds * 1000:.1f}".encode()),
+                    (b"x-db-max-repeats", str(stats.max_repeats).encode()),
+                ))
+            await send({**message, "headers": headers})
+            if rejected:
+                await send({"type": "http.response.body", "body": body})
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats.untrack(token)
@@ -0,0 +1,44 @@
+"""Read-your-writes pinning for the read replica.
+
+A pure ASGI middleware, installed only when ``DATABASE_READ_URL`` is set.
+Every successful POST, PUT, PATCH or DELETE response carries
+``X-Read-Primary-Until``: a Unix timestamp ``DATABASE_READ_STICKY_SECONDS``
+ahead. The client echoes the header on its following requests and
+:func:`app.database.is_pinned_to_primary` keeps those reads on the primary
+until it passes, whichever worker or instance serves them.
+
+The pin follows the request method rather than observed flushes because
+the session commits in the dependency teardown, after the response has
+been sent.
+"""
+
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..database import READ_PRIMARY_HEADER
+
+
+_PIN_HEADER = READ_PRIMARY_HEADER.lower().encode()
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp, sticky_seconds: float = 10) -> None:
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = f"{time.time() + self.sticky_seconds:.3f}".encode()
+                message = {**message, "headers": [*message.get("headers", ()), (_PIN_HEADER, until)]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
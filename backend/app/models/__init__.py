@@ -1,6 +1,6 @@
 """Database models for the ProcuraHub application."""
 
-from .user import User, UserRole
+from .user import NotificationFrequency, User, UserRole
 from .supplier import (
     SupplierProfile,
     SupplierCategory,
@@ -14,8 +14,10 @@ from .message import Message, MessageStatus
 from .request import PurchaseRequest, RequestStatus, RequestDocument
 from .department import Department
 from .company_settings import CompanySettings
+from .notification import NotificationEvent
 
 __all__ = [
+    "NotificationFrequency",
     "User",
     "UserRole",
     "SupplierProfile",
@@ -37,4 +39,5 @@ __all__ = [
     "RequestDocument",
     "Department",
     "CompanySettings",
+    "NotificationEvent",
 ]
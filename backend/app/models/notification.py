@@ -0,0 +1,26 @@
+"""Queued notification events for digest delivery."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, func
+
+from ..database import Base
+
+
+class NotificationEvent(Base):
+    """A notification held back for a user who receives hourly or daily digests."""
+
+    __tablename__ = "notification_events"
+    __table_args__ = (
+        # Pending-event scans filter on sent_at IS NULL and group by user.
+        Index("ix_notification_events_pending", "sent_at", "user_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    # Lease held by the flush sending this event; expired leases are reclaimed.
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    claim_token = Column(String(32), nullable=True)
@@ -9,6 +9,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -58,6 +59,10 @@ class RFQ(Base):
 
 class RFQInvitation(Base):
     __tablename__ = "rfq_invitations"
+    __table_args__ = (
+        # Serves every (rfq, supplier) access check and prevents double invitations.
+        Index("uq_rfq_invitations_rfq_supplier", "rfq_id", "supplier_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     rfq_id = Column(Integer, ForeignKey("rfqs.id", ondelete="CASCADE"), nullable=False)
@@ -120,6 +125,12 @@ class Quotation(Base):
     finance_approval_requested_by = relationship("User", foreign_keys=[finance_approval_requested_by_id])
     marked_delivered_by = relationship("User", foreign_keys=[marked_delivered_by_id])
 
+    # One quotation per supplier per RFQ, enforced by the database so
+    # concurrent submissions cannot both succeed.
+    __table_args__ = (
+        Index("uq_rfq_quotations_rfq_supplier", "rfq_id", "supplier_id", unique=True),
+    )
+
     @property
     def supplier_name(self) -> str | None:
         """Convenience accessor for supplier company name."""
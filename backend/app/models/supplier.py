@@ -6,7 +6,9 @@ from sqlalchemy import (
     Column,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -68,9 +70,25 @@ class SupplierCategory(Base):
     name = Column(String(100), nullable=False, index=True)
     category_type = Column(Enum(SupplierCategoryType), nullable=False, default=SupplierCategoryType.primary)
 
+    # Per-category fairness queue used by select_suppliers_for_rfq. Each
+    # invitation adds 1 to rotation_score and each unanswered invitation adds
+    # the configured non-response penalty; lowest score is invited first.
+    invitations_sent = Column(Integer, nullable=False, default=0, server_default="0")
+    last_invited_at = Column(DateTime(timezone=True), nullable=True)
+    rotation_score = Column(Float, nullable=False, default=0, server_default="0")
+
     supplier = relationship("SupplierProfile", back_populates="categories")
 
-    __table_args__ = (UniqueConstraint("supplier_id", "name", name="uq_supplier_category"),)
+    __table_args__ = (
+        UniqueConstraint("supplier_id", "name", name="uq_supplier_category"),
+        Index(
+            "ix_supplier_categories_rotation",
+            "name",
+            "rotation_score",
+            "last_invited_at",
+            "supplier_id",
+        ),
+    )
 
 
 class SupplierDocumentType(str, enum.Enum):
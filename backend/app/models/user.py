@@ -18,6 +18,12 @@ class UserRole(str, enum.Enum):
     supplier = "Supplier"
 
 
+class NotificationFrequency(str, enum.Enum):
+    immediate = "immediate"  # One email per event
+    hourly = "hourly"  # Summary at the top of each hour
+    daily = "daily"  # Summary once a day at NOTIFICATION_DAILY_DIGEST_HOUR local time
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -28,6 +34,12 @@ class User(Base):
     role = Column(Enum(UserRole, values_callable=lambda x: [e.value for e in x]), nullable=False, index=True)
     is_active = Column(Boolean, default=True)
     timezone = Column(String(50), default="Africa/Cairo")  # User's timezone
+    notification_frequency = Column(
+        String(20),
+        nullable=False,
+        default=NotificationFrequency.immediate.value,
+        server_default=NotificationFrequency.immediate.value,
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     supplier_profile = relationship(
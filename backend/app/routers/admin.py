@@ -1,13 +1,15 @@
 """Admin endpoints for managing users, suppliers, and categories."""
 
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 
 from ..config import get_settings
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..dependencies import require_roles
 from ..models import (
     CompanySettings,
@@ -33,12 +35,15 @@ from ..schemas import (
     CompanySettingsCreate,
     CompanySettingsRead,
     CompanySettingsUpdate,
+    ProfileSummary,
     UserCreate,
     UserRead,
 )
 from ..schemas.supplier import SupplierCreate
 from ..services.auth import create_user, get_user_by_email
+from ..services.department_stats import department_stats
 from ..services.file_storage import save_upload_file
+from ..utils import profiling
 
 router = APIRouter()
 settings = get_settings()
@@ -85,10 +90,23 @@ def _serialize_supplier_categories(categories: List[SupplierCategory]) -> List[d
     return serializable
 
 
+def _serialize_supplier_documents(documents: List[SupplierDocument]) -> List[dict]:
+    return [
+        {
+            "id": document.id,
+            "document_type": document.document_type.value,
+            "original_filename": document.original_filename,
+            "file_path": document.file_path,
+            "uploaded_at": document.uploaded_at,
+        }
+        for document in documents
+    ]
+
+
 # ==================== User Management ====================
 @router.get("/users", response_model=List[UserRead])
 def list_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles(UserRole.superadmin)),
 ):
     """List all users in the system."""
@@ -155,7 +173,7 @@ def delete_user(
 # ==================== Department Management ====================
 @router.get("/departments", response_model=List[dict])
 def list_departments(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles(UserRole.superadmin)),
 ):
     """List all departments (SuperAdmin only)."""
@@ -167,14 +185,28 @@ def list_departments(
             "id": dept.id,
             "name": dept.name,
             "description": dept.description,
-            "head_count": db.query(User).filter(
-                User.role == UserRole.head_of_department
-            ).count(),
+            "head_count": 1 if dept.head_of_department_id is not None else 0,
         }
         for dept in departments
     ]
 
 
+@router.get("/departments/stats", response_model=List[dict])
+def get_department_stats(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(
+        require_roles(UserRole.superadmin, UserRole.procurement, UserRole.head_of_department)
+    ),
+):
+    """Request counts by status and awarded spend per department.
+
+    Heads of Department only see the departments they head.
+    """
+    if current_user.role == UserRole.head_of_department:
+        return department_stats(db, head_of_department_id=current_user.id)
+    return department_stats(db)
+
+
 @router.post("/departments", response_model=dict, status_code=status.HTTP_201_CREATED)
 def create_department(
     name: str = Form(...),
@@ -222,12 +254,8 @@ def delete_department(
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
     
-    # Check if department has HODs assigned
-    hod_count = db.query(User).filter(
-        User.role == UserRole.head_of_department
-    ).count()
-    
-    if hod_count > 0:
+    # Check if department has a HOD assigned
+    if department.head_of_department_id is not None:
         raise HTTPException(
             status_code=400,
             detail="Cannot delete department with assigned Heads of Department"
@@ -241,15 +269,17 @@ def delete_department(
 # ==================== Supplier Management ====================
 @router.get("/suppliers", response_model=List[dict])
 def list_suppliers(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles(UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer)),
 ):
     """List all registered suppliers (SuperAdmin, Procurement, and Procurement Officers)."""
+    # selectinload keeps one row per supplier; joinedload on two collections
+    # multiplied every supplier by categories x documents.
     suppliers = (
         db.query(SupplierProfile, User)
         .options(
-            joinedload(SupplierProfile.categories),
-            joinedload(SupplierProfile.documents),
+            selectinload(SupplierProfile.categories),
+            selectinload(SupplierProfile.documents),
         )
         .join(User, SupplierProfile.user_id == User.id)
         .order_by(SupplierProfile.created_at.desc())
@@ -271,21 +301,112 @@ def list_suppliers(
             "user_email": user.email,
             "user_active": user.is_active,
             "categories": _serialize_supplier_categories(profile.categories),
-            "documents": [
-                {
-                    "id": document.id,
-                    "document_type": document.document_type.value,
-                    "original_filename": document.original_filename,
-                    "file_path": document.file_path,
-                    "uploaded_at": document.uploaded_at,
-                }
-                for document in profile.documents
-            ],
+            "documents": _serialize_supplier_documents(profile.documents),
         }
         for profile, user in suppliers
     ]
 
 
+DIRECTORY_EXPANSIONS = {"categories", "documents"}
+
+
+@router.get("/suppliers/directory", response_model=dict)
+def supplier_directory(
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    category: Optional[str] = Query(None, description="Supplier category name"),
+    active: Optional[bool] = Query(None, description="Filter on the supplier's login being active"),
+    currency: Optional[str] = Query(None, max_length=16),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    name: Optional[str] = Query(None, max_length=255, description="Company name prefix"),
+    expand: Optional[str] = Query(None, description="Comma-separated: categories, documents"),
+    db: Session = Depends(get_read_db),
+    _: User = Depends(require_roles(UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer)),
+):
+    """Page through suppliers, newest first, with server-side filters.
+
+    Pages are keyed on the supplier id (``cursor``), so deep pages cost the
+    same as the first. Rows carry only directory columns; categories and
+    documents are loaded with one extra query each when requested through
+    ``expand``.
+    """
+    expansions = {item.strip() for item in (expand or "").split(",") if item.strip()}
+    unknown = expansions - DIRECTORY_EXPANSIONS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown expansion(s): {', '.join(sorted(unknown))}",
+        )
+
+    query = (
+        db.query(SupplierProfile, User.email, User.is_active)
+        .join(User, SupplierProfile.user_id == User.id)
+        .options(
+            load_only(
+                SupplierProfile.id,
+                SupplierProfile.supplier_number,
+                SupplierProfile.company_name,
+                SupplierProfile.contact_email,
+                SupplierProfile.preferred_currency,
+                SupplierProfile.created_at,
+            )
+        )
+    )
+    if "categories" in expansions:
+        query = query.options(selectinload(SupplierProfile.categories))
+    if "documents" in expansions:
+        query = query.options(selectinload(SupplierProfile.documents))
+
+    if cursor is not None:
+        query = query.filter(SupplierProfile.id < cursor)
+    if category:
+        query = query.filter(
+            SupplierProfile.id.in_(
+                select(SupplierCategory.supplier_id).where(SupplierCategory.name == category)
+            )
+        )
+    if active is not None:
+        query = query.filter(User.is_active == active)
+    if currency:
+        query = query.filter(SupplierProfile.preferred_currency == currency.upper())
+    if created_from:
+        query = query.filter(SupplierProfile.created_at >= created_from)
+    if created_to:
+        query = query.filter(SupplierProfile.created_at < created_to)
+    if name:
+        escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.filter(SupplierProfile.company_name.ilike(f"{escaped}%", escape="\\"))
+
+    # Ids are assigned in creation order, so id order is newest-first order.
+    rows = query.order_by(SupplierProfile.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+
+    items = []
+    for profile, user_email, user_active in page:
+        item = {
+            "id": profile.id,
+            "supplier_number": profile.supplier_number,
+            "company_name": profile.company_name,
+            "contact_email": profile.contact_email,
+            "preferred_currency": profile.preferred_currency,
+            "created_at": profile.created_at,
+            "user_email": user_email,
+            "user_active": user_active,
+        }
+        if "categories" in expansions:
+            item["categories"] = _serialize_supplier_categories(profile.categories)
+        if "documents" in expansions:
+            item["documents"] = _serialize_supplier_documents(profile.documents)
+        items.append(item)
+
+    return {
+        "items": items,
+        "next_cursor": page[-1][0].id if len(rows) > limit else None,
+        "limit": limit,
+    }
+
+
 @router.post("/suppliers", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_supplier_by_procurement(
     background_tasks: BackgroundTasks,
@@ -423,8 +544,8 @@ async def create_supplier_by_procurement(
     settings = get_settings()
     app_url = "https://procurehub.pages.dev" if settings.environment == "production" else "http://localhost:5173"
     
-    background_tasks.add_task(
-        email_service.send_email,
+    email_service.queue_email(
+        background_tasks,
         [contact_email],
         "Welcome to ProcuraHub",
         (
@@ -525,7 +646,7 @@ def get_supplier_user(
 def download_supplier_document(
     supplier_id: int,
     document_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles(UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer)),
 ):
     """Download a supplier document (SuperAdmin, Procurement, and Procurement Officers)."""
@@ -558,7 +679,7 @@ def download_supplier_document(
 # ==================== Category Management ====================
 @router.get("/categories", response_model=List[CategoryRead])
 def list_categories(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles(UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer)),
 ):
     """List all procurement categories."""
@@ -682,7 +803,7 @@ def delete_category(
 # ==================== Analytics & Reports ====================
 @router.get("/analytics/summary")
 def get_procurement_analytics(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles(UserRole.superadmin, UserRole.procurement, UserRole.finance)),
 ):
     """Get comprehensive procurement analytics and summary."""
@@ -981,7 +1102,7 @@ async def upload_company_logo(
 
 @router.get("/company-settings/logo")
 def get_company_logo(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get company logo (public access for documents)."""
     company_settings = db.query(CompanySettings).first()
@@ -1017,3 +1138,28 @@ def delete_company_logo(
     
     return None
 
+
+# ==================== Request profiles ====================
+
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+def list_profiles(
+    _: User = Depends(require_roles(UserRole.superadmin)),
+):
+    """List the stored request profiles, newest first."""
+    return [ProfileSummary.model_validate(report) for report in profiling.list_reports()]
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    _: User = Depends(require_roles(UserRole.superadmin)),
+):
+    """Download a request profile as speedscope JSON."""
+    speedscope = profiling.load_speedscope(profile_id)
+    if speedscope is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return JSONResponse(
+        speedscope,
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'},
+    )
@@ -4,32 +4,42 @@ from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import schemas
 from ..config import get_settings
 from ..dependencies import get_current_active_user, require_roles
 from ..models import User, UserRole
-from ..services.auth import authenticate_user, create_user, get_user_by_email
+from ..services.auth import authenticate_user_async, create_user, get_user_by_email
+from ..services.password_hashing import PasswordHashingBusy
+from ..utils.rate_limit import limiter
 from ..utils.security import create_access_token
-from ..database import get_db
+from ..database import get_async_db, get_db
 
 
 router = APIRouter()
 settings = get_settings()
-limiter = Limiter(key_func=get_remote_address)
 
 
-@router.post("/token", response_model=schemas.Token)
-@limiter.limit("5/minute")  # Strict rate limit for login attempts
-def login_for_access_token(
+@router.post(
+    "/token",
+    response_model=schemas.Token,
+    dependencies=[Depends(limiter.limit("5/minute"))],  # Strict rate limit for login attempts
+)
+async def login_for_access_token(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    try:
+        user = await authenticate_user_async(db, form_data.username, form_data.password)
+    except PasswordHashingBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ins in progress, please retry shortly",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -86,6 +96,7 @@ def read_current_user(
         role=current_user.role.value,  # Convert enum to string value
         is_active=current_user.is_active,
         timezone=current_user.timezone,
+        notification_frequency=current_user.notification_frequency,
         created_at=current_user.created_at,
         department_name=department_name
     )
@@ -97,13 +108,16 @@ def update_current_user(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
-    """Update current user's profile settings (name, timezone, etc)."""
+    """Update current user's profile settings (name, timezone, notifications)."""
     if user_update.full_name is not None:
         setattr(current_user, "full_name", user_update.full_name)
     
     if user_update.timezone is not None:
         setattr(current_user, "timezone", user_update.timezone)
     
+    if user_update.notification_frequency is not None:
+        setattr(current_user, "notification_frequency", user_update.notification_frequency)
+    
     db.commit()
     db.refresh(current_user)
     return current_user
@@ -1,14 +1,17 @@
 from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from ..database import get_db
-from ..dependencies import get_current_user
+from ..database import get_async_db
+from ..dependencies import get_current_user_async
 from ..models import Message, MessageStatus, User, SupplierProfile
 from ..schemas.message import MessageCreate, MessageResponse, MessageListResponse
 from ..services.email import email_service
 from ..services.email_templates import new_message_email
+from ..utils.query_stats import query_budget
 
 router = APIRouter(tags=["messages"])
 
@@ -20,17 +23,45 @@ def _get_user_full_name(user: Optional[User]) -> str:
     return user.full_name
 
 
+def _with_participants(statement):
+    """Eager-load sender, recipient and supplier so formatting issues no extra queries."""
+    return statement.options(
+        selectinload(Message.sender),
+        selectinload(Message.recipient),
+        selectinload(Message.supplier),
+    )
+
+
+def _message_response(message: Message) -> MessageResponse:
+    """Format a message whose participants have been eager-loaded."""
+    supplier = message.supplier
+    return MessageResponse(
+        id=message.id,  # type: ignore
+        sender_id=message.sender_id,  # type: ignore
+        sender_name=_get_user_full_name(message.sender),
+        recipient_id=message.recipient_id,  # type: ignore
+        recipient_name=_get_user_full_name(message.recipient),
+        supplier_id=message.supplier_id,  # type: ignore
+        supplier_name=supplier.company_name if supplier else "Unknown",  # type: ignore
+        subject=message.subject,  # type: ignore
+        content=message.content,  # type: ignore
+        status=message.status.value,  # type: ignore
+        created_at=message.created_at,  # type: ignore
+        read_at=message.read_at  # type: ignore
+    )
+
+
 @router.post("/", response_model=MessageResponse)
-def send_message(
+async def send_message(
     message_data: MessageCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Send a message from current user (Procurement) to a supplier user."""
     
     # Verify recipient exists
-    recipient = db.query(User).filter(User.id == message_data.recipient_id).first()
+    recipient = await db.get(User, message_data.recipient_id)
     if not recipient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,7 +69,7 @@ def send_message(
         )
     
     # Verify supplier exists
-    supplier = db.query(SupplierProfile).filter(SupplierProfile.id == message_data.supplier_id).first()
+    supplier = await db.get(SupplierProfile, message_data.supplier_id)
     if not supplier:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -57,8 +88,8 @@ def send_message(
     )
     
     db.add(message)
-    db.commit()
-    db.refresh(message)
+    await db.commit()
+    await db.refresh(message)
     
     # Send email notification to recipient
     try:
@@ -87,8 +118,8 @@ def send_message(
                 f"Best regards,\nProcuraHub Team"
             )
             
-            background_tasks.add_task(
-                email_service.send_email,
+            email_service.queue_email(
+                background_tasks,
                 [recipient_email],
                 f"New Message: {message_data.subject}",
                 plain_body,
@@ -116,16 +147,16 @@ def send_message(
 
 
 @router.post("/reply", response_model=MessageResponse)
-def reply_to_message(
+async def reply_to_message(
     message_data: MessageCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Reply to a message - allows suppliers to respond to procurement."""
     
     # Verify recipient exists
-    recipient = db.query(User).filter(User.id == message_data.recipient_id).first()
+    recipient = await db.get(User, message_data.recipient_id)
     if not recipient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -133,7 +164,7 @@ def reply_to_message(
         )
     
     # Verify supplier exists
-    supplier = db.query(SupplierProfile).filter(SupplierProfile.id == message_data.supplier_id).first()
+    supplier = await db.get(SupplierProfile, message_data.supplier_id)
     if not supplier:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -152,8 +183,8 @@ def reply_to_message(
     )
     
     db.add(message)
-    db.commit()
-    db.refresh(message)
+    await db.commit()
+    await db.refresh(message)
     
     # Send email notification to procurement recipient
     try:
@@ -181,8 +212,8 @@ def reply_to_message(
                 f"Best regards,\nProcuraHub Team"
             )
             
-            background_tasks.add_task(
-                email_service.send_email,
+            email_service.queue_email(
+                background_tasks,
                 [recipient_email],
                 f"Reply: {message_data.subject}",
                 plain_body,
@@ -210,38 +241,21 @@ def reply_to_message(
 
 
 @router.get("/received", response_model=MessageListResponse)
-def get_received_messages(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@query_budget(6)
+async def get_received_messages(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get all messages received by the current user."""
     
-    messages_query = db.query(Message).filter(Message.recipient_id == current_user.id)
-    messages = messages_query.all()
+    messages = (
+        await db.execute(_with_participants(select(Message).where(Message.recipient_id == current_user.id)))
+    ).scalars().all()
     
     # Count unread messages
-    unread_count = messages_query.filter(Message.status == MessageStatus.sent).count()
+    unread_count = sum(1 for message in messages if message.status == MessageStatus.sent)
     
-    # Format messages
-    formatted_messages = []
-    for message in messages:
-        sender = db.query(User).filter(User.id == message.sender_id).first()
-        supplier = db.query(SupplierProfile).filter(SupplierProfile.id == message.supplier_id).first()
-
-        formatted_messages.append(MessageResponse(
-            id=message.id,  # type: ignore
-            sender_id=message.sender_id,  # type: ignore
-            sender_name=_get_user_full_name(sender),
-            recipient_id=message.recipient_id,  # type: ignore
-            recipient_name=_get_user_full_name(current_user),
-            supplier_id=message.supplier_id,  # type: ignore
-            supplier_name=supplier.company_name if supplier else "Unknown",  # type: ignore
-            subject=message.subject,  # type: ignore
-            content=message.content,  # type: ignore
-            status=message.status.value,  # type: ignore
-            created_at=message.created_at,  # type: ignore
-            read_at=message.read_at  # type: ignore
-        ))
+    formatted_messages = [_message_response(message) for message in messages]
     
     return MessageListResponse(
         messages=formatted_messages,
@@ -251,34 +265,18 @@ def get_received_messages(
 
 
 @router.get("/sent", response_model=MessageListResponse)
-def get_sent_messages(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@query_budget(6)
+async def get_sent_messages(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get all messages sent by the current user."""
     
-    messages = db.query(Message).filter(Message.sender_id == current_user.id).all()
+    messages = (
+        await db.execute(_with_participants(select(Message).where(Message.sender_id == current_user.id)))
+    ).scalars().all()
     
-    # Format messages
-    formatted_messages = []
-    for message in messages:
-        recipient = db.query(User).filter(User.id == message.recipient_id).first()
-        supplier = db.query(SupplierProfile).filter(SupplierProfile.id == message.supplier_id).first()
-
-        formatted_messages.append(MessageResponse(
-            id=message.id,  # type: ignore
-            sender_id=message.sender_id,  # type: ignore
-            sender_name=_get_user_full_name(current_user),
-            recipient_id=message.recipient_id,  # type: ignore
-            recipient_name=_get_user_full_name(recipient),
-            supplier_id=message.supplier_id,  # type: ignore
-            supplier_name=supplier.company_name if supplier else "Unknown",  # type: ignore
-            subject=message.subject,  # type: ignore
-            content=message.content,  # type: ignore
-            status=message.status.value,  # type: ignore
-            created_at=message.created_at,  # type: ignore
-            read_at=message.read_at  # type: ignore
-        ))
+    formatted_messages = [_message_response(message) for message in messages]
     
     return MessageListResponse(
         messages=formatted_messages,
@@ -288,17 +286,21 @@ def get_sent_messages(
 
 
 @router.put("/{message_id}/read", response_model=MessageResponse)
-def mark_message_as_read(
+async def mark_message_as_read(
     message_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Mark a message as read by the current user."""
     
-    message = db.query(Message).filter(
-        Message.id == message_id,
-        Message.recipient_id == current_user.id
-    ).first()
+    message = (
+        await db.execute(
+            _with_participants(select(Message)).where(
+                Message.id == message_id,
+                Message.recipient_id == current_user.id
+            )
+        )
+    ).scalars().first()
     
     if not message:
         raise HTTPException(
@@ -310,39 +312,22 @@ def mark_message_as_read(
     message.status = MessageStatus.read
     message.read_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(message)
+    await db.commit()
     
-    # Get sender and supplier info
-    sender = db.query(User).filter(User.id == message.sender_id).first()
-    supplier = db.query(SupplierProfile).filter(SupplierProfile.id == message.supplier_id).first()
-
-    return MessageResponse(
-        id=message.id,  # type: ignore
-        sender_id=message.sender_id,  # type: ignore
-        sender_name=_get_user_full_name(sender),
-        recipient_id=message.recipient_id,  # type: ignore
-        recipient_name=_get_user_full_name(current_user),
-        supplier_id=message.supplier_id,  # type: ignore
-        supplier_name=supplier.company_name if supplier else "Unknown",  # type: ignore
-        subject=message.subject,  # type: ignore
-        content=message.content,  # type: ignore
-        status=message.status.value,  # type: ignore
-        created_at=message.created_at,  # type: ignore
-        read_at=message.read_at  # type: ignore
-    )
+    return _message_response(message)
 
 
 @router.get("/conversation/{supplier_id}", response_model=MessageListResponse)
-def get_conversation_with_supplier(
+@query_budget(6)
+async def get_conversation_with_supplier(
     supplier_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get all messages in a conversation with a specific supplier."""
     
     # Verify supplier exists
-    supplier = db.query(SupplierProfile).filter(SupplierProfile.id == supplier_id).first()
+    supplier = await db.get(SupplierProfile, supplier_id)
     if not supplier:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -350,38 +335,23 @@ def get_conversation_with_supplier(
         )
     
     # Get all messages related to this supplier involving current user
-    messages = db.query(Message).filter(
-        Message.supplier_id == supplier_id,
-        ((Message.sender_id == current_user.id) | (Message.recipient_id == current_user.id))
-    ).order_by(Message.created_at.asc()).all()
+    messages = (
+        await db.execute(
+            _with_participants(select(Message)).where(
+                Message.supplier_id == supplier_id,
+                ((Message.sender_id == current_user.id) | (Message.recipient_id == current_user.id))
+            ).order_by(Message.created_at.asc())
+        )
+    ).scalars().all()
     
-    # Count unread messages (only received ones)
-    unread_count = db.query(Message).filter(
-        Message.supplier_id == supplier_id,
-        Message.recipient_id == current_user.id,
-        Message.status == MessageStatus.sent
-    ).count()
+    # Count unread messages (only received ones); they are all in the list above
+    unread_count = sum(
+        1
+        for message in messages
+        if message.recipient_id == current_user.id and message.status == MessageStatus.sent
+    )
     
-    # Format messages
-    formatted_messages = []
-    for message in messages:
-        sender = db.query(User).filter(User.id == message.sender_id).first()
-        recipient = db.query(User).filter(User.id == message.recipient_id).first()
-
-        formatted_messages.append(MessageResponse(
-            id=message.id,  # type: ignore
-            sender_id=message.sender_id,  # type: ignore
-            sender_name=_get_user_full_name(sender),
-            recipient_id=message.recipient_id,  # type: ignore
-            recipient_name=_get_user_full_name(recipient),
-            supplier_id=message.supplier_id,  # type: ignore
-            supplier_name=supplier.company_name,  # type: ignore
-            subject=message.subject,  # type: ignore
-            content=message.content,  # type: ignore
-            status=message.status.value,  # type: ignore
-            created_at=message.created_at,  # type: ignore
-            read_at=message.read_at  # type: ignore
-        ))
+    formatted_messages = [_message_response(message) for message in messages]
     
     return MessageListResponse(
         messages=formatted_messages,
@@ -8,11 +8,9 @@ from typing import List, Optional, cast
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, UploadFile, status
 from fastapi.responses import FileResponse
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..dependencies import get_current_active_user, require_roles
 from ..models import (
     Department,
@@ -43,7 +41,6 @@ from ..schemas.request import (
     RequestUpdate,
 )
 from ..services.rfq import create_invitations, generate_rfq_number
-from ..services.email import email_service
 from ..services.email_templates import (
     purchase_request_submitted_email,
     purchase_request_approved_procurement_email,
@@ -53,12 +50,20 @@ from ..services.email_templates import (
     new_request_for_finance_email,
 )
 from ..services.file_storage import save_upload_file
+from ..services.notifications import (
+    PROCUREMENT_ROLES,
+    fan_out,
+    notify_user,
+    recipient_for_user,
+    recipients_for_roles,
+)
 from ..config import get_settings
+from ..utils.query_stats import query_budget
+from ..utils.rate_limit import limiter
 
 router = APIRouter(tags=["requests"])
 logger = logging.getLogger("procurahub.requests")
 settings = get_settings()
-limiter = Limiter(key_func=get_remote_address)
 
 def _user_role(user: User) -> UserRole:
     return cast(UserRole, user.role)
@@ -72,6 +77,21 @@ def _requester_id(request: PurchaseRequest) -> Optional[int]:
     return cast(Optional[int], request.requester_id)
 
 
+def _request_response_options(*, include_documents: bool = True) -> list:
+    """Eager loads for everything :func:`_build_request_response` reads, for list queries."""
+    options = [
+        selectinload(PurchaseRequest.department),
+        selectinload(PurchaseRequest.requester),
+        selectinload(PurchaseRequest.hod_reviewer),
+        selectinload(PurchaseRequest.procurement_reviewer),
+        selectinload(PurchaseRequest.finance_reviewer),
+        selectinload(PurchaseRequest.rfq),
+    ]
+    if include_documents:
+        options.append(selectinload(PurchaseRequest.documents))
+    return options
+
+
 def _build_request_response(
     request: PurchaseRequest, *, include_documents: bool = True
 ) -> RequestResponse:
@@ -198,7 +218,7 @@ def _apply_updates(request: PurchaseRequest, data: RequestUpdate) -> None:
 
 @router.get("/categories", response_model=list[CategoryRead])
 def list_request_categories(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(get_current_active_user),
 ) -> list[ProcurementCategory]:
     """Return procurement categories for requesters."""
@@ -208,7 +228,7 @@ def list_request_categories(
 
 @router.get("/departments", response_model=list[DepartmentRead])
 def list_departments(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(get_current_active_user),
 ) -> list[Department]:
     """Return departments for requesters."""
@@ -216,8 +236,12 @@ def list_departments(
     return departments
 
 
-@router.post("/", response_model=RequestResponse, status_code=status.HTTP_201_CREATED)
-@limiter.limit("30/hour")  # Rate limit request creation to prevent spam
+@router.post(
+    "/",
+    response_model=RequestResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limiter.limit("30/hour"))],  # Rate limit request creation to prevent spam
+)
 def create_request(
     request: Request,
     request_in: RequestCreate,
@@ -269,9 +293,9 @@ def create_request(
     )
     
     # Send email in background to avoid blocking the response
-    background_tasks.add_task(
-        email_service.send_email,
-        [requester_email],
+    notify_user(
+        background_tasks,
+        recipient_for_user(current_user, requester_email),
         f"Request Submitted - {request_in.title}",
         plain_body,
         html_body,
@@ -299,9 +323,9 @@ def create_request(
             )
             
             # Send HOD notification in background
-            background_tasks.add_task(
-                email_service.send_email,
-                [hod_email],
+            notify_user(
+                background_tasks,
+                recipient_for_user(hod, hod_email),
                 f"New Request for Review - {request_in.title}",
                 plain_body_hod,
                 None,
@@ -311,11 +335,16 @@ def create_request(
 
 
 @router.get("/me", response_model=list[RequestResponse])
+@query_budget(12)
 def list_my_requests(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_roles(UserRole.requester, UserRole.superadmin)),
 ):
-    query = db.query(PurchaseRequest).order_by(PurchaseRequest.created_at.desc())
+    query = (
+        db.query(PurchaseRequest)
+        .options(*_request_response_options())
+        .order_by(PurchaseRequest.created_at.desc())
+    )
     if _user_role(current_user) == UserRole.requester:
         query = query.filter(PurchaseRequest.requester_id == current_user.id)
     requests = query.all()
@@ -323,8 +352,9 @@ def list_my_requests(
 
 
 @router.get("/", response_model=list[RequestResponse])
+@query_budget(12)
 def list_requests(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(
         require_roles(UserRole.procurement, UserRole.procurement_officer, UserRole.head_of_department, UserRole.superadmin, UserRole.finance)
     ),
@@ -343,6 +373,7 @@ def list_requests(
         
         requests = (
             db.query(PurchaseRequest)
+            .options(*_request_response_options())
             .filter(PurchaseRequest.department_id.in_(dept_ids))
             .order_by(PurchaseRequest.created_at.desc())
             .all()
@@ -350,16 +381,18 @@ def list_requests(
         return [_build_request_response(req) for req in requests]
     
     # Procurement and SuperAdmin see all requests
+    include_documents = user_role != UserRole.finance
     requests = (
         db.query(PurchaseRequest)
+        .options(*_request_response_options(include_documents=include_documents))
         .order_by(PurchaseRequest.created_at.desc())
         .all()
     )
-    include_documents = user_role != UserRole.finance
     return [_build_request_response(req, include_documents=include_documents) for req in requests]
 
 
 @router.get("/{request_id}", response_model=RequestResponse)
+@query_budget(10)
 def get_request(
     request_id: int,
     db: Session = Depends(get_db),
@@ -498,43 +531,37 @@ def hod_approve_request(
             plain_body += "Best regards,\nProcuraHub Team"
             
             # Send requester notification in background
-            background_tasks.add_task(
-                email_service.send_email,
-                [requester_email],
+            notify_user(
+                background_tasks,
+                recipient_for_user(request_obj.requester, requester_email),
                 f"HOD Approved - {getattr(request_obj, 'title')}",
                 plain_body,
                 None,
             )
         
         # Notify procurement team
-        procurement_users = db.query(User).filter(
-            User.role.in_([UserRole.procurement.value, UserRole.superadmin.value]),
-            User.is_active == True
-        ).all()
-        
         requester_name = str(getattr(request_obj.requester, "full_name", "")) if request_obj.requester else ""
         
-        for proc_user in procurement_users:
-            proc_email = str(getattr(proc_user, "email"))
-            plain_body_proc = (
-                f"Procurement Team,\n\n"
-                f"A purchase request has been approved by the Head of Department and requires your review.\n\n"
-                f"Request: {getattr(request_obj, 'title')}\n"
-                f"Requested by: {requester_name}\n"
-                f"Department: {request_obj.department.name if request_obj.department else 'N/A'}\n"
-            )
-            if approval_in.hod_notes:
-                plain_body_proc += f"HOD Notes: {approval_in.hod_notes}\n"
-            plain_body_proc += "\nPlease log in to review and process this request.\n\nBest regards,\nProcuraHub Team"
-            
-            # Send procurement notification in background
-            background_tasks.add_task(
-                email_service.send_email,
-                [proc_email],
-                f"New Request for Review - {getattr(request_obj, 'title')}",
-                plain_body_proc,
-                None,
-            )
+        plain_body_proc = (
+            f"Procurement Team,\n\n"
+            f"A purchase request has been approved by the Head of Department and requires your review.\n\n"
+            f"Request: {getattr(request_obj, 'title')}\n"
+            f"Requested by: {requester_name}\n"
+            f"Department: {request_obj.department.name if request_obj.department else 'N/A'}\n"
+        )
+        if approval_in.hod_notes:
+            plain_body_proc += f"HOD Notes: {approval_in.hod_notes}\n"
+        plain_body_proc += "\nPlease log in to review and process this request.\n\nBest regards,\nProcuraHub Team"
+        
+        # Send procurement notification in background
+        fan_out(
+            background_tasks,
+            recipients_for_roles(db, PROCUREMENT_ROLES),
+            f"New Request for Review - {getattr(request_obj, 'title')}",
+            plain_body_proc,
+            None,
+            summary=f"'{getattr(request_obj, 'title')}' from {requester_name or 'a requester'} was approved by the HOD.",
+        )
         
         return _build_request_response(request_obj)
     except HTTPException:
@@ -603,9 +630,9 @@ def hod_reject_request(
                 f"Best regards,\nProcuraHub Team"
             )
             
-            background_tasks.add_task(
-                email_service.send_email,
-                [requester_email],
+            notify_user(
+                background_tasks,
+                recipient_for_user(request_obj.requester, requester_email),
                 f"Request Not Approved - {getattr(request_obj, 'title')}",
                 plain_body,
                 None,
@@ -682,9 +709,9 @@ def approve_request(
                 f"Best regards,\nProcuraHub Team"
             )
             
-            background_tasks.add_task(
-                email_service.send_email,
-                [requester_email],
+            notify_user(
+                background_tasks,
+                recipient_for_user(request_obj.requester, requester_email),
                 f"Request Approved - {getattr(request_obj, 'title')}",
                 plain_body,
                 None,
@@ -709,9 +736,9 @@ def approve_request(
                     f"Best regards,\nProcuraHub Team"
                 )
                 
-                background_tasks.add_task(
-                    email_service.send_email,
-                    [hod_email],
+                notify_user(
+                    background_tasks,
+                    recipient_for_user(hod, hod_email),
                     f"Department Request Approved - {getattr(request_obj, 'title')}",
                     plain_body,
                     None,
@@ -779,9 +806,9 @@ def deny_request(
                 f"Best regards,\nProcuraHub Team"
             )
             
-            background_tasks.add_task(
-                email_service.send_email,
-                [requester_email],
+            notify_user(
+                background_tasks,
+                recipient_for_user(request_obj.requester, requester_email),
                 f"Request Rejected by Procurement - {getattr(request_obj, 'title')}",
                 plain_body,
                 html_body,
@@ -808,9 +835,9 @@ def deny_request(
                     f"Best regards,\nProcuraHub Team"
                 )
                 
-                background_tasks.add_task(
-                    email_service.send_email,
-                    [hod_email],
+                notify_user(
+                    background_tasks,
+                    recipient_for_user(hod, hod_email),
                     f"Department Request Rejected - {getattr(request_obj, 'title')}",
                     plain_body_hod,
                     None,
@@ -902,9 +929,9 @@ def finance_approve_request(
                 f"Best regards,\nProcuraHub Team"
             )
             
-            background_tasks.add_task(
-                email_service.send_email,
-                [requester_email],
+            notify_user(
+                background_tasks,
+                recipient_for_user(request_obj.requester, requester_email),
                 f"Finance Approved - {getattr(request_obj, 'title')}",
                 plain_body,
                 html_body,
@@ -936,9 +963,9 @@ def finance_approve_request(
                 f"Best regards,\nProcuraHub Team"
             )
             
-            background_tasks.add_task(
-                email_service.send_email,
-                [procurement_email],
+            notify_user(
+                background_tasks,
+                recipient_for_user(request_obj.procurement_reviewer, procurement_email),
                 f"Finance Approved - {getattr(request_obj, 'title')}",
                 plain_body_procurement,
             )
@@ -1008,9 +1035,9 @@ def finance_reject_request(
                 f"Best regards,\nProcuraHub Team"
             )
             
-            background_tasks.add_task(
-                email_service.send_email,
-                [requester_email],
+            notify_user(
+                background_tasks,
+                recipient_for_user(request_obj.requester, requester_email),
                 f"Request Rejected by Finance - {getattr(request_obj, 'title')}",
                 plain_body,
                 html_body,
@@ -1032,9 +1059,9 @@ def finance_reject_request(
                 f"Best regards,\nProcuraHub Team"
             )
             
-            background_tasks.add_task(
-                email_service.send_email,
-                [procurement_email],
+            notify_user(
+                background_tasks,
+                recipient_for_user(request_obj.procurement_reviewer, procurement_email),
                 f"Finance Rejected - {getattr(request_obj, 'title')}",
                 plain_body_procurement,
             )
@@ -1154,17 +1181,22 @@ def invite_suppliers(
         request_obj.procurement_notes = invite_in.notes
 
     db.commit()
-    db.refresh(request_obj)
-    db.refresh(rfq)
+    # Reload with the response's relationships in one pass rather than lazily, one per reviewer
+    request_obj = (
+        db.query(PurchaseRequest)
+        .options(*_request_response_options())
+        .filter(PurchaseRequest.id == request_id)
+        .one()
+    )
 
     if request_obj.requester and request_obj.requester.email:
         # Convert deadline to Lusaka time for email display
         lusaka_tz = ZoneInfo("Africa/Lusaka")
         deadline_display = deadline_utc.astimezone(lusaka_tz)
         
-        background_tasks.add_task(
-            email_service.send_email,
-            [request_obj.requester.email],
+        notify_user(
+            background_tasks,
+            recipient_for_user(request_obj.requester),
             f"RFQ Invitations Sent for {request_obj.title}",
             (
                 f"Hello {request_obj.requester.full_name or ''},\n\n"
@@ -1229,7 +1261,7 @@ def upload_request_documents(
 def download_specific_request_document(
     request_id: int,
     document_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Download a specific document attached to a request."""
@@ -1312,7 +1344,7 @@ def download_specific_request_document(
 @router.get("/{request_id}/document")
 def download_request_document(
     request_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Download the first document attached to a request (Legacy)."""
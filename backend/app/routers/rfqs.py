@@ -6,14 +6,25 @@ from decimal import Decimal
 from typing import Any, Iterable, Sequence
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, Response
 from pydantic import ValidationError
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload, joinedload
 from starlette.datastructures import UploadFile as StarletteUploadFile
 
 from ..config import get_settings
-from ..database import get_db
-from ..dependencies import get_current_active_user, get_current_supplier_profile, require_roles
+from ..database import get_async_db, get_async_read_db, get_db, get_read_db
+from ..dependencies import (
+    get_current_active_user,
+    get_current_supplier_context_async,
+    get_current_supplier_profile,
+    get_current_user_async,
+    require_roles,
+    require_roles_async,
+)
 from ..models import (
     CompanySettings,
     Message,
@@ -30,7 +41,6 @@ from ..models import (
     UserRole,
 )
 from ..schemas import ProcurementRFQCreate, RFQRead, RFQUpdate, RFQWithQuotations, PurchaseOrderRead
-from ..services.email import email_service
 from ..services.email_templates import (
     quotation_approved_email,
     quotation_rejected_email,
@@ -38,12 +48,28 @@ from ..services.email_templates import (
     rfq_invitation_email,
 )
 from ..services.file_storage import save_upload_file
-from ..services.pdf_generator import generate_purchase_order_pdf
-from ..services.rfq import close_expired_rfqs, create_invitations, select_suppliers_for_rfq, generate_rfq_number
+from ..services.notifications import (
+    PROCUREMENT_ROLES,
+    Recipient,
+    fan_out,
+    notify_user,
+    recipient_for_user,
+    recipients_for_roles_async,
+)
+from ..services.rfq import (
+    close_expired_rfqs,
+    close_expired_rfqs_async,
+    create_invitations,
+    generate_rfq_number,
+    select_suppliers_for_rfq,
+)
+from ..services.supplier_context import SupplierContext, has_invitation, supplier_context_for
 
 router = APIRouter()
 settings = get_settings()
 
+DUPLICATE_QUOTATION_DETAIL = "You have already submitted a quotation for this RFQ."
+
 
 def _normalize_deadline(deadline: datetime) -> datetime:
     """
@@ -335,47 +361,31 @@ async def approve_draft_rfq(
     
     db.commit()
     db.refresh(rfq)
+    # Reload the creator too, so the response includes their name and role
+    db.refresh(rfq, ["created_by"])
     
-    # Prepare response with creator info
-    rfq_dict = RFQRead.model_validate(rfq).model_dump()
-    creator = getattr(rfq, "created_by", None)
-    if creator:
-        rfq_dict["created_by_name"] = getattr(creator, "full_name", None)
-        rfq_dict["created_by_role"] = getattr(creator, "role", None)
-    
-    return RFQRead(**rfq_dict)
+    return rfq
 
 
 @router.get("/", response_model=list[RFQRead])
-
-def list_rfqs(
-    db: Session = Depends(get_db),
-    _: User = Depends(require_roles(UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer, UserRole.requester, UserRole.finance)),
+async def list_rfqs(
+    db: AsyncSession = Depends(get_async_read_db),
+    _: User = Depends(require_roles_async(UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer, UserRole.requester, UserRole.finance)),
 ):
-    close_expired_rfqs(db)
-    rfqs = (
-        db.query(RFQ)
+    await close_expired_rfqs_async(db)
+    result = await db.execute(
+        select(RFQ)
         .options(selectinload(RFQ.created_by), selectinload(RFQ.documents))
         .order_by(RFQ.created_at.desc())
-        .all()
     )
-    
-    # Add creator information to each RFQ
-    result = []
-    for rfq in rfqs:
-        rfq_dict = RFQRead.model_validate(rfq).model_dump()
-        creator = getattr(rfq, "created_by", None)
-        if creator:
-            rfq_dict["created_by_name"] = getattr(creator, "full_name", None)
-            rfq_dict["created_by_role"] = getattr(creator, "role", None)
-        result.append(RFQRead(**rfq_dict))
-    
-    return result
+    # Validated once by the response model (creator info comes from the
+    # loaded relationship) and encoded straight to JSON bytes.
+    return result.scalars().all()
 
 
 @router.get("/pending-finance-approvals", response_model=list[RFQWithQuotations])
 def list_rfqs_with_pending_finance_approvals(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles(UserRole.finance, UserRole.superadmin)),
 ):
     """Get RFQs that have quotations pending finance approval."""
@@ -394,28 +404,16 @@ def list_rfqs_with_pending_finance_approvals(
     )
     
     # Filter to only include RFQs with pending finance approval quotations
-    result = []
-    for rfq in rfqs:
-        # Check if this RFQ has any quotations pending finance approval
-        has_pending = any(
-            q.status == QuotationStatus.pending_finance_approval
-            for q in rfq.quotations
-        )
-        
-        if has_pending:
-            rfq_dict = RFQWithQuotations.model_validate(rfq).model_dump()
-            creator = getattr(rfq, "created_by", None)
-            if creator:
-                rfq_dict["created_by_name"] = getattr(creator, "full_name", None)
-                rfq_dict["created_by_role"] = getattr(creator, "role", None)
-            result.append(RFQWithQuotations(**rfq_dict))
-    
-    return result
+    return [
+        rfq
+        for rfq in rfqs
+        if any(q.status == QuotationStatus.pending_finance_approval for q in rfq.quotations)
+    ]
 
 
 @router.get("/finance-approved", response_model=list[RFQWithQuotations])
 def list_finance_approved_rfqs(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles(UserRole.finance, UserRole.superadmin)),
 ):
     """Get RFQs that were approved by Finance (had quotations that went through finance approval process)."""
@@ -446,19 +444,14 @@ def list_finance_approved_rfqs(
         
         # Check if this quotation went through finance approval process
         if approved_quotation and approved_quotation.finance_approval_requested_at:
-            rfq_dict = RFQWithQuotations.model_validate(rfq).model_dump()
-            creator = getattr(rfq, "created_by", None)
-            if creator:
-                rfq_dict["created_by_name"] = getattr(creator, "full_name", None)
-                rfq_dict["created_by_role"] = getattr(creator, "role", None)
-            result.append(RFQWithQuotations(**rfq_dict))
+            result.append(rfq)
     
     return result
 
 
 @router.get("/purchase-orders", response_model=list[PurchaseOrderRead])
 def list_purchase_orders(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: User = Depends(require_roles(UserRole.procurement, UserRole.superadmin)),
 ):
     approved_quotes = (
@@ -496,22 +489,22 @@ def list_purchase_orders(
 
 
 @router.get("/{rfq_id}", response_model=RFQWithQuotations)
-def read_rfq(
+async def read_rfq(
     rfq_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer, UserRole.requester, UserRole.finance)),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_roles_async(UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer, UserRole.requester, UserRole.finance)),
 ):
-    close_expired_rfqs(db)
-    rfq = (
-        db.query(RFQ)
+    await close_expired_rfqs_async(db)
+    result = await db.execute(
+        select(RFQ)
         .options(
             selectinload(RFQ.quotations).selectinload(Quotation.supplier),
             selectinload(RFQ.documents),
             selectinload(RFQ.created_by)
         )
-        .filter(RFQ.id == rfq_id)
-        .first()
+        .where(RFQ.id == rfq_id)
     )
+    rfq = result.scalars().first()
     if not rfq:
         raise HTTPException(status_code=404, detail="RFQ not found")
     
@@ -541,7 +534,7 @@ def read_rfq(
     # If deadline has passed, unlock responses automatically
     if deadline_passed and response_locked:
         setattr(rfq, "response_locked", False)
-        db.commit()
+        await db.commit()
         response_locked = False
     
     # Hide quotations if locked and deadline hasn't passed
@@ -570,14 +563,8 @@ def read_rfq(
             rfq_dict["created_by_role"] = getattr(creator, "role", None)
         return rfq_dict
     
-    # Add creator information to response
-    rfq_dict = RFQWithQuotations.model_validate(rfq).model_dump()
-    creator = getattr(rfq, "created_by", None)
-    if creator:
-        rfq_dict["created_by_name"] = getattr(creator, "full_name", None)
-        rfq_dict["created_by_role"] = getattr(creator, "role", None)
-    
-    return RFQWithQuotations(**rfq_dict)
+    # Creator information comes from the loaded relationship
+    return rfq
 
 
 @router.put("/{rfq_id}", response_model=RFQRead)
@@ -613,47 +600,51 @@ async def submit_quotation(
     tax_amount: Decimal | None = Form(None),
     notes: str | None = Form(None),
     attachment: UploadFile | None = File(None),
-    profile: SupplierProfile = Depends(get_current_supplier_profile),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    supplier: SupplierContext = Depends(get_current_supplier_context_async),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    close_expired_rfqs(db)
-    rfq = db.query(RFQ).filter(RFQ.id == rfq_id).first()
-    if not rfq:
+    # A single round trip decides eligibility: RFQ state, invitation and any prior quotation.
+    already_quoted = (
+        select(Quotation.id)
+        .where(Quotation.rfq_id == RFQ.id, Quotation.supplier_id == supplier.profile_id)
+        .exists()
+    )
+    eligibility = (
+        await db.execute(
+            select(RFQ.status, RFQ.deadline, RFQ.title, RFQInvitation.id, already_quoted)
+            .outerjoin(
+                RFQInvitation,
+                (RFQInvitation.rfq_id == RFQ.id) & (RFQInvitation.supplier_id == supplier.profile_id),
+            )
+            .where(RFQ.id == rfq_id)
+        )
+    ).first()
+    if not eligibility:
         raise HTTPException(status_code=404, detail="RFQ not found")
-    rfq_status = getattr(rfq, "status")
-    if rfq_status != RFQStatus.open:
-        raise HTTPException(status_code=400, detail="RFQ is not open for quotations")
+    rfq_status, rfq_deadline, rfq_title, invitation_id, has_quoted = eligibility
 
-    invitation = (
-        db.query(RFQInvitation)
-        .filter(
-            RFQInvitation.rfq_id == rfq_id,
-            RFQInvitation.supplier_id == profile.id,
-        )
-        .first()
-    )
-    if not invitation:
+    # Deadlines are stored in UTC; treat a passed deadline as closed without
+    # sweeping every open RFQ on this hot path.
+    if rfq_deadline is not None and rfq_deadline.tzinfo is None:
+        rfq_deadline = rfq_deadline.replace(tzinfo=timezone.utc)
+    if rfq_status != RFQStatus.open or (rfq_deadline and rfq_deadline <= datetime.now(timezone.utc)):
+        raise HTTPException(status_code=400, detail="RFQ is not open for quotations")
+    if invitation_id is None:
         raise HTTPException(status_code=403, detail="Supplier not invited to this RFQ")
+    if has_quoted:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DUPLICATE_QUOTATION_DETAIL)
 
-    existing_quotation = (
-        db.query(Quotation)
-        .filter(
-            Quotation.rfq_id == rfq_id,
-            Quotation.supplier_id == profile.id,
-        )
-        .first()
-    )
-    if existing_quotation:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have already submitted a quotation for this RFQ.",
-        )
+    # End the read transaction so no connection is held while the file streams to disk.
+    await db.commit()
 
     document_path = None
     original_filename = None
+    stored_path = None
     if attachment:
-        stored_path = save_upload_file(attachment, subdir=f"rfq_{rfq_id}/quotations")
+        stored_path = await run_in_threadpool(
+            save_upload_file, attachment, subdir=f"rfq_{rfq_id}/quotations"
+        )
         # Store relative path from uploads directory for web access
         upload_dir = settings.resolved_upload_dir
         try:
@@ -666,7 +657,7 @@ async def submit_quotation(
 
     quotation = Quotation(
         rfq_id=rfq_id,
-        supplier_id=profile.id,
+        supplier_id=supplier.profile_id,
         supplier_user_id=current_user.id,
         amount=Decimal(amount),
         currency=currency,
@@ -677,53 +668,61 @@ async def submit_quotation(
         original_filename=original_filename,
         status=QuotationStatus.submitted,
     )
-    db.add(quotation)
-    db.flush()
-    setattr(invitation, "responded_at", datetime.now(timezone.utc))
-    setattr(invitation, "status", "responded")
+    # Short write transaction: insert, mark the invitation, lock responses.
+    try:
+        db.add(quotation)
+        await db.flush()
+        await db.execute(
+            update(RFQInvitation)
+            .where(RFQInvitation.id == invitation_id)
+            .values(responded_at=datetime.now(timezone.utc), status="responded")
+        )
+        # Lock RFQ after first quotation submission to ensure transparency.
+        # The guard means only the first submission writes the shared RFQ row.
+        await db.execute(
+            update(RFQ)
+            .where(RFQ.id == rfq_id, RFQ.response_locked.is_(False))
+            .values(response_locked=True)
+        )
+        await db.commit()
+    except Exception as exc:
+        await db.rollback()
+        if stored_path is not None:
+            stored_path.unlink(missing_ok=True)
+        if isinstance(exc, IntegrityError):
+            # A concurrent submission from the same supplier won the race.
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail=DUPLICATE_QUOTATION_DETAIL
+            ) from exc
+        raise
+
+    # Notify procurement team about new quotation
+    supplier_name = supplier.company_name
+    rfq_title = str(rfq_title or "")
     
-    # Lock RFQ after first quotation submission to ensure transparency
-    # This prevents procurement from viewing responses until deadline
-    if not getattr(rfq, "response_locked", False):
-        setattr(rfq, "response_locked", True)
+    html_body = quotation_submitted_email(
+        procurement_staff="Procurement Team",
+        supplier_name=supplier_name,
+        rfq_title=rfq_title,
+    )
     
-    db.commit()
-    db.refresh(quotation)
+    plain_body = (
+        f"Hello Procurement Team,\n\n"
+        f"A new quotation has been submitted:\n\n"
+        f"Supplier: {supplier_name}\n"
+        f"RFQ: {rfq_title}\n\n"
+        f"Please log in to review the quotation.\n\n"
+        f"Best regards,\nProcuraHub Team"
+    )
     
-    # Notify procurement team about new quotation
-    procurement_users = db.query(User).filter(
-        User.role.in_([UserRole.procurement.value, UserRole.superadmin.value]),
-        User.is_active == True
-    ).all()
-    
-    supplier_name = str(getattr(profile, "company_name", ""))
-    rfq_title = str(getattr(rfq, "title", ""))
-    
-    for proc_user in procurement_users:
-        proc_email = str(getattr(proc_user, "email"))
-        proc_name = str(getattr(proc_user, "full_name", "Procurement Team"))
-        html_body = quotation_submitted_email(
-            procurement_staff=proc_name,
-            supplier_name=supplier_name,
-            rfq_title=rfq_title,
-        )
-        
-        plain_body = (
-            f"Hello {proc_name},\n\n"
-            f"A new quotation has been submitted:\n\n"
-            f"Supplier: {supplier_name}\n"
-            f"RFQ: {rfq_title}\n\n"
-            f"Please log in to review the quotation.\n\n"
-            f"Best regards,\nProcuraHub Team"
-        )
-        
-        background_tasks.add_task(
-            email_service.send_email,
-            [proc_email],
-            f"New Quotation - {rfq_title}",
-            plain_body,
-            html_body,
-        )
+    fan_out(
+        background_tasks,
+        await recipients_for_roles_async(db, PROCUREMENT_ROLES),
+        f"New Quotation - {rfq_title}",
+        plain_body,
+        html_body,
+        summary=f"{supplier_name} submitted a quotation for '{rfq_title}'.",
+    )
     
     return {"quotation_id": quotation.id}
 
@@ -787,9 +786,23 @@ def approve_quotation(
     - Finance/SuperAdmin can approve quotations pending finance approval or provide override justification
     """
     close_expired_rfqs(db)
+    # Serialise awards per RFQ: concurrent approvals queue on the RFQ row lock,
+    # so the winner check below always sees the previous award. SQLite ignores
+    # FOR UPDATE but serialises writers anyway.
+    rfq = (
+        db.query(RFQ)
+        .filter(RFQ.id == rfq_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+    if not rfq:
+        raise HTTPException(status_code=404, detail="RFQ not found")
+
     quotation = (
         db.query(Quotation)
         .filter(Quotation.id == quotation_id, Quotation.rfq_id == rfq_id)
+        .populate_existing()
         .first()
     )
     if not quotation:
@@ -816,73 +829,89 @@ def approve_quotation(
                 detail="Only Finance or SuperAdmin can approve quotations that exceed the approved budget"
             )
 
-    existing_winner = (
-        db.query(Quotation)
-        .filter(
+    existing_winner = db.execute(
+        select(Quotation.id)
+        .where(
             Quotation.rfq_id == rfq_id,
             Quotation.status == QuotationStatus.approved,
             Quotation.id != quotation_id,
         )
-        .first()
-    )
+        .limit(1)
+    ).first()
     if existing_winner:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="RFQ has already been awarded to another quotation",
         )
 
-    rfq = quotation.rfq
-    if not rfq:
-        raise HTTPException(status_code=404, detail="RFQ not found")
-
     awarded_at = datetime.now(timezone.utc)
     # Use the amount field for awarded value; total_amount does not exist on the model
     awarded_value = getattr(quotation, "amount")
     currency = str(getattr(quotation, "currency"))
+    winner_supplier_id = getattr(quotation, "supplier_id")
     supplier_profile = quotation.supplier
     supplier_email = str(getattr(supplier_profile, "contact_email", "")) if supplier_profile else None
     supplier_name = str(getattr(supplier_profile, "company_name", "Supplier")) if supplier_profile else "Supplier"
+    supplier_recipient = (
+        recipient_for_user(supplier_profile.user, supplier_email)
+        if supplier_email and supplier_profile.user
+        else None
+    )
 
     request_obj = rfq.source_request
     if isinstance(request_obj, list):
         request_obj = request_obj[0] if request_obj else None
-    requester_email = None
+    requester_recipient = None
     requester_name = None
     if request_obj and request_obj.requester:
-        requester_email = request_obj.requester.email
+        requester_recipient = recipient_for_user(request_obj.requester)
         requester_name = request_obj.requester.full_name
 
-    other_quotations = (
-        db.query(Quotation)
-        .filter(Quotation.rfq_id == rfq_id, Quotation.id != quotation_id)
-        .all()
-    )
-    losing_notifications: list[tuple[str, str]] = []
-    for other in other_quotations:
-        other_status = getattr(other, "status")
-        if other_status != QuotationStatus.rejected:
-            setattr(other, "status", QuotationStatus.rejected)
-            setattr(other, "approved_at", None)
-            setattr(other, "approved_by_id", None)
-        if other.supplier and other.supplier.contact_email:
-            losing_notifications.append(
-                (other.supplier.contact_email, other.supplier.company_name or "Supplier")
+    losing_notifications: list[tuple[Recipient, str]] = [
+        (
+            Recipient(user_id, contact_email, company_name or "", frequency or "immediate"),
+            company_name or "Supplier",
+        )
+        for contact_email, company_name, user_id, frequency in db.execute(
+            select(
+                SupplierProfile.contact_email,
+                SupplierProfile.company_name,
+                User.id,
+                User.notification_frequency,
             )
-
-    invitations = (
-        db.query(RFQInvitation)
-        .filter(RFQInvitation.rfq_id == rfq_id)
-        .all()
+            .join(Quotation, Quotation.supplier_id == SupplierProfile.id)
+            .join(User, User.id == SupplierProfile.user_id)
+            .where(Quotation.rfq_id == rfq_id, Quotation.id != quotation_id)
+            .order_by(Quotation.id)
+        )
+        if contact_email
+    ]
+
+    # Set-based award: the cost of these statements does not grow with the
+    # number of bids or invitations on the RFQ.
+    db.execute(
+        update(Quotation)
+        .where(
+            Quotation.rfq_id == rfq_id,
+            Quotation.id != quotation_id,
+            Quotation.status != QuotationStatus.rejected,
+        )
+        .values(status=QuotationStatus.rejected, approved_at=None, approved_by_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    is_winner = RFQInvitation.supplier_id == winner_supplier_id
+    db.execute(
+        update(RFQInvitation)
+        .where(RFQInvitation.rfq_id == rfq_id)
+        .values(
+            status=case((is_winner, "awarded"), else_="not_selected"),
+            responded_at=case(
+                (and_(is_winner, RFQInvitation.responded_at.is_(None)), awarded_at),
+                else_=RFQInvitation.responded_at,
+            ),
+        )
+        .execution_options(synchronize_session=False)
     )
-    for invitation in invitations:
-        inv_supplier_id = getattr(invitation, "supplier_id")
-        quotation_supplier_id = getattr(quotation, "supplier_id")
-        if inv_supplier_id == quotation_supplier_id:
-            setattr(invitation, "status", "awarded")
-            if getattr(invitation, "responded_at") is None:
-                setattr(invitation, "responded_at", awarded_at)
-        else:
-            setattr(invitation, "status", "not_selected")
 
     setattr(quotation, "status", QuotationStatus.approved)
     setattr(quotation, "approved_at", awarded_at)
@@ -905,8 +934,18 @@ def approve_quotation(
         setattr(rfq, "budget_override_justification", budget_override_justification)
 
     if supplier_profile and awarded_value is not None:
-        current_total = getattr(supplier_profile, "total_awarded_value") or Decimal("0")
-        setattr(supplier_profile, "total_awarded_value", current_total + Decimal(str(awarded_value)))
+        # Increment in the database so concurrent awards to the same supplier
+        # (on different RFQs) cannot overwrite each other's totals.
+        db.execute(
+            update(SupplierProfile)
+            .where(SupplierProfile.id == winner_supplier_id)
+            .values(
+                total_awarded_value=func.coalesce(SupplierProfile.total_awarded_value, 0)
+                + Decimal(str(awarded_value))
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.expire(supplier_profile, ["total_awarded_value"])
 
     if request_obj:
         setattr(request_obj, "status", RequestStatus.completed)
@@ -914,7 +953,7 @@ def approve_quotation(
     db.commit()
 
     # Send approval email to winning supplier
-    if supplier_email:
+    if supplier_recipient:
         tax_type = getattr(quotation, "tax_type", None)
         tax_amount = getattr(quotation, "tax_amount", None)
         
@@ -945,23 +984,23 @@ def approve_quotation(
             f"Best regards,\nProcuraHub Team"
         )
         
-        background_tasks.add_task(
-            email_service.send_email,
-            [supplier_email],
+        notify_user(
+            background_tasks,
+            supplier_recipient,
             f"Quotation Approved - {getattr(rfq, 'title')}",
             plain_body,
             html_body,
         )
 
     # Notify requester
-    if requester_email:
+    if requester_recipient:
         requester_salutation = (
             f"Hello {requester_name}" if requester_name else "Hello"
         )
         
-        background_tasks.add_task(
-            email_service.send_email,
-            [requester_email],
+        notify_user(
+            background_tasks,
+            requester_recipient,
             f"Supplier Awarded - {getattr(rfq, 'title')}",
             (
                 f"{requester_salutation},\n\n"
@@ -971,7 +1010,7 @@ def approve_quotation(
         )
 
     # Notify losing suppliers
-    for email, name in losing_notifications:
+    for recipient, name in losing_notifications:
         html_body = quotation_rejected_email(
             supplier_name=name,
             rfq_title=str(getattr(rfq, "title")),
@@ -985,9 +1024,9 @@ def approve_quotation(
             f"Best regards,\nProcuraHub Team"
         )
         
-        background_tasks.add_task(
-            email_service.send_email,
-            [email],
+        notify_user(
+            background_tasks,
+            recipient,
             f"RFQ Update - {getattr(rfq, 'title')}",
             plain_body,
             html_body,
@@ -1067,12 +1106,17 @@ def reject_quotation(
     supplier_profile = quotation.supplier
     supplier_email = str(getattr(supplier_profile, "contact_email", "")) if supplier_profile else None
     supplier_name = str(getattr(supplier_profile, "company_name", "Supplier")) if supplier_profile else "Supplier"
+    supplier_recipient = (
+        recipient_for_user(supplier_profile.user, supplier_email)
+        if supplier_email and supplier_profile.user
+        else None
+    )
     
     setattr(quotation, "status", QuotationStatus.rejected)
     db.commit()
     
     # Send email notification to supplier about rejection
-    if supplier_email and rfq:
+    if supplier_recipient and rfq:
         html_body = quotation_rejected_email(
             supplier_name=supplier_name,
             rfq_title=str(getattr(rfq, "title")),
@@ -1085,9 +1129,9 @@ def reject_quotation(
             f"Best regards,\nProcuraHub Team"
         )
         
-        background_tasks.add_task(
-            email_service.send_email,
-            [supplier_email],
+        notify_user(
+            background_tasks,
+            supplier_recipient,
             f"Quotation Decision - {getattr(rfq, 'title')}",
             plain_body,
             html_body,
@@ -1231,7 +1275,8 @@ async def mark_quotation_delivered(
 def download_rfq_document(
     rfq_id: int,
     document_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Download an RFQ document. Accessible to suppliers with invitations and staff."""
@@ -1250,25 +1295,13 @@ def download_rfq_document(
         # Staff can access any RFQ document
         pass
     elif user_role == UserRole.supplier:
-        # Suppliers can only access documents for RFQs they were invited to
-        # Query the supplier profile for this user
-        supplier_profile = (
-            db.query(SupplierProfile)
-            .filter(SupplierProfile.user_id == current_user.id)
-            .first()
-        )
-        if not supplier_profile:
+        # Suppliers can only access documents for RFQs they were invited to;
+        # the cached supplier context answers this without a query per file.
+        supplier = supplier_context_for(request, db, current_user.id)
+        if not supplier:
             raise HTTPException(status_code=403, detail="Supplier profile not found")
         
-        invitation = (
-            db.query(RFQInvitation)
-            .filter(
-                RFQInvitation.rfq_id == rfq_id,
-                RFQInvitation.supplier_id == supplier_profile.id
-            )
-            .first()
-        )
-        if not invitation:
+        if not has_invitation(db, supplier, rfq_id):
             raise HTTPException(status_code=403, detail="You don't have access to this RFQ")
     else:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -1291,7 +1324,7 @@ def download_rfq_document(
 def download_delivery_note(
     rfq_id: int,
     quotation_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_roles(UserRole.procurement, UserRole.superadmin, UserRole.finance)),
 ):
     """Download the delivery note for a delivered quotation."""
@@ -1326,7 +1359,7 @@ def download_delivery_note(
 def download_quotation(
     rfq_id: int,
     quotation_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_roles(UserRole.procurement, UserRole.superadmin, UserRole.finance)),
 ):
     """Download the quotation document."""
@@ -1369,7 +1402,7 @@ def download_quotation(
 def download_purchase_order(
     rfq_id: int,
     quotation_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     profile: SupplierProfile = Depends(get_current_supplier_profile),
 ):
     """
@@ -1420,7 +1453,9 @@ def download_purchase_order(
         db.commit()
         db.refresh(company_settings)
     
-    # Generate PDF
+    # Generate PDF (ReportLab is imported on first use to keep cold starts fast)
+    from ..services.pdf_generator import generate_purchase_order_pdf
+
     try:
         pdf_bytes = generate_purchase_order_pdf(
             rfq=rfq,
@@ -0,0 +1,45 @@
+"""Full-text search endpoint."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_read_db
+from ..dependencies import get_current_user_async
+from ..models import User
+from ..schemas.search import SearchResults
+from ..services.search import SEARCH_DIALECTS, SEARCH_KINDS, search_async
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    types: Optional[str] = Query(
+        None, description="Comma-separated subset of rfq, request, supplier and message"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Ranked search over everything the caller's role can list."""
+    if db.get_bind().dialect.name not in SEARCH_DIALECTS:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search is not available on this database",
+        )
+
+    kinds = SEARCH_KINDS
+    if types:
+        kinds = tuple(kind.strip() for kind in types.split(",") if kind.strip())
+        unknown = sorted(set(kinds) - set(SEARCH_KINDS))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search type(s): {', '.join(unknown)}",
+            )
+
+    return await search_async(db, current_user, q, kinds, limit, offset)
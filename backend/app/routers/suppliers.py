@@ -5,18 +5,22 @@ from __future__ import annotations
 import json
 from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
 from fastapi.responses import FileResponse
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload, selectinload
 
-from ..database import get_db
+from ..database import get_async_read_db, get_db, get_read_db
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
 
-from ..dependencies import get_current_supplier_profile, require_roles, get_current_active_user
+from ..dependencies import (
+    get_current_active_user,
+    get_current_supplier_context,
+    get_current_supplier_context_async,
+    get_current_supplier_profile,
+)
 from ..models import (
     Quotation,
     QuotationStatus,
@@ -42,13 +46,18 @@ from ..schemas import (
 from ..services.auth import create_user, get_user_by_email
 from ..services.email import email_service
 from ..services.file_storage import save_upload_file
-from ..services.rfq import close_expired_rfqs
+from ..services.rfq import close_expired_rfqs_async
+from ..services.supplier_context import SupplierContext, supplier_context_for
+from ..utils.query_stats import query_budget
+from ..utils.rate_limit import limiter
+from ..utils.serialization import FastJSONResponse
 from ..utils.supplier_utils import generate_supplier_number
 
 @router.get("/documents/{document_id}/download", response_class=FileResponse)
 def download_supplier_document(
     document_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Download a supplier document by its ID with authorization check."""
@@ -63,11 +72,9 @@ def download_supplier_document(
     if user_role not in [UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer]:
         # Suppliers can only access their own documents
         if user_role == UserRole.supplier:
-            supplier_profile = db.query(SupplierProfile).filter(
-                SupplierProfile.user_id == current_user.id
-            ).first()
+            supplier = supplier_context_for(request, db, current_user.id)
             
-            if not supplier_profile or document.supplier_id != supplier_profile.id:
+            if not supplier or document.supplier_id != supplier.profile_id:
                 raise HTTPException(
                     status_code=403,
                     detail="Not authorized to access this document"
@@ -154,8 +161,8 @@ def _store_supplier_document(
     "/register",
     response_model=SupplierRegistrationResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limiter.limit("3/hour"))],  # Rate limit supplier registration to prevent abuse
 )
-@limiter.limit("3/hour")  # Rate limit supplier registration to prevent abuse
 async def register_supplier(
     request: Request,
     background_tasks: BackgroundTasks,
@@ -217,8 +224,8 @@ async def register_supplier(
     _store_supplier_document(db, getattr(profile, "id", 0), SupplierDocumentType.company_profile, company_profile_file)
 
     # Send welcome email in background
-    background_tasks.add_task(
-        email_service.send_email,
+    email_service.queue_email(
+        background_tasks,
         [registration.email],
         "Welcome to ProcuraHub",
         (
@@ -246,27 +253,26 @@ def get_my_profile(
 
 
 @router.get("/me/invitations")
-def get_my_invitations(
-    profile: SupplierProfile = Depends(get_current_supplier_profile),
-    db: Session = Depends(get_db),
+@query_budget(8)
+async def get_my_invitations(
+    supplier: SupplierContext = Depends(get_current_supplier_context_async),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    close_expired_rfqs(db)
+    await close_expired_rfqs_async(db)
     invitations = (
-        db.query(RFQInvitation, RFQ)
-        .join(RFQ, RFQInvitation.rfq_id == RFQ.id)
-        .options(selectinload(RFQ.documents))
-        .filter(RFQInvitation.supplier_id == profile.id)
-        .order_by(RFQInvitation.invited_at.desc())
-        .all()
-    )
+        await db.execute(
+            select(RFQInvitation, RFQ)
+            .join(RFQ, RFQInvitation.rfq_id == RFQ.id)
+            .options(selectinload(RFQ.documents))
+            .where(RFQInvitation.supplier_id == supplier.profile_id)
+            .order_by(RFQInvitation.invited_at.desc())
+        )
+    ).all()
+    quotation_map = await _quotation_map(db, supplier.profile_id, [rfq.id for _, rfq in invitations])
 
     results = []
     for invitation, rfq in invitations:
-        existing_quotation = (
-            db.query(Quotation)
-            .filter(Quotation.rfq_id == rfq.id, Quotation.supplier_id == profile.id)
-            .first()
-        )
+        existing_quotation = quotation_map.get(rfq.id)
         results.append(
             {
                 "rfq_id": rfq.id,
@@ -291,38 +297,28 @@ def get_my_invitations(
                 ],
             }
         )
-    return results
+    return FastJSONResponse(results)
 
 
 @router.get("/me/rfqs/active", response_model=list[RFQReadForSupplier])
-def get_active_rfqs(
-    current_supplier: SupplierProfile = Depends(get_current_supplier_profile),
-    db: Session = Depends(get_db),
+async def get_active_rfqs(
+    current_supplier: SupplierContext = Depends(get_current_supplier_context_async),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    close_expired_rfqs(db)
+    await close_expired_rfqs_async(db)
     active_rfqs = (
-        db.query(RFQ)
-        .options(selectinload(RFQ.documents))
-        .join(RFQInvitation, RFQ.id == RFQInvitation.rfq_id)
-        .filter(
-            RFQInvitation.supplier_id == current_supplier.id,
-            RFQ.status == RFQStatus.open,
-        )
-        .order_by(RFQ.deadline.asc())
-        .all()
-    )
-    rfq_ids = [rfq.id for rfq in active_rfqs]
-    quotation_map: dict[int, Quotation] = {}
-    if rfq_ids:
-        quotations = (
-            db.query(Quotation)
-            .filter(
-                Quotation.supplier_id == current_supplier.id,
-                Quotation.rfq_id.in_(rfq_ids),
+        await db.execute(
+            select(RFQ)
+            .options(selectinload(RFQ.documents))
+            .join(RFQInvitation, RFQ.id == RFQInvitation.rfq_id)
+            .where(
+                RFQInvitation.supplier_id == current_supplier.profile_id,
+                RFQ.status == RFQStatus.open,
             )
-            .all()
+            .order_by(RFQ.deadline.asc())
         )
-        quotation_map = {quotation.rfq_id: quotation for quotation in quotations}
+    ).scalars().all()
+    quotation_map = await _quotation_map(db, current_supplier.profile_id, [rfq.id for rfq in active_rfqs])
 
     results: list[RFQReadForSupplier] = []
     for rfq in active_rfqs:
@@ -344,17 +340,206 @@ def get_active_rfqs(
     return results
 
 
+async def _quotation_map(db: AsyncSession, supplier_id: int, rfq_ids: list[int]) -> dict[int, Quotation]:
+    """Load the supplier's quotations for the given RFQs in a single query."""
+    if not rfq_ids:
+        return {}
+    quotations = (
+        await db.execute(
+            select(Quotation).where(
+                Quotation.supplier_id == supplier_id,
+                Quotation.rfq_id.in_(set(rfq_ids)),
+            )
+        )
+    ).scalars().all()
+    return {quotation.rfq_id: quotation for quotation in quotations}
+
+
+def _status_value(value) -> Optional[str]:
+    return value.value if hasattr(value, "value") else value
+
+
+@router.get("/me/summary")
+async def get_my_summary(
+    limit: int = Query(10, ge=1, le=50),
+    supplier: SupplierContext = Depends(get_current_supplier_context_async),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Dashboard summary: counts plus the first page of each supplier list.
+
+    Returns only list-view columns. Descriptions and documents are fetched
+    per item from ``/me/invitations/{rfq_id}`` when the supplier opens one.
+    """
+    await close_expired_rfqs_async(db)
+    supplier_id = supplier.profile_id
+
+    own_quotation = and_(Quotation.rfq_id == RFQ.id, Quotation.supplier_id == supplier_id)
+    invited_rfqs = (
+        select(func.count(RFQInvitation.id))
+        .join(RFQ, RFQInvitation.rfq_id == RFQ.id)
+        .where(RFQInvitation.supplier_id == supplier_id)
+    )
+    counts = (
+        await db.execute(
+            select(
+                invited_rfqs.scalar_subquery(),
+                invited_rfqs.where(RFQ.status == RFQStatus.open).scalar_subquery(),
+                invited_rfqs.where(
+                    RFQ.status == RFQStatus.open,
+                    ~select(Quotation.id).where(own_quotation).exists(),
+                ).scalar_subquery(),
+                select(func.count(Quotation.id))
+                .where(
+                    Quotation.supplier_id == supplier_id,
+                    Quotation.status == QuotationStatus.approved,
+                )
+                .scalar_subquery(),
+            )
+        )
+    ).one()
+
+    # One row per invitation with the supplier's own quotation status joined in.
+    list_columns = (
+        RFQ.id,
+        RFQ.rfq_number,
+        RFQ.title,
+        RFQ.category,
+        RFQ.status,
+        RFQ.deadline,
+        RFQInvitation.status,
+        RFQInvitation.invited_at,
+        Quotation.status,
+    )
+    invitation_rows = (
+        select(*list_columns)
+        .join(RFQ, RFQInvitation.rfq_id == RFQ.id)
+        .outerjoin(Quotation, own_quotation)
+        .where(RFQInvitation.supplier_id == supplier_id)
+    )
+    recent_invitations = (
+        await db.execute(invitation_rows.order_by(RFQInvitation.invited_at.desc()).limit(limit))
+    ).all()
+    active_rfqs = (
+        await db.execute(
+            invitation_rows.where(RFQ.status == RFQStatus.open).order_by(RFQ.deadline.asc()).limit(limit)
+        )
+    ).all()
+    purchase_orders = (
+        await db.execute(
+            select(
+                Quotation.id,
+                Quotation.rfq_id,
+                RFQ.title,
+                RFQ.category,
+                Quotation.amount,
+                Quotation.currency,
+                Quotation.approved_at,
+            )
+            .join(RFQ, Quotation.rfq_id == RFQ.id)
+            .where(
+                Quotation.supplier_id == supplier_id,
+                Quotation.status == QuotationStatus.approved,
+            )
+            .order_by(Quotation.approved_at.desc())
+            .limit(limit)
+        )
+    ).all()
+
+    def invitation_item(row) -> dict:
+        rfq_id, rfq_number, title, category, rfq_status, deadline, status_, invited_at, quotation_status = row
+        return {
+            "rfq_id": rfq_id,
+            "rfq_number": rfq_number,
+            "rfq_title": title,
+            "rfq_status": _status_value(rfq_status),
+            "category": category,
+            "deadline": deadline,
+            "status": status_,
+            "invited_at": invited_at,
+            "has_responded": quotation_status is not None,
+            "quotation_status": _status_value(quotation_status),
+        }
+
+    invitations_total, active_total, awaiting_response, purchase_orders_total = counts
+    return {
+        "counts": {
+            "invitations": invitations_total,
+            "active_rfqs": active_total,
+            "awaiting_response": awaiting_response,
+            "purchase_orders": purchase_orders_total,
+        },
+        "invitations": [invitation_item(row) for row in recent_invitations],
+        "active_rfqs": [invitation_item(row) for row in active_rfqs],
+        "purchase_orders": [
+            {
+                "id": quotation_id,
+                "rfq_id": rfq_id,
+                "rfq_title": title,
+                "rfq_category": category,
+                "amount": float(amount or 0.0),
+                "currency": currency,
+                "approved_at": approved_at,
+            }
+            for quotation_id, rfq_id, title, category, amount, currency, approved_at in purchase_orders
+        ],
+    }
+
+
+@router.get("/me/invitations/{rfq_id}")
+async def get_my_invitation(
+    rfq_id: int,
+    supplier: SupplierContext = Depends(get_current_supplier_context_async),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Full details (description and documents) for one invited RFQ."""
+    row = (
+        await db.execute(
+            select(RFQInvitation, RFQ)
+            .join(RFQ, RFQInvitation.rfq_id == RFQ.id)
+            .options(selectinload(RFQ.documents))
+            .where(RFQInvitation.supplier_id == supplier.profile_id, RFQ.id == rfq_id)
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Invitation not found")
+    invitation, rfq = row
+    quotation = (await _quotation_map(db, supplier.profile_id, [rfq.id])).get(rfq.id)
+    return {
+        "rfq_id": rfq.id,
+        "rfq_number": rfq.rfq_number,
+        "rfq_title": rfq.title,
+        "rfq_description": rfq.description,
+        "rfq_status": _status_value(rfq.status),
+        "category": rfq.category,
+        "deadline": rfq.deadline,
+        "response_locked": rfq.response_locked,
+        "status": invitation.status,
+        "invited_at": invitation.invited_at,
+        "has_responded": quotation is not None,
+        "quotation_status": _status_value(quotation.status) if quotation else None,
+        "documents": [
+            {
+                "id": document.id,
+                "original_filename": document.original_filename,
+                "file_path": document.file_path,
+                "uploaded_at": document.uploaded_at,
+            }
+            for document in rfq.documents
+        ],
+    }
+
+
 @router.get("/me/purchase-orders", response_model=List[dict])
 def get_purchase_orders(
-    current_supplier: SupplierProfile = Depends(get_current_supplier_profile),
-    db: Session = Depends(get_db),
+    current_supplier: SupplierContext = Depends(get_current_supplier_context),
+    db: Session = Depends(get_read_db),
 ):
     """Return quotations that have been approved for the supplier."""
     purchase_orders = (
         db.query(Quotation)
         .options(joinedload(Quotation.rfq))
         .filter(
-            Quotation.supplier_id == current_supplier.id,
+            Quotation.supplier_id == current_supplier.profile_id,
             Quotation.status == QuotationStatus.approved,
         )
         .order_by(Quotation.approved_at.desc())
@@ -23,6 +23,8 @@ from .supplier import (
 from .category import CategoryCreate, CategoryRead, CategoryUpdate
 from .message import MessageCreate, MessageResponse, MessageListResponse, MessageStatusEnum
 from .department import DepartmentRead
+from .profiling import ProfileSummary
+from .search import SearchHit, SearchResults
 from .company_settings import CompanySettingsCreate, CompanySettingsUpdate, CompanySettingsRead
 from .request import (
     RequestCreate,
@@ -75,6 +77,9 @@ __all__ = [
     "RequestStatusEnum",
     "RequestDocumentRead",
     "DepartmentRead",
+    "ProfileSummary",
+    "SearchHit",
+    "SearchResults",
     "RequestSupplierInvite",
     "CompanySettingsCreate",
     "CompanySettingsUpdate",
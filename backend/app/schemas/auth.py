@@ -1,7 +1,7 @@
 """Authentication schemas."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field, field_validator
 
@@ -57,6 +57,7 @@ class UserRead(UserBase):
     role: str
     is_active: bool
     timezone: Optional[str] = "Africa/Cairo"
+    notification_frequency: Optional[str] = "immediate"
     created_at: Optional[datetime]
     department_name: Optional[str] = None  # For HeadOfDepartment role
 
@@ -65,3 +66,4 @@ class UserUpdate(ORMBase):
     """Schema for updating user profile settings."""
     full_name: Optional[str] = None
     timezone: Optional[str] = None
+    notification_frequency: Optional[Literal["immediate", "hourly", "daily"]] = None
@@ -22,7 +22,8 @@ class MessageResponse(BaseModel):
     sender_name: str
     recipient_id: int
     recipient_name: str
-    supplier_id: int
+    # None on internal notices between staff, e.g. quotation decisions
+    supplier_id: Optional[int] = None
     supplier_name: str
     subject: str
     content: str
@@ -0,0 +1,16 @@
+"""Request profile schemas."""
+
+from datetime import datetime
+
+from .common import ORMBase
+
+
+class ProfileSummary(ORMBase):
+    id: str
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    sample_count: int
+    user_id: int
+    created_at: datetime
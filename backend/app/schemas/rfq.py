@@ -4,7 +4,7 @@ from datetime import datetime, date
 from decimal import Decimal
 from typing import Any, List, Optional
 
-from pydantic import Field, model_validator, field_validator
+from pydantic import BaseModel, Field, ModelWrapValidatorHandler, model_validator, field_validator
 
 from .common import ORMBase
 
@@ -72,6 +72,24 @@ class RFQRead(ORMBase):
     created_by_role: Optional[str] = None
     documents: List["RFQDocumentRead"] = []
 
+    @model_validator(mode='wrap')
+    @classmethod
+    def add_creator_info(cls, data: Any, handler: ModelWrapValidatorHandler["RFQRead"]) -> "RFQRead":
+        """Fill the creator fields from an already-loaded ``created_by`` relationship.
+
+        Reads the instance ``__dict__`` so an unloaded relationship is never
+        lazy-loaded (which would fail on an async session).
+        """
+        rfq = handler(data)
+        if isinstance(data, (dict, BaseModel)) or not hasattr(data, '__dict__'):
+            return rfq
+        creator = vars(data).get('created_by')
+        if creator is not None:
+            role = getattr(creator, 'role', None)
+            rfq.created_by_name = getattr(creator, 'full_name', None)
+            rfq.created_by_role = getattr(role, 'value', role)
+        return rfq
+
 
 class RFQReadForSupplier(ORMBase):
     """RFQ schema for suppliers - excludes budget information."""
@@ -0,0 +1,23 @@
+"""Search result schemas."""
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    kind: Literal["rfq", "request", "supplier", "message"]
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    rank: float
+    created_at: Optional[datetime] = None
+
+
+class SearchResults(BaseModel):
+    query: str
+    items: list[SearchHit]
+    limit: int
+    offset: int
+    has_more: bool
@@ -3,32 +3,48 @@
 import logging
 from typing import Optional
 
-from passlib.exc import InvalidHashError, MalformedHashError, UnknownHashError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models import User, UserRole
 from ..schemas import UserCreate
-from ..utils.security import get_password_hash, verify_password
+from ..utils.security import get_password_hash
+from .password_hashing import verify_and_update_async
 
 logger = logging.getLogger("procurahub.auth")
 
+# passlib signals unknown, malformed and invalid hashes with ValueError
+# subclasses (InvalidHashError/MalformedHashError are factory functions and
+# cannot appear in an except clause).
+_HASH_ERRORS = (ValueError, TypeError)
+
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email.lower()).first()
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = get_user_by_email(db, email)
+async def authenticate_user_async(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Verify credentials in the hashing pool, upgrading outdated hashes.
+
+    Raises :class:`~app.services.password_hashing.PasswordHashingBusy` when
+    the pool is saturated.
+    """
+    user = (await db.execute(select(User).where(User.email == email.lower()))).scalars().first()
     if not user:
         return None
 
     try:
-        if not verify_password(password, user.hashed_password):
-            return None
-    except (ValueError, TypeError, UnknownHashError, MalformedHashError, InvalidHashError):
+        verified, new_hash = await verify_and_update_async(password, user.hashed_password)
+    except _HASH_ERRORS:
         logger.warning("Invalid password hash stored for user %s", user.email)
         return None
+    if not verified:
+        return None
 
+    if new_hash:
+        # Committed by the request's session scope.
+        user.hashed_password = new_hash
     return user
 
 
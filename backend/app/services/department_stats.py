@@ -0,0 +1,133 @@
+"""Per-department request and spend statistics.
+
+Computed with one grouped query over purchase requests (outer-joined to
+each request's awarded quotation) plus one query for the departments
+themselves, and cached per worker. Commits that add or change a
+department, request or quotation clear the cache. The queries always run
+on the primary: the cache is cleared when the primary commits, so a
+lagging replica read just after would be cached for the whole TTL.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import and_, event, func, select
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import Department, PurchaseRequest, Quotation, QuotationStatus, User
+from ..utils.cache import TTLCache
+
+
+settings = get_settings()
+
+_STATS_KEY = "all"
+_PRIMARY = {"primary": True}
+_stats: TTLCache[tuple[dict, ...]] = TTLCache(settings.department_stats_cache_seconds, maxsize=1)
+
+
+def _status_value(status) -> str:
+    return status.value if hasattr(status, "value") else str(status)
+
+
+def _compute(db: Session) -> tuple[dict, ...]:
+    departments = db.execute(
+        select(
+            Department.id,
+            Department.name,
+            Department.description,
+            Department.head_of_department_id,
+            User.full_name,
+        )
+        .outerjoin(User, User.id == Department.head_of_department_id)
+        .order_by(Department.name),
+        bind_arguments=_PRIMARY,
+    ).all()
+
+    stats: dict[Optional[int], dict] = {
+        department_id: {
+            "id": department_id,
+            "name": name,
+            "description": description,
+            "head_of_department_id": head_id,
+            "head_of_department_name": head_name,
+            "head_count": 1 if head_id is not None else 0,
+            "request_count": 0,
+            "requests_by_status": {},
+            "spend": {},
+        }
+        for department_id, name, description, head_id, head_name in departments
+    }
+
+    # Each RFQ has at most one approved quotation, so the outer join never
+    # duplicates a request.
+    grouped = db.execute(
+        select(
+            PurchaseRequest.department_id,
+            PurchaseRequest.status,
+            Quotation.currency,
+            func.count(PurchaseRequest.id),
+            func.coalesce(func.sum(Quotation.amount), 0),
+        )
+        .outerjoin(
+            Quotation,
+            and_(
+                Quotation.rfq_id == PurchaseRequest.rfq_id,
+                Quotation.status == QuotationStatus.approved,
+            ),
+        )
+        .where(PurchaseRequest.department_id.is_not(None))
+        .group_by(PurchaseRequest.department_id, PurchaseRequest.status, Quotation.currency),
+        bind_arguments=_PRIMARY,
+    ).all()
+
+    for department_id, status, currency, request_count, spend in grouped:
+        entry = stats.get(department_id)
+        if entry is None:
+            continue
+        status_key = _status_value(status)
+        entry["request_count"] += request_count
+        entry["requests_by_status"][status_key] = entry["requests_by_status"].get(status_key, 0) + request_count
+        if currency is not None:
+            entry["spend"][currency] = float(Decimal(entry["spend"].get(currency, 0)) + Decimal(spend or 0))
+
+    return tuple(stats.values())
+
+
+def department_stats(db: Session, head_of_department_id: Optional[int] = None) -> list[dict]:
+    """Statistics for every department, or only those headed by ``head_of_department_id``."""
+    rows = _stats.get_or_set(_STATS_KEY, lambda: _compute(db))
+    if head_of_department_id is not None:
+        rows = tuple(row for row in rows if row["head_of_department_id"] == head_of_department_id)
+    return [dict(row, requests_by_status=dict(row["requests_by_status"]), spend=dict(row["spend"])) for row in rows]
+
+
+def invalidate_department_stats() -> None:
+    _stats.clear()
+
+
+@event.listens_for(Department, "after_insert")
+@event.listens_for(Department, "after_update")
+@event.listens_for(Department, "after_delete")
+@event.listens_for(PurchaseRequest, "after_insert")
+@event.listens_for(PurchaseRequest, "after_update")
+@event.listens_for(PurchaseRequest, "after_delete")
+@event.listens_for(Quotation, "after_update")
+@event.listens_for(Quotation, "after_delete")
+def _mark_department_stats_changed(mapper, connection, target) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["department_stats_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_department_stats(session: Session) -> None:
+    if session.info.pop("department_stats_changed", False):
+        invalidate_department_stats()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_department_stats_changed(session: Session) -> None:
+    session.info.pop("department_stats_changed", None)
@@ -2,15 +2,40 @@
 
 import logging
 import smtplib
+import weakref
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Iterable, Optional
 
+from fastapi import BackgroundTasks
+
 from ..config import Settings, get_settings
+from ..utils import metrics
 
 logger = logging.getLogger("procurahub.email")
 
 
+def _clean_addresses(addresses: Iterable[str]) -> list[str]:
+    return [
+        str(address).strip()
+        for address in addresses
+        if address and str(address).strip()
+    ]
+
+
+class _QueuedEmail:
+    """Holds one email's place in the ``EMAIL_QUEUED`` gauge until it is sent or dropped."""
+
+    def __init__(self) -> None:
+        self.pending = True
+        metrics.EMAIL_QUEUED.inc()
+
+    def done(self) -> None:
+        if self.pending:
+            self.pending = False
+            metrics.EMAIL_QUEUED.dec()
+
+
 class EmailService:
     """Simple email dispatch service with console fallback."""
 
@@ -22,8 +47,9 @@ class EmailService:
         recipients: Iterable[str], 
         subject: str, 
         body: str,
-        html_body: Optional[str] = None
-    ) -> None:
+        html_body: Optional[str] = None,
+        bcc: Optional[Iterable[str]] = None,
+    ) -> bool:
         """Send an email notification.
 
         In demo mode, messages are emitted to the application logger so the flow
@@ -34,34 +60,43 @@ class EmailService:
             subject: Email subject line
             body: Plain text email body
             html_body: Optional HTML email body for rich formatting
+            bcc: Optional blind-copy addresses; one message reaches every
+                recipient over a single SMTP session
+
+        Returns:
+            False when the SMTP server did not accept the message, True otherwise
         """
-        recipients = [
-            str(recipient).strip()
-            for recipient in recipients
-            if recipient and str(recipient).strip()
-        ]
-        if not recipients:
-            return
+        recipients = _clean_addresses(recipients)
+        bcc_recipients = _clean_addresses(bcc or [])
+        if not recipients and not bcc_recipients:
+            return True
 
         if self.settings.email_console_fallback:
             body_to_log = html_body if html_body else body
-            logger.info(
-                "[EMAIL:%s] To=%s Subject=%s",
-                self.settings.email_sender,
-                ", ".join(recipients),
-                subject,
-            )
-            logger.debug("Body: %s", body_to_log[:200] + "..." if len(body_to_log) > 200 else body_to_log)
+            with metrics.EMAIL_SEND_SECONDS.labels("console").time():
+                logger.info(
+                    "[EMAIL:%s] To=%s Bcc=%d Subject=%s",
+                    self.settings.email_sender,
+                    ", ".join(recipients),
+                    len(bcc_recipients),
+                    subject,
+                )
+                logger.debug("Body: %s", body_to_log[:200] + "..." if len(body_to_log) > 200 else body_to_log)
+            return True
         else:
             # Send via SMTP
             try:
-                self._send_smtp(recipients, subject, body, html_body)
+                with metrics.EMAIL_SEND_SECONDS.labels("smtp").time():
+                    self._send_smtp(recipients, subject, body, html_body, bcc_recipients)
                 logger.info(
-                    "✓ Email sent successfully to %s (subject=%s)", 
+                    "✓ Email sent successfully to %s (bcc=%d, subject=%s)", 
                     ", ".join(recipients), 
+                    len(bcc_recipients),
                     subject
                 )
+                return True
             except Exception as e:
+                metrics.EMAIL_FAILURES.labels("smtp").inc()
                 # Log error but don't raise - emails are non-critical
                 logger.warning(
                     "✗ Failed to send email to %s (subject=%s): %s. Email will not be delivered.", 
@@ -70,13 +105,48 @@ class EmailService:
                     str(e)
                 )
                 # Don't raise - background tasks should not crash the app
+                return False
     
+    def queue_email(
+        self,
+        background_tasks: BackgroundTasks,
+        recipients: Iterable[str],
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        bcc: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Send an email once the response has gone out, counted in ``EMAIL_QUEUED`` until then.
+
+        Background tasks are dropped when the handler fails after queueing
+        them; the email then leaves the gauge when ``background_tasks`` is
+        garbage collected.
+        """
+        job = _QueuedEmail()
+        weakref.finalize(background_tasks, job.done)
+        background_tasks.add_task(self._send_queued, job, recipients, subject, body, html_body, bcc)
+
+    def _send_queued(
+        self,
+        job: _QueuedEmail,
+        recipients: Iterable[str],
+        subject: str,
+        body: str,
+        html_body: Optional[str],
+        bcc: Optional[Iterable[str]],
+    ) -> bool:
+        try:
+            return self.send_email(recipients, subject, body, html_body, bcc)
+        finally:
+            job.done()
+
     def _send_smtp(
         self, 
         recipients: list[str], 
         subject: str, 
         body: str,
-        html_body: Optional[str] = None
+        html_body: Optional[str] = None,
+        bcc: Optional[list[str]] = None,
     ) -> None:
         """Send email via SMTP."""
         if not self.settings.smtp_username or not self.settings.smtp_password:
@@ -85,7 +155,8 @@ class EmailService:
         # Create message
         msg = MIMEMultipart('alternative')
         msg['From'] = self.settings.email_sender
-        msg['To'] = ", ".join(recipients)
+        # Bcc addresses only go in the envelope, never in the headers.
+        msg['To'] = ", ".join(recipients) if recipients else "undisclosed-recipients:;"
         msg['Subject'] = subject
         
         # Attach plain text version
@@ -102,7 +173,7 @@ class EmailService:
             if self.settings.smtp_use_tls:
                 server.starttls()
             server.login(self.settings.smtp_username, self.settings.smtp_password)
-            server.sendmail(self.settings.email_sender, recipients, msg.as_string())
+            server.sendmail(self.settings.email_sender, recipients + (bcc or []), msg.as_string())
 
 
 email_service = EmailService(get_settings())
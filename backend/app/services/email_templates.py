@@ -770,3 +770,48 @@ def new_message_email(
     """
     
     return get_base_template(content, "New Message - ProcuraHub")
+
+
+def notification_digest_email(
+    recipient_name: str,
+    items: list[tuple[str, str]],
+    period_label: str = "recent",
+    app_url: str = "http://localhost:5173"
+) -> str:
+    """Email template summarising several notifications in one message.
+
+    ``items`` holds ``(subject, summary)`` pairs in the order they occurred.
+    """
+    
+    rows = "".join(
+        f"""
+            <div class="info-box">
+                <div class="label">{subject}</div>
+                <div class="value" style="white-space: pre-wrap;">{summary}</div>
+            </div>
+        """
+        for subject, summary in items
+    )
+    
+    content = f"""
+        <div class="header">
+            <h1>Notification Summary</h1>
+            <p>{len(items)} {period_label} update{'s' if len(items) != 1 else ''}</p>
+        </div>
+        <div class="content">
+            <h2>Hello {recipient_name},</h2>
+            <p>Here is a summary of the activity that needs your attention.</p>
+            
+            {rows}
+            
+            <div style="text-align: center;">
+                <a href="{app_url}/login" class="button">Open ProcuraHub</a>
+            </div>
+        </div>
+        <div class="footer">
+            <p><strong>ProcuraHub</strong> - Procurement Management System</p>
+            <p>You receive summaries because of your notification preferences.</p>
+        </div>
+    """
+    
+    return get_base_template(content, "Notification Summary - ProcuraHub")
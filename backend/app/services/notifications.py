@@ -0,0 +1,376 @@
+"""Notification delivery: role fan-out and per-user digests.
+
+Handlers that alert a whole role (e.g. every Procurement user when a
+quotation arrives) render their template once and hand it to
+:func:`fan_out`, which sends a single Bcc message per batch of recipients
+instead of one SMTP session per user. Single-user notifications go through
+:func:`notify_user`.
+
+Users whose ``notification_frequency`` is hourly or daily do not receive
+individual emails: their events are stored in ``notification_events`` and
+:func:`flush_due_digests` sends each of them one summary when their
+schedule comes due.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, NamedTuple, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+from fastapi import BackgroundTasks
+from sqlalchemy import and_, event, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models import NotificationEvent, NotificationFrequency, User, UserRole
+from ..utils.cache import TTLCache
+from .email import email_service
+from .email_templates import notification_digest_email
+
+
+logger = logging.getLogger("procurahub.notifications")
+settings = get_settings()
+
+PROCUREMENT_ROLES = (UserRole.procurement, UserRole.superadmin)
+DIGEST_FREQUENCIES = (NotificationFrequency.hourly.value, NotificationFrequency.daily.value)
+
+
+class Recipient(NamedTuple):
+    user_id: int
+    email: str
+    full_name: str
+    frequency: str
+
+    @property
+    def wants_digest(self) -> bool:
+        return self.frequency in DIGEST_FREQUENCIES
+
+
+def recipient_for_user(user: User, email: Optional[str] = None) -> Recipient:
+    """Recipient for ``user``, optionally delivering to another address
+    (e.g. a supplier profile's contact email)."""
+    return Recipient(
+        getattr(user, "id"),
+        str(email or getattr(user, "email")),
+        str(getattr(user, "full_name", "") or ""),
+        getattr(user, "notification_frequency", None) or NotificationFrequency.immediate.value,
+    )
+
+
+_role_recipients: TTLCache[tuple[Recipient, ...]] = TTLCache(
+    settings.notification_recipient_cache_seconds
+)
+
+
+def _roles_key(roles: Iterable[UserRole]) -> tuple[str, ...]:
+    return tuple(sorted({role.value for role in roles}))
+
+
+def _recipients_statement(roles_key: tuple[str, ...]):
+    return (
+        select(User.id, User.email, User.full_name, User.notification_frequency)
+        .where(User.role.in_(roles_key), User.is_active == True)
+        .order_by(User.id)
+    )
+
+
+def _to_recipients(rows) -> tuple[Recipient, ...]:
+    return tuple(
+        Recipient(user_id, email, full_name or "", frequency or NotificationFrequency.immediate.value)
+        for user_id, email, full_name, frequency in rows
+        if email
+    )
+
+
+def recipients_for_roles(db: Session, roles: Iterable[UserRole]) -> tuple[Recipient, ...]:
+    """Active users holding any of ``roles``, cached per worker."""
+    key = _roles_key(roles)
+    cached = _role_recipients.get(key)
+    if cached is None:
+        cached = _to_recipients(db.execute(_recipients_statement(key)))
+        _role_recipients.set(key, cached)
+    return cached
+
+
+async def recipients_for_roles_async(
+    db: AsyncSession, roles: Iterable[UserRole]
+) -> tuple[Recipient, ...]:
+    """Async counterpart of :func:`recipients_for_roles` sharing the same cache."""
+    key = _roles_key(roles)
+    cached = _role_recipients.get(key)
+    if cached is None:
+        cached = _to_recipients(await db.execute(_recipients_statement(key)))
+        _role_recipients.set(key, cached)
+    return cached
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_users_changed(mapper, connection, target: User) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["users_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_role_recipients(session: Session) -> None:
+    # Cleared on commit rather than flush so a concurrent request cannot
+    # re-cache the pre-change rows while the transaction is still open.
+    if session.info.pop("users_changed", False):
+        _role_recipients.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_users_changed(session: Session) -> None:
+    session.info.pop("users_changed", None)
+
+
+def _batches(addresses: Sequence[str], size: int) -> Iterable[list[str]]:
+    size = max(1, size)
+    for start in range(0, len(addresses), size):
+        yield list(addresses[start:start + size])
+
+
+def _summarise(plain_body: str) -> str:
+    """First paragraph after the greeting, used as a digest line."""
+    paragraphs = [paragraph.strip() for paragraph in plain_body.split("\n\n") if paragraph.strip()]
+    return paragraphs[1] if len(paragraphs) > 1 else (paragraphs[0] if paragraphs else "")
+
+
+def queue_digest_events(db: Session, recipients: Iterable[Recipient], subject: str, summary: str) -> int:
+    """Add digest events to ``db``; they are delivered once the caller commits."""
+    rows = [
+        {"user_id": recipient.user_id, "email": recipient.email, "subject": subject[:255], "summary": summary}
+        for recipient in recipients
+    ]
+    if rows:
+        db.execute(insert(NotificationEvent), rows)
+    return len(rows)
+
+
+def _store_digest_events(recipients: list[Recipient], subject: str, summary: str) -> None:
+    db = SessionLocal()
+    try:
+        queue_digest_events(db, recipients, subject, summary)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to queue digest notification %r", subject)
+    finally:
+        db.close()
+
+
+def fan_out(
+    background_tasks: BackgroundTasks,
+    recipients: Sequence[Recipient],
+    subject: str,
+    plain_body: str,
+    html_body: str | None = None,
+    summary: str | None = None,
+) -> None:
+    """Deliver one pre-rendered notification to every recipient.
+
+    Immediate subscribers share Bcc messages of up to
+    ``NOTIFICATION_BCC_BATCH_SIZE`` addresses; digest subscribers get
+    ``summary`` (by default the first paragraph of the body) queued for
+    their next summary email.
+    """
+    immediate: list[str] = []
+    digest: list[Recipient] = []
+    for recipient in recipients:
+        if recipient.wants_digest:
+            digest.append(recipient)
+        elif recipient.email not in immediate:
+            immediate.append(recipient.email)
+
+    for batch in _batches(immediate, settings.notification_bcc_batch_size):
+        email_service.queue_email(background_tasks, [], subject, plain_body, html_body, batch)
+    if digest:
+        background_tasks.add_task(
+            _store_digest_events, digest, subject, summary or _summarise(plain_body)
+        )
+
+
+def notify_user(
+    background_tasks: BackgroundTasks,
+    recipient: Recipient,
+    subject: str,
+    plain_body: str,
+    html_body: str | None = None,
+    summary: str | None = None,
+) -> None:
+    """Send a personal notification now, or queue it for the user's digest."""
+    if recipient.wants_digest:
+        background_tasks.add_task(
+            _store_digest_events, [recipient], subject, summary or _summarise(plain_body)
+        )
+    else:
+        email_service.queue_email(background_tasks, [recipient.email], subject, plain_body, html_body)
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC.
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def digest_cutoff(frequency: str, user_timezone: Optional[str], now: datetime) -> datetime:
+    """Events created before the returned instant are due for delivery.
+
+    Hourly digests cover everything before the top of the current hour;
+    daily digests everything before the most recent
+    ``NOTIFICATION_DAILY_DIGEST_HOUR`` in the user's own timezone. Users who
+    switched back to immediate delivery get their backlog at once.
+    """
+    if frequency == NotificationFrequency.hourly.value:
+        return now.replace(minute=0, second=0, microsecond=0)
+    if frequency == NotificationFrequency.daily.value:
+        try:
+            zone = ZoneInfo(user_timezone or "UTC")
+        except (KeyError, ValueError):
+            zone = timezone.utc
+        local_now = now.astimezone(zone)
+        boundary = local_now.replace(
+            hour=settings.notification_daily_digest_hour, minute=0, second=0, microsecond=0
+        )
+        if boundary > local_now:
+            boundary -= timedelta(days=1)
+        return boundary.astimezone(timezone.utc)
+    return now
+
+
+def _period_label(frequency: str) -> str:
+    return {
+        NotificationFrequency.hourly.value: "hourly",
+        NotificationFrequency.daily.value: "daily",
+    }.get(frequency, "recent")
+
+
+def _claimable(now: datetime):
+    """Unsent events that no flush holds, or whose lease has expired."""
+    lease_expired = now - timedelta(seconds=settings.notification_digest_lease_seconds)
+    return and_(
+        NotificationEvent.sent_at.is_(None),
+        or_(NotificationEvent.claimed_at.is_(None), NotificationEvent.claimed_at < lease_expired),
+    )
+
+
+def flush_due_digests(db: Session, now: Optional[datetime] = None) -> int:
+    """Send every digest that is due and return the number of emails sent.
+
+    Each user's due events are leased with a conditional UPDATE that sets
+    ``claimed_at`` and this flush's ``claim_token``, and the lease is
+    committed before sending, so concurrent workers never pick up the same
+    events. ``sent_at`` is set only once the email has been accepted; a
+    failed send releases the lease so the next flush retries it. Events
+    left leased by a worker that died are taken over once
+    ``NOTIFICATION_DIGEST_LEASE_SECONDS`` have passed.
+    """
+    now = _as_utc(now or datetime.now(timezone.utc))
+    token = uuid.uuid4().hex
+    pending = db.execute(
+        select(
+            User.id,
+            User.full_name,
+            User.notification_frequency,
+            User.timezone,
+            func.min(NotificationEvent.created_at),
+        )
+        .join(NotificationEvent, NotificationEvent.user_id == User.id)
+        .where(_claimable(now))
+        .group_by(User.id, User.full_name, User.notification_frequency, User.timezone)
+    ).all()
+
+    sent = 0
+    for user_id, full_name, frequency, user_timezone, oldest in pending:
+        cutoff = digest_cutoff(frequency, user_timezone, now)
+        if oldest is None or _as_utc(oldest) >= cutoff:
+            continue
+
+        claimed = db.execute(
+            update(NotificationEvent)
+            .where(
+                NotificationEvent.user_id == user_id,
+                NotificationEvent.created_at < cutoff,
+                _claimable(now),
+            )
+            .values(claimed_at=now, claim_token=token)
+            .returning(
+                NotificationEvent.id,
+                NotificationEvent.email,
+                NotificationEvent.subject,
+                NotificationEvent.summary,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+
+        by_email: dict[str, list[tuple[int, str, str]]] = {}
+        for event_id, email, subject, summary in claimed:
+            by_email.setdefault(email, []).append((event_id, subject, summary))
+
+        for email, events in by_email.items():
+            items = [(subject, summary) for _, subject, summary in sorted(events)]
+            try:
+                delivered = _send_digest(email, full_name or "there", items, _period_label(frequency))
+            except Exception:
+                logger.exception("Failed to send digest to %s", email)
+                delivered = False
+
+            outcome = {"sent_at": now} if delivered else {"claimed_at": None, "claim_token": None}
+            db.execute(
+                update(NotificationEvent)
+                .where(
+                    NotificationEvent.id.in_([event_id for event_id, _, _ in events]),
+                    NotificationEvent.claim_token == token,
+                )
+                .values(**outcome)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            sent += delivered
+    return sent
+
+
+def _send_digest(email: str, name: str, items: list[tuple[str, str]], period_label: str) -> bool:
+    plain_body = (
+        f"Hello {name},\n\n"
+        f"Here is your {period_label} summary of {len(items)} update(s):\n\n"
+        + "\n\n".join(f"- {subject}\n  {summary}" for subject, summary in items)
+        + "\n\nBest regards,\nProcuraHub Team"
+    )
+    return email_service.send_email(
+        [email],
+        f"ProcuraHub Summary - {len(items)} update{'s' if len(items) != 1 else ''}",
+        plain_body,
+        notification_digest_email(name, items, period_label=period_label),
+    )
+
+
+def run_digest_flush() -> int:
+    """Flush due digests in a fresh session (used by the worker loop and cron script)."""
+    db = SessionLocal()
+    try:
+        return flush_due_digests(db)
+    except Exception:
+        db.rollback()
+        logger.exception("Digest flush failed")
+        return 0
+    finally:
+        db.close()
+
+
+async def digest_worker(poll_seconds: float) -> None:
+    """Periodically flush due digests until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(poll_seconds)
+        sent = await loop.run_in_executor(None, run_digest_flush)
+        if sent:
+            logger.info("Sent %d notification digest(s)", sent)
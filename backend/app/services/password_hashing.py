@@ -0,0 +1,88 @@
+"""Password hashing off the event loop.
+
+bcrypt is deliberately slow (~250 ms of CPU at cost 12). Run inline, it
+stalls every other request the worker is serving; run in the default
+thread pool, a burst of logins still contends for the worker's one core.
+This module sends login verification to a bounded pool of
+``PASSWORD_HASH_WORKERS`` processes (2 by default), so logins use more
+cores and the event loop stays responsive. Each uvicorn worker starts its
+own pool, so a host runs ``WEB_CONCURRENCY x PASSWORD_HASH_WORKERS``
+hashing processes; size the two together against the CPU count.
+
+Admission control caps the logins queued for or running in the pool at
+``PASSWORD_HASH_MAX_PENDING``. Beyond that, :class:`PasswordHashingBusy` is
+raised immediately, which the login endpoint turns into a 503 with
+``Retry-After``; a queue of several seconds helps nobody.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from ..config import get_settings
+from ..utils.security import get_pwd_context, verify_and_update_password
+
+
+logger = logging.getLogger("procurahub.password_hashing")
+settings = get_settings()
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing pool already has its maximum pending work."""
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_admission = threading.BoundedSemaphore(settings.password_hash_max_pending)
+
+
+def _warm_up() -> None:
+    # Build the CryptContext (and import passlib/bcrypt) once per process.
+    get_pwd_context()
+
+
+def pool_size() -> int:
+    return settings.password_hash_workers
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn rather than fork: the parent runs an event loop and
+            # database pools whose state must not be copied into workers.
+            _executor = ProcessPoolExecutor(
+                max_workers=pool_size(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up,
+            )
+            logger.info("Started password hashing pool with %d process(es)", pool_size())
+        return _executor
+
+
+def shutdown_pool() -> None:
+    """Stop the worker processes (called on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run(function, *args):
+    if not _admission.acquire(blocking=False):
+        raise PasswordHashingBusy()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), function, *args)
+    finally:
+        _admission.release()
+
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Pool-backed :func:`~app.utils.security.verify_and_update_password`."""
+    return await _run(verify_and_update_password, plain_password, hashed_password)
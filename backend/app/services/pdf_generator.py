@@ -21,6 +21,7 @@ from reportlab.platypus import (
 
 from ..config import get_settings
 from ..models import CompanySettings, RFQ, Quotation, SupplierProfile
+from ..utils import metrics
 
 settings = get_settings()
 
@@ -204,6 +205,7 @@ def _ensure_decimal(value) -> Decimal:
         return Decimal("0")
 
 
+@metrics.PDF_RENDER_SECONDS.labels("purchase_order").time()
 def generate_purchase_order_pdf(
     rfq: RFQ,
     quotation: Quotation,
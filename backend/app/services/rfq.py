@@ -3,11 +3,14 @@
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 from typing import Iterable, List
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..config import get_settings
 from ..models import (
     RFQ,
+    Quotation,
     RFQInvitation,
     RFQStatus,
     SupplierCategory,
@@ -16,6 +19,8 @@ from ..models import (
 )
 from .email import email_service
 from .email_templates import rfq_invitation_email
+from .notifications import DIGEST_FREQUENCIES, Recipient, queue_digest_events
+from . import rfq_access
 
 
 settings = get_settings()
@@ -40,7 +45,7 @@ def close_expired_rfqs(db: Session) -> int:
         .all()
     )
 
-    closed_count = 0
+    closed_rfqs: list[RFQ] = []
     for rfq in open_rfqs:
         deadline = getattr(rfq, "deadline", None)
         if deadline is None:
@@ -60,26 +65,136 @@ def close_expired_rfqs(db: Session) -> int:
             # Unlock responses when deadline passes so procurement can see quotations
             if getattr(rfq, "response_locked", False):
                 setattr(rfq, "response_locked", False)
-            closed_count += 1
+            closed_rfqs.append(rfq)
 
-    if closed_count:
+    if closed_rfqs:
         db.flush()
-    return closed_count
+        for rfq in closed_rfqs:
+            statement = _non_response_penalty_statement(rfq.id, str(rfq.category))
+            if statement is not None:
+                db.execute(statement)
+    return len(closed_rfqs)
+
+
+async def close_expired_rfqs_async(db: AsyncSession) -> int:
+    """Async variant of :func:`close_expired_rfqs` using a single set-based UPDATE.
+
+    Deadlines are stored in UTC, so comparing against the current UTC time is
+    equivalent to the Africa/Lusaka comparison done by the sync helper.
+    """
+    now_utc = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(RFQ)
+        .where(RFQ.status == RFQStatus.open, RFQ.deadline <= now_utc)
+        .values(status=RFQStatus.closed, response_locked=False)
+        .returning(RFQ.id, RFQ.category)
+        .execution_options(synchronize_session=False)
+    )
+    closed = result.all()
+    for rfq_id, category in closed:
+        statement = _non_response_penalty_statement(rfq_id, category)
+        if statement is not None:
+            await db.execute(statement)
+    return len(closed)
+
+
+def _non_response_penalty_statement(rfq_id: int, category: str):
+    """Build the UPDATE that down-weights suppliers who ignored an RFQ.
+
+    Returns None when the penalty is disabled.
+    """
+    penalty = settings.supplier_non_response_penalty
+    if not penalty:
+        return None
+    responded = (
+        select(Quotation.id)
+        .where(
+            Quotation.rfq_id == RFQInvitation.rfq_id,
+            Quotation.supplier_id == RFQInvitation.supplier_id,
+        )
+        .exists()
+    )
+    non_responders = select(RFQInvitation.supplier_id).where(
+        RFQInvitation.rfq_id == rfq_id, ~responded
+    )
+    return (
+        update(SupplierCategory)
+        .where(
+            SupplierCategory.name == category,
+            SupplierCategory.supplier_id.in_(non_responders),
+        )
+        .values(rotation_score=SupplierCategory.rotation_score + penalty)
+        .execution_options(synchronize_session=False)
+    )
 
 
 def select_suppliers_for_rfq(
     db: Session, category: str, limit: int | None = None
 ) -> List[SupplierProfile]:
-    """Select suppliers in a category using fairness heuristics."""
-    query = (
-        db.query(SupplierProfile)
-        .join(SupplierCategory)
-        .filter(SupplierCategory.name == category)
-        .order_by(SupplierProfile.invitations_sent.asc(), SupplierProfile.last_invited_at.asc())
+    """Select suppliers in a category using the weighted rotation queue.
+
+    The ordering is served by ``ix_supplier_categories_rotation`` so only
+    ``limit`` index entries are read regardless of how many suppliers share
+    the category.
+    """
+    queue = (
+        select(SupplierCategory.supplier_id)
+        .where(SupplierCategory.name == category)
+        .order_by(
+            SupplierCategory.rotation_score.asc(),
+            SupplierCategory.last_invited_at.asc(),
+            SupplierCategory.supplier_id.asc(),
+        )
     )
     if limit:
-        query = query.limit(limit)
-    return list(query.all())
+        queue = queue.limit(limit)
+    supplier_ids = list(db.execute(queue).scalars())
+    if not supplier_ids:
+        return []
+
+    profiles = {
+        profile.id: profile
+        for profile in db.query(SupplierProfile).filter(SupplierProfile.id.in_(supplier_ids))
+    }
+    return [profiles[supplier_id] for supplier_id in supplier_ids if supplier_id in profiles]
+
+
+def _record_invitations(db: Session, category: str, supplier_ids: List[int]) -> None:
+    """Advance fairness counters for invited suppliers with set-based UPDATEs.
+
+    Counters are incremented in SQL so concurrent RFQ creation cannot lose
+    updates, and the cost stays at two statements however many suppliers
+    are invited.
+    """
+    if not supplier_ids:
+        return
+    now = datetime.now(timezone.utc)
+    db.execute(
+        update(SupplierProfile)
+        .where(SupplierProfile.id.in_(supplier_ids))
+        .values(
+            invitations_sent=func.coalesce(SupplierProfile.invitations_sent, 0) + 1,
+            last_invited_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(SupplierCategory)
+        .where(
+            SupplierCategory.name == category,
+            SupplierCategory.supplier_id.in_(supplier_ids),
+        )
+        .values(
+            invitations_sent=SupplierCategory.invitations_sent + 1,
+            rotation_score=SupplierCategory.rotation_score + 1,
+            last_invited_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # Profiles already loaded in this session would otherwise keep stale counters.
+    for profile in db.identity_map.values():
+        if isinstance(profile, SupplierProfile) and profile.id in supplier_ids:
+            db.expire(profile, ["invitations_sent", "last_invited_at"])
 
 
 def create_invitations(
@@ -104,16 +219,46 @@ def create_invitations(
     rfq_deadline = getattr(rfq, "deadline")
     invited_by_name = getattr(invited_by, "full_name", "Procurement Team") if invited_by else "Procurement Team"
     
+    suppliers = list(suppliers)
+    _record_invitations(db, rfq_category, [getattr(supplier, "id") for supplier in suppliers])
+    rfq_access.invalidate_rfq_on_commit(db, getattr(rfq, "id"))
+
+    # Suppliers on hourly/daily digests get the invitation in their next summary.
+    digest_users: dict[int, Recipient] = {}
+    if send_emails and suppliers:
+        digest_users = {
+            supplier_id: Recipient(user_id, contact_email, company_name or "", frequency)
+            for supplier_id, user_id, contact_email, company_name, frequency in db.execute(
+                select(
+                    SupplierProfile.id,
+                    User.id,
+                    SupplierProfile.contact_email,
+                    SupplierProfile.company_name,
+                    User.notification_frequency,
+                )
+                .join(User, User.id == SupplierProfile.user_id)
+                .where(
+                    SupplierProfile.id.in_([getattr(supplier, "id") for supplier in suppliers]),
+                    User.notification_frequency.in_(DIGEST_FREQUENCIES),
+                )
+            )
+            if contact_email
+        }
+
     for supplier in suppliers:
         invitation = RFQInvitation(rfq_id=getattr(rfq, "id"), supplier_id=getattr(supplier, "id"))
         db.add(invitation)
-        current_invites = getattr(supplier, "invitations_sent") or 0
-        setattr(supplier, "invitations_sent", int(current_invites) + 1)
-        setattr(supplier, "last_invited_at", datetime.now(timezone.utc))
         invitations.append(invitation)
 
         # Send HTML email notification only if send_emails is True
-        if send_emails:
+        if send_emails and getattr(supplier, "id") in digest_users:
+            queue_digest_events(
+                db,
+                [digest_users[getattr(supplier, "id")]],
+                f"New RFQ Invitation: {rfq_title}",
+                f"You have been invited to quote for '{rfq_title}' in category '{rfq_category}'.",
+            )
+        elif send_emails:
             supplier_name = str(getattr(supplier, "company_name"))
             supplier_email = str(getattr(supplier, "contact_email"))
             
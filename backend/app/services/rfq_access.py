@@ -0,0 +1,90 @@
+"""Supplier access checks against RFQ invitations.
+
+Each RFQ's invited supplier ids are loaded once with a single lookup on
+``uq_rfq_invitations_rfq_supplier`` and kept per worker as a frozenset, so
+downloading every file in a tender pack does not query the invitation
+table per file. :func:`create_invitations` marks the RFQ as changed and the
+entry is dropped when that transaction commits.
+
+The cached set only answers "yes". It may have been read from a lagging
+replica, or before another worker invited more suppliers, so a supplier
+missing from it is looked up on the primary before access is refused.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import RFQInvitation
+from ..utils.cache import TTLCache
+
+
+settings = get_settings()
+
+_invited_suppliers: TTLCache[frozenset[int]] = TTLCache(
+    settings.rfq_access_cache_seconds, maxsize=settings.rfq_access_cache_size
+)
+
+
+def invited_supplier_ids(db: Session, rfq_id: int) -> frozenset[int]:
+    """Ids of every supplier invited to ``rfq_id``."""
+    invited = _invited_suppliers.get(rfq_id)
+    if invited is None:
+        invited = frozenset(
+            db.execute(
+                select(RFQInvitation.supplier_id).where(RFQInvitation.rfq_id == rfq_id)
+            ).scalars()
+        )
+        _invited_suppliers.set(rfq_id, invited)
+    return invited
+
+
+def is_invited(db: Session, rfq_id: int, supplier_id: int) -> bool:
+    """Whether ``supplier_id`` was invited to ``rfq_id``, checking the primary on a miss."""
+    if supplier_id in invited_supplier_ids(db, rfq_id):
+        return True
+    invited = (
+        db.execute(
+            select(RFQInvitation.id).where(
+                RFQInvitation.rfq_id == rfq_id, RFQInvitation.supplier_id == supplier_id
+            ),
+            bind_arguments={"primary": True},
+        ).first()
+        is not None
+    )
+    if invited:
+        invalidate_rfq(rfq_id)
+    return invited
+
+
+def invalidate_rfq(rfq_id: int) -> None:
+    _invited_suppliers.invalidate(rfq_id)
+
+
+def invalidate_rfq_on_commit(db: Session, rfq_id: int) -> None:
+    """Drop the cached invitation set for ``rfq_id`` once ``db`` commits.
+
+    Deferring to the commit keeps concurrent readers from re-caching the
+    pre-change set while the inviting transaction is still open.
+    """
+    db.info.setdefault("rfq_access_changed", set()).add(rfq_id)
+
+
+@event.listens_for(RFQInvitation, "after_delete")
+def _mark_invitation_deleted(mapper, connection, target: RFQInvitation) -> None:
+    session = Session.object_session(target)
+    if session is not None and target.rfq_id is not None:
+        invalidate_rfq_on_commit(session, target.rfq_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_rfqs(session: Session) -> None:
+    for rfq_id in session.info.pop("rfq_access_changed", ()):
+        invalidate_rfq(rfq_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_rfqs(session: Session) -> None:
+    session.info.pop("rfq_access_changed", None)
@@ -0,0 +1,224 @@
+"""Full-text search across RFQs, purchase requests, suppliers and messages.
+
+The indexes are maintained by the database (migration 0007): PostgreSQL
+matches against each table's weighted ``search_vector`` column through its
+GIN index and ranks with ``ts_rank_cd``; SQLite matches the table's FTS5
+shadow table and ranks with ``bm25``. Every term is prefix-matched so
+results update as the user types.
+
+Each source is filtered by what the caller's role may list elsewhere in
+the API, capped at the requested page before the sources are merged, and
+the merged hits are ordered by rank.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    column,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    table,
+    true,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import (
+    RFQ,
+    Department,
+    Message,
+    PurchaseRequest,
+    RFQInvitation,
+    SupplierProfile,
+    User,
+    UserRole,
+)
+from ..schemas.search import SearchHit, SearchResults
+
+
+SEARCH_DIALECTS = ("postgresql", "sqlite")
+SEARCH_KINDS = ("rfq", "request", "supplier", "message")
+MAX_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class _Source:
+    kind: str
+    model: Any
+    table: str
+    title: Any
+    subtitle: Any
+    # Per FTS5 column, in the order created by migration 0007 (A=10, B=4, C=1).
+    bm25_weights: tuple[float, ...]
+
+
+_SOURCES = (
+    _Source("rfq", RFQ, "rfqs", RFQ.title, RFQ.rfq_number, (10.0, 10.0, 4.0, 1.0)),
+    _Source(
+        "request",
+        PurchaseRequest,
+        "purchase_requests",
+        PurchaseRequest.title,
+        PurchaseRequest.category,
+        (10.0, 4.0, 1.0, 1.0),
+    ),
+    _Source(
+        "supplier",
+        SupplierProfile,
+        "supplier_profiles",
+        SupplierProfile.company_name,
+        SupplierProfile.supplier_number,
+        (10.0, 10.0, 4.0, 1.0),
+    ),
+    _Source("message", Message, "messages", Message.subject, null(), (10.0, 4.0)),
+)
+
+_RFQ_ROLES = {
+    UserRole.superadmin,
+    UserRole.procurement,
+    UserRole.procurement_officer,
+    UserRole.requester,
+    UserRole.finance,
+}
+_REQUEST_ROLES = {UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer, UserRole.finance}
+_SUPPLIER_ROLES = {UserRole.superadmin, UserRole.procurement, UserRole.procurement_officer}
+
+
+def query_terms(query: str) -> list[str]:
+    """Lower-cased word terms of ``query``; punctuation and operators are dropped."""
+    return [term.lower() for term in _TERM_RE.findall(query)][:MAX_TERMS]
+
+
+def _role(user: User) -> Optional[UserRole]:
+    try:
+        return UserRole(user.role)
+    except ValueError:
+        return None
+
+
+def _visibility(kind: str, user: User) -> Optional[ColumnElement[bool]]:
+    """Filter limiting ``kind`` to what ``user`` may see, or None when hidden."""
+    role = _role(user)
+    user_id = user.id
+    if kind == "rfq":
+        if role in _RFQ_ROLES:
+            return true()
+        if role == UserRole.supplier:
+            profile_id = select(SupplierProfile.id).where(SupplierProfile.user_id == user_id).scalar_subquery()
+            return RFQ.id.in_(select(RFQInvitation.rfq_id).where(RFQInvitation.supplier_id == profile_id))
+        return None
+    if kind == "request":
+        if role in _REQUEST_ROLES:
+            return true()
+        if role == UserRole.head_of_department:
+            return PurchaseRequest.department_id.in_(
+                select(Department.id).where(Department.head_of_department_id == user_id)
+            )
+        if role == UserRole.requester:
+            return PurchaseRequest.requester_id == user_id
+        return None
+    if kind == "supplier":
+        return true() if role in _SUPPLIER_ROLES else None
+    if kind == "message":
+        return or_(Message.sender_id == user_id, Message.recipient_id == user_id)
+    return None
+
+
+def _source_statement(
+    source: _Source, dialect: str, terms: Sequence[str], visible: ColumnElement[bool], cap: int
+) -> Select:
+    model = source.model
+    if dialect == "postgresql":
+        vector = literal_column(f"{source.table}.search_vector")
+        tsquery = func.to_tsquery(
+            literal_column("'english'::regconfig"), " & ".join(f"{term}:*" for term in terms)
+        )
+        matches = vector.op("@@")(tsquery)
+        rank = func.ts_rank_cd(vector, tsquery)
+        statement = select(model).where(matches)
+    else:
+        fts_name = f"{source.table}_fts"
+        fts = table(fts_name, column("rowid"))
+        fts_ref = literal_column(fts_name)
+        matches = fts_ref.op("MATCH")(" ".join(f'"{term}"*' for term in terms))
+        # bm25 is lower-is-better; negate it so both dialects rank descending.
+        rank = -func.bm25(fts_ref, *source.bm25_weights)
+        statement = select(model).join(fts, fts.c.rowid == model.id).where(matches)
+
+    statement = (
+        statement.with_only_columns(
+            literal(source.kind).label("kind"),
+            model.id.label("id"),
+            source.title.label("title"),
+            source.subtitle.label("subtitle"),
+            rank.label("rank"),
+            model.created_at.label("created_at"),
+        )
+        .where(visible)
+        .order_by(rank.desc())
+        .limit(cap)
+    )
+    return select(statement.subquery())
+
+
+def search_statement(
+    dialect: str, user: User, terms: Sequence[str], kinds: Iterable[str], limit: int, offset: int
+) -> Optional[Select]:
+    """Ranked page of hits (plus one row to detect a next page), or None if nothing is searchable."""
+    wanted = set(kinds)
+    cap = offset + limit + 1
+    parts = []
+    for source in _SOURCES:
+        if source.kind not in wanted:
+            continue
+        visible = _visibility(source.kind, user)
+        if visible is not None:
+            parts.append(_source_statement(source, dialect, terms, visible, cap))
+    if not terms or not parts:
+        return None
+
+    hits = union_all(*parts).subquery("hits")
+    return (
+        select(hits)
+        .order_by(hits.c.rank.desc(), hits.c.created_at.desc(), hits.c.kind, hits.c.id.desc())
+        .limit(limit + 1)
+        .offset(offset)
+    )
+
+
+async def search_async(
+    db: AsyncSession, user: User, query: str, kinds: Iterable[str], limit: int, offset: int
+) -> SearchResults:
+    statement = search_statement(
+        db.get_bind().dialect.name, user, query_terms(query), kinds, limit, offset
+    )
+    rows = (await db.execute(statement)).all() if statement is not None else []
+    return SearchResults(
+        query=query,
+        items=[
+            SearchHit(
+                kind=row.kind,
+                id=row.id,
+                title=row.title or "",
+                subtitle=row.subtitle,
+                rank=float(row.rank or 0),
+                created_at=row.created_at,
+            )
+            for row in rows[:limit]
+        ],
+        limit=limit,
+        offset=offset,
+        has_more=len(rows) > limit,
+    )
@@ -0,0 +1,179 @@
+"""Cached authorisation context for supplier-scoped requests.
+
+Supplier endpoints mostly need three facts about the caller: their
+supplier profile id, their categories and which RFQs they were invited to.
+:class:`SupplierContext` holds exactly that, memoised on the request and
+cached across requests per user for ``SUPPLIER_CONTEXT_CACHE_SECONDS``.
+Commits that touch a supplier's profile, categories or invitations evict
+that supplier's entry.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import RFQInvitation, SupplierCategory, SupplierProfile
+from ..utils.cache import TTLCache
+from . import rfq_access
+
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class SupplierContext:
+    user_id: int
+    profile_id: int
+    company_name: str
+    category_names: frozenset[str]
+    invited_rfq_ids: frozenset[int]
+
+    def is_invited(self, rfq_id: int) -> bool:
+        return rfq_id in self.invited_rfq_ids
+
+
+_contexts: TTLCache[SupplierContext] = TTLCache(settings.supplier_context_cache_seconds, maxsize=4096)
+# profile id -> user id, so invalidation by supplier finds the cache key.
+_profile_users: dict[int, int] = {}
+_profile_users_lock = threading.Lock()
+
+
+def _profile_statement(user_id: int):
+    return select(SupplierProfile.id, SupplierProfile.company_name).where(SupplierProfile.user_id == user_id)
+
+
+def _categories_statement(profile_id: int):
+    return select(SupplierCategory.name).where(SupplierCategory.supplier_id == profile_id)
+
+
+def _invitations_statement(profile_id: int):
+    return select(RFQInvitation.rfq_id).where(RFQInvitation.supplier_id == profile_id)
+
+
+def _remember(context: SupplierContext) -> SupplierContext:
+    with _profile_users_lock:
+        _profile_users[context.profile_id] = context.user_id
+    _contexts.set(context.user_id, context)
+    return context
+
+
+def load_supplier_context(db: Session, user_id: int) -> Optional[SupplierContext]:
+    """Supplier context for ``user_id`` from the cache or the database."""
+    context = _contexts.get(user_id)
+    if context is not None:
+        return context
+    profile = db.execute(_profile_statement(user_id)).first()
+    if profile is None:
+        return None
+    profile_id, company_name = profile
+    return _remember(
+        SupplierContext(
+            user_id=user_id,
+            profile_id=profile_id,
+            company_name=company_name or "",
+            category_names=frozenset(db.execute(_categories_statement(profile_id)).scalars()),
+            invited_rfq_ids=frozenset(db.execute(_invitations_statement(profile_id)).scalars()),
+        )
+    )
+
+
+async def load_supplier_context_async(db: AsyncSession, user_id: int) -> Optional[SupplierContext]:
+    """Async counterpart of :func:`load_supplier_context` sharing the same cache."""
+    context = _contexts.get(user_id)
+    if context is not None:
+        return context
+    profile = (await db.execute(_profile_statement(user_id))).first()
+    if profile is None:
+        return None
+    profile_id, company_name = profile
+    return _remember(
+        SupplierContext(
+            user_id=user_id,
+            profile_id=profile_id,
+            company_name=company_name or "",
+            category_names=frozenset((await db.execute(_categories_statement(profile_id))).scalars()),
+            invited_rfq_ids=frozenset((await db.execute(_invitations_statement(profile_id))).scalars()),
+        )
+    )
+
+
+def supplier_context_for(request: Request, db: Session, user_id: int) -> Optional[SupplierContext]:
+    """Per-request memo over :func:`load_supplier_context`."""
+    context = getattr(request.state, "supplier_context", None)
+    if context is None or context.user_id != user_id:
+        context = load_supplier_context(db, user_id)
+        request.state.supplier_context = context
+    return context
+
+
+async def supplier_context_for_async(
+    request: Request, db: AsyncSession, user_id: int
+) -> Optional[SupplierContext]:
+    context = getattr(request.state, "supplier_context", None)
+    if context is None or context.user_id != user_id:
+        context = await load_supplier_context_async(db, user_id)
+        request.state.supplier_context = context
+    return context
+
+
+def has_invitation(db: Session, context: SupplierContext, rfq_id: int) -> bool:
+    """Whether the supplier was invited to ``rfq_id``.
+
+    The cached context only answers "yes": it is per worker and may have
+    been loaded from the read replica. A miss is settled by
+    :func:`rfq_access.is_invited`, which checks the primary before refusing.
+    """
+    if context.is_invited(rfq_id):
+        return True
+    invited = rfq_access.is_invited(db, rfq_id, context.profile_id)
+    if invited:
+        invalidate_supplier(context.profile_id)
+    return invited
+
+
+def invalidate_supplier(profile_id: int) -> None:
+    with _profile_users_lock:
+        user_id = _profile_users.pop(profile_id, None)
+    if user_id is not None:
+        _contexts.invalidate(user_id)
+
+
+def _changed_profile_id(target) -> Optional[int]:
+    if isinstance(target, SupplierProfile):
+        return target.id
+    return getattr(target, "supplier_id", None)
+
+
+@event.listens_for(SupplierProfile, "after_insert")
+@event.listens_for(SupplierProfile, "after_update")
+@event.listens_for(SupplierProfile, "after_delete")
+@event.listens_for(SupplierCategory, "after_insert")
+@event.listens_for(SupplierCategory, "after_update")
+@event.listens_for(SupplierCategory, "after_delete")
+@event.listens_for(RFQInvitation, "after_insert")
+@event.listens_for(RFQInvitation, "after_update")
+@event.listens_for(RFQInvitation, "after_delete")
+def _mark_supplier_changed(mapper, connection, target) -> None:
+    profile_id = _changed_profile_id(target)
+    session = Session.object_session(target)
+    if profile_id is not None and session is not None:
+        session.info.setdefault("suppliers_changed", set()).add(profile_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_suppliers(session: Session) -> None:
+    for profile_id in session.info.pop("suppliers_changed", ()):
+        invalidate_supplier(profile_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_suppliers(session: Session) -> None:
+    session.info.pop("suppliers_changed", None)
@@ -0,0 +1,118 @@
+"""Report where a ProcuraHub worker spends its cold-start time.
+
+Run from the backend directory::
+
+    python -m app.startup_profile            # top 25 modules
+    python -m app.startup_profile --top 50
+
+The app is imported in a fresh interpreter with ``-X importtime`` so the
+numbers match a real worker boot. The report lists the slowest modules by
+self and cumulative import time, the total per top-level package, and the
+``create_app`` phase timings recorded in ``app.state.startup_phases``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+PHASES_MARKER = "STARTUP_PHASES="
+
+_PROBE = (
+    "import json, time\n"
+    "started = time.perf_counter()\n"
+    "import app.main\n"
+    "phases = dict(app.main.app.state.startup_phases)\n"
+    "phases['total'] = round((time.perf_counter() - started) * 1000, 2)\n"
+    f"print({PHASES_MARKER!r} + json.dumps(phases))\n"
+)
+
+
+@dataclass
+class ModuleTiming:
+    name: str
+    self_ms: float
+    cumulative_ms: float
+
+
+def _parse_importtime(stderr: str) -> list[ModuleTiming]:
+    timings: list[ModuleTiming] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header row
+        timings.append(
+            ModuleTiming(
+                name=parts[2].strip(),
+                self_ms=int(parts[0]) / 1000,
+                cumulative_ms=int(parts[1]) / 1000,
+            )
+        )
+    return timings
+
+
+def _run_probe() -> tuple[list[ModuleTiming], dict[str, float]]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_ROOT), env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    phases: dict[str, float] = {}
+    for line in completed.stdout.splitlines():
+        if line.startswith(PHASES_MARKER):
+            phases = json.loads(line[len(PHASES_MARKER):])
+    if completed.returncode != 0 or not phases:
+        sys.stderr.write(completed.stderr[-4000:])
+        raise SystemExit("Importing app.main failed; see the traceback above.")
+    return _parse_importtime(completed.stderr), phases
+
+
+def _print_table(title: str, rows: list[tuple[str, float]]) -> None:
+    print(f"\n{title}")
+    print("-" * len(title))
+    for name, value in rows:
+        print(f"{value:10.1f} ms  {name}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=25, help="number of modules to list")
+    args = parser.parse_args(argv)
+
+    timings, phases = _run_probe()
+
+    by_package: dict[str, float] = defaultdict(float)
+    for timing in timings:
+        by_package[timing.name.split(".")[0]] += timing.self_ms
+
+    _print_table(
+        "Slowest modules (self)",
+        [(t.name, t.self_ms) for t in sorted(timings, key=lambda t: t.self_ms, reverse=True)[: args.top]],
+    )
+    _print_table(
+        "Slowest modules (cumulative)",
+        [(t.name, t.cumulative_ms) for t in sorted(timings, key=lambda t: t.cumulative_ms, reverse=True)[: args.top]],
+    )
+    _print_table(
+        "Import time by top-level package",
+        sorted(by_package.items(), key=lambda item: item[1], reverse=True)[: args.top],
+    )
+    _print_table("create_app phases", list(phases.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Prometheus metrics, served at ``/metrics``.
+
+A single worker exposes its own registry. With several uvicorn or gunicorn
+workers, every scrape reaches a different process, so run them in
+prometheus_client's multiprocess mode:
+
+* point ``PROMETHEUS_MULTIPROC_DIR`` at an empty directory that all workers
+  share, and empty it before each start (the variable must be set before the
+  workers import the app);
+* each worker writes its samples to memory-mapped files there, and
+  ``/metrics`` merges the files of all workers, whichever one answers.
+
+Counters and histograms are summed across workers. Gauges are summed over
+the live workers (``livesum``), and a worker's files are marked dead when
+it shuts down.
+
+The connection pool gauges are read at scrape time, not per request. In
+multiprocess mode each worker's values are therefore as of the last scrape
+that worker answered.
+
+Two gauges track the work queued behind responses: emails waiting in a
+request's background tasks (per worker, summed), and digest events in
+``notification_events`` not yet sent, counted in the database at scrape
+time so every worker reports the same queue.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..database import async_engine, async_read_engine, engine, read_engine
+from ..models import NotificationEvent
+
+
+logger = logging.getLogger("procurahub.metrics")
+
+
+_DB_ENGINES = {
+    "primary": engine,
+    "replica": read_engine,
+    "async_primary": async_engine.sync_engine,
+    "async_replica": async_read_engine.sync_engine if async_read_engine else None,
+}
+
+HTTP_REQUESTS = Counter(
+    "procurahub_http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "procurahub_http_request_duration_seconds",
+    "Time until the response was fully sent, by route template.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_FINISHING = Gauge(
+    "procurahub_http_requests_finishing",
+    "Requests whose response is sent but whose handler is still running "
+    "(background tasks and dependency teardown).",
+    multiprocess_mode="livesum",
+)
+EMAIL_QUEUED = Gauge(
+    "procurahub_email_queued",
+    "Emails queued as background tasks and not yet handed to the transport.",
+    multiprocess_mode="livesum",
+)
+NOTIFICATION_EVENTS_PENDING = Gauge(
+    "procurahub_notification_events_pending",
+    "Digest events waiting to be sent, leased or not.",
+    multiprocess_mode="mostrecent",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "procurahub_db_pool_checked_out",
+    "Database connections currently in use.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_IDLE = Gauge(
+    "procurahub_db_pool_idle",
+    "Open database connections waiting in the pool.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "procurahub_db_pool_overflow",
+    "Connections open beyond the pool size (negative while the pool is not yet full).",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+EMAIL_SEND_SECONDS = Histogram(
+    "procurahub_email_send_seconds",
+    "Time to hand an email to the transport.",
+    ["transport"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+EMAIL_FAILURES = Counter(
+    "procurahub_email_failures_total",
+    "Emails the transport failed to accept.",
+    ["transport"],
+)
+PDF_RENDER_SECONDS = Histogram(
+    "procurahub_pdf_render_seconds",
+    "Time to render a PDF document.",
+    ["document"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+UPLOAD_BYTES = Counter(
+    "procurahub_upload_bytes_total",
+    "Bytes of uploaded files written to storage.",
+    ["kind"],
+)
+UPLOAD_SECONDS = Histogram(
+    "procurahub_upload_duration_seconds",
+    "Time to write an uploaded file to storage.",
+    ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+def multiprocess_dir() -> Optional[str]:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+
+def update_pool_stats() -> None:
+    """Copy this worker's connection pool counters into the pool gauges (at scrape time)."""
+    for name, db_engine in _DB_ENGINES.items():
+        pool = getattr(db_engine, "pool", None)
+        # NullPool/StaticPool (e.g. in-memory SQLite) keep no counters.
+        if pool is None or not hasattr(pool, "checkedout"):
+            continue
+        DB_POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+        DB_POOL_IDLE.labels(name).set(pool.checkedin())
+        DB_POOL_OVERFLOW.labels(name).set(pool.overflow())
+
+
+def update_notification_backlog() -> None:
+    """Count unsent digest events into their gauge (at scrape time)."""
+    try:
+        with engine.connect() as connection:
+            pending = connection.execute(
+                select(func.count()).select_from(NotificationEvent).where(NotificationEvent.sent_at.is_(None))
+            ).scalar_one()
+    except SQLAlchemyError:
+        logger.warning("Could not count pending notification events", exc_info=True)
+        return
+    NOTIFICATION_EVENTS_PENDING.set(pending)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """The exposition body and content type for a scrape."""
+    update_pool_stats()
+    update_notification_backlog()
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess totals (on shutdown)."""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
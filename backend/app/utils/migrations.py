@@ -1,23 +1,49 @@
-"""Lightweight schema alignment helpers for demo deployments.
-
-These helpers keep the SQLite / PostgreSQL demo database in sync with the
-latest SQLAlchemy models without requiring a full migration framework.
-They are intentionally conservative and only add columns that were
-introduced after the initial release.
+"""Schema migration entry points and legacy alignment helpers.
+
+Schema changes are versioned with Alembic (``backend/migrations``) and are
+applied once per deploy with ``alembic upgrade head``. Application workers
+only compare the database revision with the code's head revision at
+startup, which is a single query. When ``AUTO_MIGRATE`` is on every worker
+calls :func:`upgrade_database` instead; :func:`acquire_migration_lock`
+makes them take turns, so one applies the revisions and the rest find the
+database already at head.
+
+The ``_ensure_*`` helpers below predate Alembic. They keep older SQLite /
+PostgreSQL demo databases in sync with the models and are now only invoked
+from the baseline revision, so existing deployments can be stamped onto the
+versioned history without losing data.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Dict
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
 
 from sqlalchemy import inspect, text, or_
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import sessionmaker
 
 
 logger = logging.getLogger("procurahub.migrations")
 
+Bind = Union[Engine, Connection]
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+ALEMBIC_INI = BACKEND_ROOT / "alembic.ini"
+
+
+@contextmanager
+def _begin(bind: Bind) -> Iterator[Connection]:
+    """Yield a connection in a transaction, reusing ``bind`` if it already is one."""
+    if isinstance(bind, Connection):
+        yield bind
+        return
+    with bind.begin() as connection:
+        yield connection
+
 
 def _supplier_profile_column_definitions(dialect_name: str) -> Dict[str, str]:
     """Return the SQL column definitions per dialect for SupplierProfile."""
@@ -40,10 +66,9 @@ def _supplier_profile_column_definitions(dialect_name: str) -> Dict[str, str]:
     }
 
 
-def _ensure_supplier_profile_columns(engine: Engine) -> None:
+def _ensure_supplier_profile_columns(engine: Bind) -> None:
     inspector = inspect(engine)
     if "supplier_profiles" not in inspector.get_table_names():
-        # Table will be created via Base.metadata.create_all later.
         return
 
     existing_columns = {
@@ -77,7 +102,7 @@ def _ensure_supplier_profile_columns(engine: Engine) -> None:
                 )
             )
 
-    with engine.begin() as connection:
+    with _begin(engine) as connection:
         for statement in statements:
             connection.execute(statement)
 
@@ -88,7 +113,7 @@ def _supplier_category_column_definitions(dialect_name: str) -> Dict[str, str]:
     return {"category_type": column_type}
 
 
-def _ensure_supplier_category_columns(engine: Engine) -> None:
+def _ensure_supplier_category_columns(engine: Bind) -> None:
     """Ensure supplier categories have typed primary/secondary designation."""
     inspector = inspect(engine)
     if "supplier_categories" not in inspector.get_table_names():
@@ -109,7 +134,7 @@ def _ensure_supplier_category_columns(engine: Engine) -> None:
             ", ".join(missing_columns),
         )
 
-    with engine.begin() as connection:
+    with _begin(engine) as connection:
         for statement in statements:
             connection.execute(statement)
 
@@ -146,7 +171,7 @@ def _ensure_supplier_category_columns(engine: Engine) -> None:
 
 
 
-def _ensure_rfq_number_column(engine: Engine) -> None:
+def _ensure_rfq_number_column(engine: Bind) -> None:
     """Ensure RFQs have a human-readable rfq_number."""
     inspector = inspect(engine)
     if "rfqs" not in inspector.get_table_names():
@@ -155,7 +180,7 @@ def _ensure_rfq_number_column(engine: Engine) -> None:
     existing_columns = {column["name"] for column in inspector.get_columns("rfqs")}
     if "rfq_number" not in existing_columns:
         logger.info("Adding rfq_number column to rfqs table")
-        with engine.begin() as connection:
+        with _begin(engine) as connection:
             connection.execute(text("ALTER TABLE rfqs ADD COLUMN rfq_number VARCHAR(30)"))
 
     Session = sessionmaker(bind=engine)
@@ -179,7 +204,7 @@ def _ensure_rfq_number_column(engine: Engine) -> None:
         session.close()
 
 
-def _ensure_messages_table(engine: Engine) -> None:
+def _ensure_messages_table(engine: Bind) -> None:
     """Ensure the messages table exists with correct schema."""
     inspector = inspect(engine)
     tables = inspector.get_table_names()
@@ -219,7 +244,7 @@ def _ensure_messages_table(engine: Engine) -> None:
         )
         """
 
-    with engine.begin() as connection:
+    with _begin(engine) as connection:
         connection.execute(text(create_sql))
 
 
@@ -248,12 +273,12 @@ def _department_table_sql(dialect_name: str) -> str:
     """
 
 
-def _ensure_departments_table(engine: Engine) -> None:
+def _ensure_departments_table(engine: Bind) -> None:
     inspector = inspect(engine)
     if "departments" not in inspector.get_table_names():
         logger.info("Creating departments table")
         create_sql = _department_table_sql(engine.dialect.name)
-        with engine.begin() as connection:
+        with _begin(engine) as connection:
             connection.execute(text(create_sql))
         return
     
@@ -267,7 +292,7 @@ def _ensure_departments_table(engine: Engine) -> None:
         else:
             add_column_sql = "ALTER TABLE departments ADD COLUMN head_of_department_id INTEGER NULL REFERENCES users(id) ON DELETE SET NULL"
         
-        with engine.begin() as connection:
+        with _begin(engine) as connection:
             connection.execute(text(add_column_sql))
 
 
@@ -289,7 +314,7 @@ def _quotation_tax_column_definitions(dialect_name: str) -> Dict[str, str]:
     }
 
 
-def _ensure_quotation_tax_columns(engine: Engine) -> None:
+def _ensure_quotation_tax_columns(engine: Bind) -> None:
     """Ensure recently added tax columns exist on rfq_quotations."""
     inspector = inspect(engine)
     if "rfq_quotations" not in inspector.get_table_names():
@@ -318,7 +343,7 @@ def _ensure_quotation_tax_columns(engine: Engine) -> None:
         for column in missing_columns
     ]
 
-    with engine.begin() as connection:
+    with _begin(engine) as connection:
         for statement in statements:
             connection.execute(statement)
 
@@ -373,25 +398,25 @@ def _rfq_document_table_sql(dialect_name: str) -> str:
     """
 
 
-def _ensure_request_documents_table(engine: Engine) -> None:
+def _ensure_request_documents_table(engine: Bind) -> None:
     inspector = inspect(engine)
     if "request_documents" in inspector.get_table_names():
         return
 
     logger.info("Creating request_documents table")
     create_sql = _request_document_table_sql(engine.dialect.name)
-    with engine.begin() as connection:
+    with _begin(engine) as connection:
         connection.execute(text(create_sql))
 
 
-def _ensure_rfq_documents_table(engine: Engine) -> None:
+def _ensure_rfq_documents_table(engine: Bind) -> None:
     inspector = inspect(engine)
     if "rfq_documents" in inspector.get_table_names():
         return
 
     logger.info("Creating rfq_documents table")
     create_sql = _rfq_document_table_sql(engine.dialect.name)
-    with engine.begin() as connection:
+    with _begin(engine) as connection:
         connection.execute(text(create_sql))
 
 
@@ -421,7 +446,7 @@ def _purchase_request_column_definitions(dialect_name: str) -> Dict[str, str]:
     }
 
 
-def _create_purchase_requests_table(engine: Engine) -> None:
+def _create_purchase_requests_table(engine: Bind) -> None:
     logger.info("Creating purchase_requests table")
     dialect_name = engine.dialect.name
     if dialect_name == "postgresql":
@@ -485,11 +510,11 @@ def _create_purchase_requests_table(engine: Engine) -> None:
         )
         """
 
-    with engine.begin() as connection:
+    with _begin(engine) as connection:
         connection.execute(text(create_sql))
 
 
-def _ensure_purchase_requests_table(engine: Engine) -> None:
+def _ensure_purchase_requests_table(engine: Bind) -> None:
     """Ensure the purchase_requests table exists for requester workflow."""
     inspector = inspect(engine)
     tables = inspector.get_table_names()
@@ -509,7 +534,7 @@ def _ensure_purchase_requests_table(engine: Engine) -> None:
     if statements:
         logger.info("Aligning purchase_requests table by adding columns: %s", ", ".join(missing_columns))
 
-    with engine.begin() as connection:
+    with _begin(engine) as connection:
         for statement in statements:
             connection.execute(statement)
         # Populate justification for legacy rows
@@ -544,7 +569,7 @@ def _ensure_purchase_requests_table(engine: Engine) -> None:
         )
 
 
-def _seed_reference_data(engine: Engine) -> None:
+def _seed_reference_data(engine: Bind) -> None:
     """Ensure default departments and categories exist."""
     Session = sessionmaker(bind=engine)
     session = Session()
@@ -561,8 +586,8 @@ def _seed_reference_data(engine: Engine) -> None:
                 added_departments,
                 added_categories,
             )
-        else:
-            session.rollback()
+        # Nothing to seed: just close the session. Rolling back here would also
+        # roll back the enclosing migration transaction when bound to one.
     except Exception:
         session.rollback()
         logger.exception("Failed seeding reference data")
@@ -570,18 +595,119 @@ def _seed_reference_data(engine: Engine) -> None:
         session.close()
 
 
-def run_startup_migrations(engine: Engine) -> None:
-    """Apply minimal schema adjustments required by the latest code."""
+def align_legacy_schema(engine: Bind) -> None:
+    """Bring a pre-Alembic database up to the baseline schema."""
+    _ensure_supplier_profile_columns(engine)
+    _ensure_supplier_category_columns(engine)
+    _ensure_rfq_number_column(engine)
+    _ensure_messages_table(engine)
+    _ensure_departments_table(engine)
+    _ensure_purchase_requests_table(engine)
+    _ensure_rfq_documents_table(engine)
+    _ensure_request_documents_table(engine)
+    _ensure_quotation_tax_columns(engine)
+    _seed_reference_data(engine)
+
+
+def run_startup_migrations(engine: Bind) -> None:
+    """Apply minimal schema adjustments required by the latest code.
+
+    Kept for maintenance scripts; the application itself relies on Alembic.
+    """
     try:
-        _ensure_supplier_profile_columns(engine)
-        _ensure_supplier_category_columns(engine)
-        _ensure_rfq_number_column(engine)
-        _ensure_messages_table(engine)
-        _ensure_departments_table(engine)
-        _ensure_purchase_requests_table(engine)
-        _ensure_rfq_documents_table(engine)
-        _ensure_request_documents_table(engine)
-        _ensure_quotation_tax_columns(engine)
-        _seed_reference_data(engine)
+        align_legacy_schema(engine)
     except Exception:  # pragma: no cover - startup safety
         logger.exception("Failed to apply startup schema checks")
+
+
+# ==================== Alembic integration ====================
+
+
+def alembic_config(connection: Optional[Connection] = None):
+    """Return the Alembic config, optionally bound to an open connection."""
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(BACKEND_ROOT / "migrations"))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+# Arbitrary application-wide key for pg_advisory_xact_lock.
+MIGRATION_LOCK_KEY = 7_202_604
+
+
+def acquire_migration_lock(connection: Connection) -> None:
+    """Hold the database's migration lock until the current transaction ends.
+
+    PostgreSQL takes a transaction-scoped advisory lock. SQLite opens the
+    transaction with ``BEGIN IMMEDIATE``, which waits (up to the driver's
+    busy timeout) while another connection holds the write lock.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    elif dialect == "sqlite" and not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def upgrade_database(engine: Engine, revision: str = "head") -> None:
+    """Apply pending Alembic revisions (equivalent to ``alembic upgrade head``)."""
+    from alembic import command
+
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), revision)
+
+
+_REVISION_RE = re.compile(r"^revision\s*=\s*[\"']([^\"']+)[\"']", re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r"^down_revision\s*=\s*(.+)$", re.MULTILINE)
+
+
+def _script_head() -> Optional[str]:
+    """Return the head revision by reading the version files directly.
+
+    Importing Alembic costs ~150 ms, which every worker would pay just to
+    learn the head id; fall back to it only for histories with several heads.
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in (BACKEND_ROOT / "migrations" / "versions").glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION_RE.search(source)
+        if not revision:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION_RE.search(source)
+        if down_revision:
+            parents.update(re.findall(r"[\"']([^\"']+)[\"']", down_revision.group(1)))
+
+    heads = revisions - parents
+    if len(heads) == 1:
+        return heads.pop()
+
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def schema_revisions(engine: Engine) -> tuple[Optional[str], Optional[str]]:
+    """Return ``(database revision, code head revision)``."""
+    with engine.connect() as connection:
+        current = None
+        if inspect(connection).has_table("alembic_version"):
+            current = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    return current, _script_head()
+
+
+def check_schema_revision(engine: Engine) -> bool:
+    """Log a warning when the database is not at the code's head revision."""
+    current, head = schema_revisions(engine)
+    if current == head:
+        return True
+    logger.warning(
+        "Database schema is at revision %s but the code expects %s; run `alembic upgrade head`",
+        current or "<none>",
+        head,
+    )
+    return False
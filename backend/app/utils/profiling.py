@@ -0,0 +1,227 @@
+"""On-demand request profiling.
+
+:class:`StackSampler` is a small sampling profiler. A daemon thread reads the
+stack of every other thread at a fixed interval, and keeps:
+
+* samples from the event loop thread while the profiled request's own
+  coroutine is running (its frame is on the stack), trimmed to start there;
+* samples from any other thread whose stack runs application code. These are
+  the threadpool workers running sync routes and dependencies. A worker
+  busy with a *different* request at the same moment is included too, so
+  profile on a quiet worker when the numbers matter.
+
+The sampler needs the GIL, so in practice it samples about every few
+milliseconds (``sys.getswitchinterval()``) whatever the interval; each
+sample is weighted by the real time since the previous one.
+
+The result is exported as a speedscope document (https://www.speedscope.app),
+with one sampled profile per thread. Reports are files in
+``PROFILING_DIR``, shared by every worker, capped at the newest
+``PROFILING_BUFFER_SIZE``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from typing import Any, Optional
+
+from ..config import get_settings
+
+
+settings = get_settings()
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+_FrameKey = tuple[str, str, int]
+
+
+def _frame_key(frame: FrameType) -> _FrameKey:
+    code = frame.f_code
+    return (code.co_name, code.co_filename, code.co_firstlineno)
+
+
+class StackSampler:
+    """Sample the stacks serving one request until :meth:`stop` is called."""
+
+    def __init__(self, root: FrameType, interval: float = 0.001) -> None:
+        self.root = root
+        self.loop_thread = threading.get_ident()
+        self.interval = interval
+        # thread id -> list of (stack, weight in seconds), outermost frame first
+        self.samples: dict[int, list[tuple[tuple[_FrameKey, ...], float]]] = {}
+        self.started = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="procurahub-profiler", daemon=True)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    @property
+    def sample_count(self) -> int:
+        return sum(len(samples) for samples in self.samples.values())
+
+    def _stack(self, thread_id: int, frame: FrameType) -> Optional[tuple[_FrameKey, ...]]:
+        stack: list[_FrameKey] = []
+        in_app = False
+        current: Optional[FrameType] = frame
+        while current is not None:
+            if thread_id == self.loop_thread and current is self.root:
+                stack.append(_frame_key(current))
+                return tuple(reversed(stack))
+            in_app = in_app or current.f_code.co_filename.startswith(APP_DIR)
+            stack.append(_frame_key(current))
+            current = current.f_back
+        if thread_id == self.loop_thread or not in_app:
+            return None
+        return tuple(reversed(stack))
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = now - last, now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(thread_id, frame)
+                if stack:
+                    self.samples.setdefault(thread_id, []).append((stack, weight))
+
+    def to_speedscope(self, name: str) -> dict[str, Any]:
+        frames: list[dict[str, Any]] = []
+        index: dict[_FrameKey, int] = {}
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        profiles = []
+        for thread_id, samples in self.samples.items():
+            stacks, weights = [], []
+            for stack, weight in samples:
+                for key in stack:
+                    if key not in index:
+                        index[key] = len(frames)
+                        frames.append({"name": key[0], "file": key[1], "line": key[2]})
+                stacks.append([index[key] for key in stack])
+                weights.append(round(weight * 1000, 3))
+            profiles.append({
+                "type": "sampled",
+                "name": thread_names.get(thread_id, f"thread {thread_id}"),
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": stacks,
+                "weights": weights,
+            })
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "procurahub",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+@dataclass
+class ProfileReport:
+    id: str
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    sample_count: int
+    user_id: int
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# ==================== Report storage ====================
+# Each report is two files in PROFILING_DIR: ``<id>.json`` with the summary
+# and ``<id>.speedscope.json`` with the profile. The summary is written last,
+# so a listed report is always complete. Saving prunes all but the newest
+# ``profiling_buffer_size`` reports, whichever worker wrote them.
+
+_REPORT_ID = re.compile(r"^[0-9a-f]{32}$")
+_PROFILE_SUFFIX = ".speedscope.json"
+
+
+def new_report_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _write_json(path: Path, data: Any) -> None:
+    partial = path.with_name(f".{path.name}.{os.getpid()}")
+    partial.write_text(json.dumps(data))
+    os.replace(partial, path)
+
+
+def _summary_paths(directory: Path) -> list[Path]:
+    return [path for path in directory.glob("*.json") if not path.name.endswith(_PROFILE_SUFFIX)]
+
+
+def _prune(directory: Path) -> None:
+    def modified(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    summaries = sorted(_summary_paths(directory), key=modified, reverse=True)
+    for summary in summaries[settings.profiling_buffer_size:]:
+        summary.unlink(missing_ok=True)
+        summary.with_name(summary.stem + _PROFILE_SUFFIX).unlink(missing_ok=True)
+
+
+def save_report(report: ProfileReport, speedscope: dict[str, Any]) -> None:
+    """Write a report where every worker can list and serve it."""
+    directory = settings.resolved_profiling_dir
+    directory.mkdir(parents=True, exist_ok=True)
+    _write_json(directory / f"{report.id}{_PROFILE_SUFFIX}", speedscope)
+    summary = asdict(report)
+    summary["created_at"] = report.created_at.isoformat()
+    _write_json(directory / f"{report.id}.json", summary)
+    _prune(directory)
+
+
+def list_reports() -> list[ProfileReport]:
+    """Stored reports, newest first."""
+    directory = settings.resolved_profiling_dir
+    if not directory.is_dir():
+        return []
+    reports = []
+    for path in _summary_paths(directory):
+        try:
+            summary = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            # Pruned by another worker since the directory was listed
+            continue
+        summary["created_at"] = datetime.fromisoformat(summary["created_at"])
+        reports.append(ProfileReport(**summary))
+    return sorted(reports, key=lambda report: report.created_at, reverse=True)
+
+
+def load_speedscope(report_id: str) -> Optional[dict[str, Any]]:
+    if not _REPORT_ID.match(report_id):
+        return None
+    try:
+        return json.loads((settings.resolved_profiling_dir / f"{report_id}{_PROFILE_SUFFIX}").read_text())
+    except (FileNotFoundError, ValueError):
+        return None
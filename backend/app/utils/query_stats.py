@@ -0,0 +1,133 @@
+"""Per-request database statement counts, time and fingerprints.
+
+Cursor events on every :class:`~sqlalchemy.engine.Engine` (the sync
+engines and the ones behind the async engines alike) add to the
+:class:`QueryStats` of the current context. Middleware opens a context
+per request with :func:`track`. Sync endpoints and dependencies run in
+copies of the request's context, so they add to the same object.
+Statements outside a tracked context cost one ``ContextVar`` lookup.
+
+With fingerprints on, each statement is also counted under its
+:func:`fingerprint`: literals and bind parameters become ``?`` and ``IN``
+lists collapse. The same fingerprint issued many times in one request is
+the signature of an N+1 pattern: a query per row instead of one per
+relationship.
+
+Routes can declare how many statements they should need::
+
+    @router.get("/received", response_model=MessageListResponse)
+    @query_budget(6)
+    async def get_received_messages(...):
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_Endpoint = TypeVar("_Endpoint", bound=Callable[..., Any])
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*(?:\?\s*,\s*)*\?\s*\)", re.IGNORECASE)
+_POSTCOMPILE_RE = re.compile(r"\(?__\[POSTCOMPILE_\w+\]\)?")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    # Statements per fingerprint; None when fingerprints are off.
+    statements: Optional[Counter] = None
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Fingerprints issued at least ``threshold`` times, most frequent first."""
+        if not self.statements or threshold <= 0:
+            return []
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    @property
+    def max_repeats(self) -> int:
+        if not self.statements:
+            return 0
+        return self.statements.most_common(1)[0][1]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("procurahub_query_stats", default=None)
+
+
+def track(fingerprints: bool = False) -> tuple[QueryStats, Token]:
+    """Start collecting into a fresh :class:`QueryStats`; pass the token to :func:`untrack`."""
+    stats = QueryStats(statements=Counter() if fingerprints else None)
+    return stats, _current.set(stats)
+
+
+def untrack(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def untracked() -> Iterator[None]:
+    """Leave the statements issued inside out of the current request's stats."""
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """``statement`` with literals and parameters replaced by ``?``, whitespace collapsed."""
+    normalized = _STRING_RE.sub("?", statement)
+    normalized = _POSTCOMPILE_RE.sub("(?)", normalized)
+    normalized = _PLACEHOLDER_RE.sub("?", normalized)
+    normalized = _IN_LIST_RE.sub("IN (...)", normalized)
+    return _SPACE_RE.sub(" ", normalized).strip()
+
+
+def query_budget(statements: int) -> Callable[[_Endpoint], _Endpoint]:
+    """Declare the most SQL statements the decorated endpoint should issue."""
+
+    def decorate(endpoint: _Endpoint) -> _Endpoint:
+        endpoint.__query_budget__ = statements  # type: ignore[attr-defined]
+        return endpoint
+
+    return decorate
+
+
+def budget_for(endpoint: Any) -> Optional[int]:
+    return getattr(endpoint, "__query_budget__", None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _current.get() is not None:
+        context._procurahub_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = getattr(context, "_procurahub_started", None)
+    if stats is None or started is None:
+        return
+    stats.count += 1
+    stats.seconds += time.perf_counter() - started
+    if stats.statements is not None:
+        stats.statements[fingerprint(statement)] += 1
@@ -0,0 +1,272 @@
+"""Token-bucket rate limiting with pluggable shared storage.
+
+One :data:`limiter` serves the whole application. Routes opt in with a
+dependency::
+
+    @router.post("/token", dependencies=[Depends(limiter.limit("5/minute"))])
+
+``"5/minute"`` is a bucket of 5 tokens refilled at 5 per minute, so a
+client may burst up to the limit and then proceeds at the sustained rate.
+A route may spend more than one token per call (``cost``) and routes may
+share a bucket (``scope``), e.g. expensive exports drawing from the same
+allowance as cheap reads.
+
+Buckets live in the storage named by ``RATE_LIMIT_STORAGE``:
+
+* ``memory://`` - per process; each worker enforces its own limits.
+* ``sqlite:///path/to/ratelimit.db`` - a file shared by all workers on
+  one host, updated in ``BEGIN IMMEDIATE`` transactions.
+* ``redis://host:6379/0`` - shared by every instance; one atomic Lua
+  script per check (needs the optional ``redis`` package). Anything that
+  speaks the Redis protocol and supports EVAL works as a local stand-in.
+
+If the storage is unreachable, requests are allowed and a warning is
+logged; rate limiting must not take the API down with it.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Protocol
+
+from fastapi import HTTPException, Request, status
+
+from ..config import get_settings
+
+
+logger = logging.getLogger("procurahub.rate_limit")
+settings = get_settings()
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d+)?\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True)
+class Rate:
+    amount: int
+    period_seconds: int
+    text: str
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.amount / self.period_seconds
+
+    @classmethod
+    def parse(cls, text: str) -> "Rate":
+        """Parse ``"5/minute"`` or ``"100/15 minutes"`` style limits."""
+        match = _RATE_RE.match(text)
+        if not match:
+            raise ValueError(f"Invalid rate limit {text!r}")
+        amount, multiplier, unit = match.groups()
+        return cls(int(amount), int(multiplier or 1) * _PERIODS[unit], text.strip())
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    remaining: float
+    retry_after: float
+
+
+def _refill(tokens: float, updated: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+def _decide(tokens: float, capacity: float, rate: float, cost: float) -> tuple[float, Decision]:
+    if tokens >= cost:
+        tokens -= cost
+        return tokens, Decision(True, tokens, 0.0)
+    return tokens, Decision(False, tokens, (cost - tokens) / rate)
+
+
+class RateLimitStorage(Protocol):
+    def consume(self, key: str, capacity: float, rate: float, cost: float) -> Decision:
+        ...
+
+
+class MemoryStorage:
+    """Per-process buckets."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: float, rate: float, cost: float) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, decision = _decide(_refill(tokens, updated, now, capacity, rate), capacity, rate, cost)
+            if len(self._buckets) >= self.max_keys and key not in self._buckets:
+                self._prune(now, capacity / rate)
+            self._buckets[key] = (tokens, now)
+        return decision
+
+    def _prune(self, now: float, idle_seconds: float) -> None:
+        # A bucket idle for a full refill period is indistinguishable from a new one.
+        stale = [key for key, (_, updated) in self._buckets.items() if now - updated >= idle_seconds]
+        for key in stale or list(self._buckets)[: len(self._buckets) // 10 or 1]:
+            del self._buckets[key]
+
+
+class SQLiteStorage:
+    """Buckets in a SQLite file shared by the workers of one host."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        Path(path).resolve().parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def consume(self, key: str, capacity: float, rate: float, cost: float) -> Decision:
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = _refill(row[0], row[1], now, capacity, rate) if row else capacity
+            tokens, decision = _decide(tokens, capacity, rate, cost)
+            connection.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return decision
+
+
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisStorage:
+    """Buckets in Redis, updated atomically by a Lua script using the server clock."""
+
+    def __init__(self, client, prefix: str = "procurahub:ratelimit:") -> None:
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_REDIS_TOKEN_BUCKET)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisStorage":
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("RATE_LIMIT_STORAGE=redis:// requires the 'redis' package") from exc
+        return cls(redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5))
+
+    def consume(self, key: str, capacity: float, rate: float, cost: float) -> Decision:
+        allowed, tokens = self._script(keys=[self.prefix + key], args=[capacity, rate, cost])
+        tokens = float(tokens)
+        if int(allowed):
+            return Decision(True, tokens, 0.0)
+        return Decision(False, tokens, (cost - tokens) / rate)
+
+
+def storage_from_url(url: str) -> RateLimitStorage:
+    if url.startswith("memory://"):
+        return MemoryStorage()
+    if url.startswith("sqlite:///"):
+        return SQLiteStorage(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStorage.from_url(url)
+    raise ValueError(f"Unsupported RATE_LIMIT_STORAGE {url!r}")
+
+
+def client_address(request: Request) -> str:
+    return request.client.host if request.client else "anonymous"
+
+
+class Limiter:
+    def __init__(
+        self,
+        storage_url: str,
+        enabled: bool = True,
+        key_func: Callable[[Request], str] = client_address,
+    ) -> None:
+        self.storage_url = storage_url
+        self.enabled = enabled
+        self.key_func = key_func
+        self._storage: Optional[RateLimitStorage] = None
+        self._storage_lock = threading.Lock()
+
+    @property
+    def storage(self) -> RateLimitStorage:
+        # Created on first use so importing the app never opens a connection.
+        if self._storage is None:
+            with self._storage_lock:
+                if self._storage is None:
+                    self._storage = storage_from_url(self.storage_url)
+        return self._storage
+
+    def hit(self, key: str, rate: Rate, cost: float = 1) -> Decision:
+        try:
+            return self.storage.consume(key, float(rate.amount), rate.refill_per_second, float(cost))
+        except Exception:
+            logger.warning("Rate limit storage %s unavailable; allowing request", self.storage_url, exc_info=True)
+            return Decision(True, float(rate.amount), 0.0)
+
+    def limit(self, rate: str, cost: float = 1, scope: Optional[str] = None):
+        """Dependency enforcing ``rate`` per client for the route (or shared ``scope``)."""
+        parsed = Rate.parse(rate)
+        if cost > parsed.amount:
+            raise ValueError(f"Cost {cost} can never be paid from a bucket of {parsed.amount}")
+
+        def dependency(request: Request) -> None:
+            if not self.enabled:
+                return
+            route = request.scope.get("route")
+            bucket = scope or f"{request.method}:{getattr(route, 'path', request.url.path)}"
+            decision = self.hit(f"{bucket}:{self.key_func(request)}", parsed, cost)
+            if not decision.allowed:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"Rate limit exceeded: {parsed.text}",
+                    headers={"Retry-After": str(max(1, math.ceil(decision.retry_after)))},
+                )
+
+        return dependency
+
+
+limiter = Limiter(settings.rate_limit_storage, enabled=settings.rate_limit_enabled)
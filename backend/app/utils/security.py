@@ -1,37 +1,59 @@
 """Security helpers for hashing passwords and issuing tokens."""
 
+import hashlib
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from ..config import get_settings
+from .cache import LRUCache
 
 
-# Configure password context with bcrypt compatibility settings
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__default_rounds=12,
-    bcrypt__min_rounds=10,
-    bcrypt__max_rounds=14,
-)
 settings = get_settings()
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Validate a plaintext password against a stored hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """Build the bcrypt password context on first use.
 
+    passlib and its bcrypt backend are only needed by login and user
+    management, so they are kept off the import path of every worker.
+    """
+    from passlib.context import CryptContext
 
-def get_password_hash(password: str) -> str:
-    """Hash a password for storage."""
+    # min == max == default, so any hash at another cost reports needs_update
+    # and verify_and_update rehashes it at the configured cost.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.bcrypt_rounds,
+        bcrypt__min_rounds=settings.bcrypt_rounds,
+        bcrypt__max_rounds=settings.bcrypt_rounds,
+    )
+
+
+def _truncate(password: str) -> str:
     # Bcrypt has a 72-byte limit, truncate if needed
     password_bytes = password.encode('utf-8')
     if len(password_bytes) > 72:
         password = password_bytes[:72].decode('utf-8', errors='ignore')
-    return pwd_context.hash(password)
+    return password
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Validate a password and return a replacement hash when the stored one is outdated.
+
+    The second item is None unless the password matched and the stored hash
+    uses another scheme or cost factor than the current configuration.
+    """
+    return get_pwd_context().verify_and_update(_truncate(plain_password), hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password for storage."""
+    return get_pwd_context().hash(_truncate(password))
 
 
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -43,10 +65,65 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
+# ==================== Verified token cache ====================
+# The frontend presents the same token on every call, so the verified claims
+# are kept (keyed by a digest, never the token itself) until the token
+# expires. Revocation checks still run on every call, cached or not.
+
+_token_cache: LRUCache[dict[str, Any]] = LRUCache(settings.token_cache_size)
+_revocation_checks: list[Callable[[dict[str, Any]], bool]] = []
+
+
+def register_revocation_check(check: Callable[[dict[str, Any]], bool]) -> None:
+    """Reject tokens for which ``check(claims)`` returns True.
+
+    Checks run on every :func:`decode_token` call, including cache hits,
+    so they must be cheap (e.g. an in-memory deny list).
+    """
+    _revocation_checks.append(check)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def forget_token(token: str) -> None:
+    """Drop one token's cached claims (e.g. on logout)."""
+    _token_cache.invalidate(_token_key(token))
+
+
+def clear_token_cache() -> None:
+    _token_cache.clear()
+
+
+def token_cache_stats() -> dict[str, Any]:
+    return {
+        "enabled": settings.token_cache_enabled,
+        "size": len(_token_cache),
+        "maxsize": _token_cache.maxsize,
+        "hits": _token_cache.hits,
+        "misses": _token_cache.misses,
+    }
+
+
+def _is_revoked(claims: dict[str, Any]) -> bool:
+    return any(check(claims) for check in _revocation_checks)
+
+
 def decode_token(token: str) -> Optional[dict[str, Any]]:
     """Decode a JWT token and return the payload if valid."""
-    try:
-        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-    except JWTError:
+    use_cache = settings.token_cache_enabled
+    key = _token_key(token) if use_cache else None
+    claims = _token_cache.get(key) if use_cache else None
+    if claims is None:
+        try:
+            claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        except JWTError:
+            return None
+        if use_cache and isinstance(claims.get("exp"), (int, float)):
+            _token_cache.set(key, claims, float(claims["exp"]))
+
+    if _is_revoked(claims):
         return None
+    return dict(claims)
 
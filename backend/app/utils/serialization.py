@@ -0,0 +1,39 @@
+"""JSON serialisation helpers for responses.
+
+Routes that declare a ``response_model`` are validated once and encoded
+straight to bytes by Pydantic's Rust core. They should return ORM objects
+(or plain data) rather than building models by hand, which only repeats
+the validation. Setting a custom ``default_response_class`` would switch
+those routes back to dumping Python objects first, so the application
+default stays as it is.
+
+Routes that build plain dicts and lists return :class:`FastJSONResponse`.
+It encodes with ``orjson`` (datetimes, enums and UUIDs natively) and skips
+FastAPI's ``jsonable_encoder`` pass.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with orjson when it is available.
+
+    Return it from the route (``return FastJSONResponse(rows)``); when FastAPI
+    renders a returned dict itself it runs ``jsonable_encoder`` first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:  # pragma: no cover - optional dependency
+            return super().render(jsonable_encoder(content))
+        # jsonable_encoder handles only what orjson can't (Decimal, models, sets).
+        return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
@@ -1,19 +1,16 @@
 """Initialize fresh database with superadmin user."""
 
-from app.database import SessionLocal, Base, engine
+from app.database import SessionLocal, engine
 from app.models.user import User
 from app.utils.security import get_password_hash
-from app.utils.migrations import run_startup_migrations
+from app.utils.migrations import upgrade_database
 
 def init_fresh_db():
     """Initialize a fresh database with superadmin user."""
     print("🔄 Creating fresh database...")
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    
-    # Run any startup migrations
-    run_startup_migrations(engine)
+    # Create all tables through the versioned migrations
+    upgrade_database(engine)
     
     # Create database session
     db = SessionLocal()
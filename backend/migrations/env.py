@@ -0,0 +1,69 @@
+"""Alembic environment for ProcuraHub."""
+
+from __future__ import annotations
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app.config import get_settings
+from app.database import Base
+from app import models  # noqa: F401 - register models on Base.metadata
+from app.utils.migrations import acquire_migration_lock
+
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("connection") is None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def _configure(**kwargs) -> None:
+    url = kwargs.get("url")
+    dialect_name = kwargs["connection"].dialect.name if "connection" in kwargs else url.split(":")[0]
+    context.configure(
+        target_metadata=target_metadata,
+        # SQLite cannot ALTER constraints in place; batch mode rebuilds tables.
+        render_as_batch=dialect_name.startswith("sqlite"),
+        compare_type=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of executing it (``alembic upgrade --sql``)."""
+    _configure(url=get_settings().database_url, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run_locked(connection) -> None:
+    _configure(connection=connection)
+    with context.begin_transaction():
+        # Workers started with AUTO_MIGRATE, or a deploy racing one, take
+        # turns; whoever comes second finds the database already at head.
+        acquire_migration_lock(connection)
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Invoked programmatically with an open connection (see upgrade_database).
+        _run_locked(connection)
+        return
+
+    section = config.get_section(config.config_ini_section, {})
+    section["sqlalchemy.url"] = get_settings().database_url
+    connectable = engine_from_config(section, prefix="sqlalchemy.", poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        _run_locked(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
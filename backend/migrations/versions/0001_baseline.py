@@ -0,0 +1,455 @@
+"""Baseline schema
+
+The schema as it stood when versioned migrations were introduced, written
+out explicitly so that later model changes cannot alter what this revision
+creates.
+
+A fresh database gets every table plus the default departments and
+categories. A database created by the pre-Alembic startup code (it already
+has a ``users`` table) only gets the tables it is missing, and
+:func:`~app.utils.migrations.align_legacy_schema` then adds the columns its
+older tables lack.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.migrations import align_legacy_schema
+from app.utils.reference_data import DEFAULT_CATEGORIES, DEFAULT_DEPARTMENTS
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ENUM_TYPES = (
+    "userrole",
+    "rfqstatus",
+    "messagestatus",
+    "requeststatus",
+    "quotationstatus",
+    "suppliercategorytype",
+    "supplierdocumenttype",
+)
+
+
+def _create_company_settings() -> sa.Table:
+    table = op.create_table(
+        "company_settings",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("company_name", sa.String(length=255), nullable=False),
+        sa.Column("address_line1", sa.String(length=255), nullable=True),
+        sa.Column("address_line2", sa.String(length=255), nullable=True),
+        sa.Column("city", sa.String(length=100), nullable=True),
+        sa.Column("state", sa.String(length=100), nullable=True),
+        sa.Column("postal_code", sa.String(length=20), nullable=True),
+        sa.Column("country", sa.String(length=100), nullable=True),
+        sa.Column("phone", sa.String(length=50), nullable=True),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("website", sa.String(length=255), nullable=True),
+        sa.Column("logo_path", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_company_settings_id", "company_settings", ["id"])
+    return table
+
+
+def _create_procurement_categories() -> sa.Table:
+    table = op.create_table(
+        "procurement_categories",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_procurement_categories_id", "procurement_categories", ["id"])
+    op.create_index("ix_procurement_categories_name", "procurement_categories", ["name"], unique=True)
+    return table
+
+
+def _create_users() -> sa.Table:
+    table = op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("full_name", sa.String(length=255), nullable=False),
+        sa.Column(
+            "role",
+            sa.Enum(
+                "SuperAdmin",
+                "Procurement",
+                "ProcurementOfficer",
+                "HeadOfDepartment",
+                "Requester",
+                "Finance",
+                "Supplier",
+                name="userrole",
+            ),
+            nullable=False,
+        ),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("timezone", sa.String(length=50), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_role", "users", ["role"])
+    return table
+
+
+def _create_departments() -> sa.Table:
+    table = op.create_table(
+        "departments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("head_of_department_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["head_of_department_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index("ix_departments_id", "departments", ["id"])
+    return table
+
+
+def _create_rfqs() -> sa.Table:
+    table = op.create_table(
+        "rfqs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("rfq_number", sa.String(length=30), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("category", sa.String(length=120), nullable=False),
+        sa.Column("budget", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("currency", sa.String(length=10), nullable=True),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", sa.Enum("draft", "open", "closed", "awarded", name="rfqstatus"), nullable=True),
+        sa.Column("response_locked", sa.Boolean(), nullable=False),
+        sa.Column("created_by_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["created_by_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_rfqs_category", "rfqs", ["category"])
+    op.create_index("ix_rfqs_deadline", "rfqs", ["deadline"])
+    op.create_index("ix_rfqs_id", "rfqs", ["id"])
+    op.create_index("ix_rfqs_rfq_number", "rfqs", ["rfq_number"], unique=True)
+    op.create_index("ix_rfqs_status", "rfqs", ["status"])
+    return table
+
+
+def _create_supplier_profiles() -> sa.Table:
+    table = op.create_table(
+        "supplier_profiles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("supplier_number", sa.String(length=20), nullable=False),
+        sa.Column("company_name", sa.String(length=255), nullable=False),
+        sa.Column("contact_email", sa.String(length=255), nullable=False),
+        sa.Column("contact_phone", sa.String(length=100), nullable=True),
+        sa.Column("address", sa.String(length=500), nullable=True),
+        sa.Column("preferred_currency", sa.String(length=16), nullable=True),
+        sa.Column("invitations_sent", sa.Integer(), nullable=True),
+        sa.Column("last_invited_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("total_awarded_value", sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_index("ix_supplier_profiles_id", "supplier_profiles", ["id"])
+    op.create_index(
+        "ix_supplier_profiles_supplier_number", "supplier_profiles", ["supplier_number"], unique=True
+    )
+    return table
+
+
+def _create_messages() -> sa.Table:
+    table = op.create_table(
+        "messages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sender_id", sa.Integer(), nullable=False),
+        sa.Column("recipient_id", sa.Integer(), nullable=False),
+        sa.Column("supplier_id", sa.Integer(), nullable=True),
+        sa.Column("subject", sa.String(length=255), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("status", sa.Enum("sent", "read", name="messagestatus"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("read_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["recipient_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["sender_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["supplier_id"], ["supplier_profiles.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_messages_id", "messages", ["id"])
+    return table
+
+
+def _create_purchase_requests() -> sa.Table:
+    table = op.create_table(
+        "purchase_requests",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("justification", sa.Text(), nullable=False),
+        sa.Column("category", sa.String(length=120), nullable=False),
+        sa.Column("department_id", sa.Integer(), nullable=True),
+        sa.Column("budget", sa.Numeric(precision=14, scale=2), nullable=True),
+        sa.Column("currency", sa.String(length=16), nullable=True),
+        sa.Column("finance_budget_amount", sa.Numeric(precision=14, scale=2), nullable=True),
+        sa.Column("finance_budget_currency", sa.String(length=16), nullable=True),
+        sa.Column("needed_by", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "pending_hod",
+                "rejected_by_hod",
+                "pending_procurement",
+                "rejected_by_procurement",
+                "pending_finance",
+                "rejected_by_finance",
+                "finance_approved",
+                "rfq_issued",
+                "completed",
+                name="requeststatus",
+            ),
+            nullable=True,
+        ),
+        sa.Column("procurement_notes", sa.Text(), nullable=True),
+        sa.Column("finance_notes", sa.Text(), nullable=True),
+        sa.Column("hod_notes", sa.Text(), nullable=True),
+        sa.Column("hod_rejection_reason", sa.Text(), nullable=True),
+        sa.Column("procurement_rejection_reason", sa.Text(), nullable=True),
+        sa.Column("finance_rejection_reason", sa.Text(), nullable=True),
+        sa.Column("requester_id", sa.Integer(), nullable=True),
+        sa.Column("hod_reviewer_id", sa.Integer(), nullable=True),
+        sa.Column("approved_by_id", sa.Integer(), nullable=True),
+        sa.Column("finance_reviewer_id", sa.Integer(), nullable=True),
+        sa.Column("rfq_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("hod_reviewed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("approved_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finance_reviewed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("rfq_invited_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["approved_by_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["finance_reviewer_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["hod_reviewer_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["requester_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["rfq_id"], ["rfqs.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_purchase_requests_category", "purchase_requests", ["category"])
+    op.create_index("ix_purchase_requests_id", "purchase_requests", ["id"])
+    op.create_index("ix_purchase_requests_status", "purchase_requests", ["status"])
+    return table
+
+
+def _create_rfq_documents() -> sa.Table:
+    table = op.create_table(
+        "rfq_documents",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("rfq_id", sa.Integer(), nullable=False),
+        sa.Column("file_path", sa.String(length=500), nullable=False),
+        sa.Column("original_filename", sa.String(length=255), nullable=False),
+        sa.Column("uploaded_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["rfq_id"], ["rfqs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_rfq_documents_id", "rfq_documents", ["id"])
+    return table
+
+
+def _create_rfq_invitations() -> sa.Table:
+    table = op.create_table(
+        "rfq_invitations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("rfq_id", sa.Integer(), nullable=False),
+        sa.Column("supplier_id", sa.Integer(), nullable=False),
+        sa.Column("invited_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("responded_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(["rfq_id"], ["rfqs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["supplier_id"], ["supplier_profiles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_rfq_invitations_id", "rfq_invitations", ["id"])
+    return table
+
+
+def _create_rfq_quotations() -> sa.Table:
+    table = op.create_table(
+        "rfq_quotations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("rfq_id", sa.Integer(), nullable=False),
+        sa.Column("supplier_id", sa.Integer(), nullable=False),
+        sa.Column("supplier_user_id", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("currency", sa.String(length=10), nullable=True),
+        sa.Column("tax_type", sa.String(length=10), nullable=True),
+        sa.Column("tax_amount", sa.Numeric(precision=14, scale=2), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("document_path", sa.String(length=500), nullable=True),
+        sa.Column("original_filename", sa.String(length=255), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "draft",
+                "submitted",
+                "pending_finance_approval",
+                "approved",
+                "rejected",
+                name="quotationstatus",
+            ),
+            nullable=True,
+        ),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("approved_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("approved_by_id", sa.Integer(), nullable=True),
+        sa.Column("budget_override_justification", sa.Text(), nullable=True),
+        sa.Column("finance_approval_requested_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finance_approval_requested_by_id", sa.Integer(), nullable=True),
+        sa.Column("delivery_status", sa.String(length=20), nullable=True),
+        sa.Column("delivered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("delivery_note_path", sa.String(length=500), nullable=True),
+        sa.Column("delivery_note_filename", sa.String(length=255), nullable=True),
+        sa.Column("marked_delivered_by_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["approved_by_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["finance_approval_requested_by_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["marked_delivered_by_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["rfq_id"], ["rfqs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["supplier_id"], ["supplier_profiles.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["supplier_user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_rfq_quotations_id", "rfq_quotations", ["id"])
+    return table
+
+
+def _create_supplier_categories() -> sa.Table:
+    table = op.create_table(
+        "supplier_categories",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("supplier_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column(
+            "category_type",
+            sa.Enum(
+                "primary",
+                "secondary",
+                name="suppliercategorytype",
+            ),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["supplier_id"], ["supplier_profiles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("supplier_id", "name", name="uq_supplier_category"),
+    )
+    op.create_index("ix_supplier_categories_id", "supplier_categories", ["id"])
+    op.create_index("ix_supplier_categories_name", "supplier_categories", ["name"])
+    return table
+
+
+def _create_supplier_documents() -> sa.Table:
+    table = op.create_table(
+        "supplier_documents",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("supplier_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "document_type",
+            sa.Enum(
+                "incorporation",
+                "tax_clearance",
+                "company_profile",
+                "other",
+                name="supplierdocumenttype",
+            ),
+            nullable=False,
+        ),
+        sa.Column("file_path", sa.String(length=500), nullable=False),
+        sa.Column("original_filename", sa.String(length=255), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["supplier_id"], ["supplier_profiles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_supplier_documents_id", "supplier_documents", ["id"])
+    return table
+
+
+def _create_request_documents() -> sa.Table:
+    table = op.create_table(
+        "request_documents",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("request_id", sa.Integer(), nullable=False),
+        sa.Column("file_path", sa.String(length=500), nullable=False),
+        sa.Column("original_filename", sa.String(length=255), nullable=False),
+        sa.Column("uploaded_by_id", sa.Integer(), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["request_id"], ["purchase_requests.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["uploaded_by_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_request_documents_id", "request_documents", ["id"])
+    return table
+
+
+# In foreign key order.
+BASELINE_TABLES = (
+    ("company_settings", _create_company_settings),
+    ("procurement_categories", _create_procurement_categories),
+    ("users", _create_users),
+    ("departments", _create_departments),
+    ("rfqs", _create_rfqs),
+    ("supplier_profiles", _create_supplier_profiles),
+    ("messages", _create_messages),
+    ("purchase_requests", _create_purchase_requests),
+    ("rfq_documents", _create_rfq_documents),
+    ("rfq_invitations", _create_rfq_invitations),
+    ("rfq_quotations", _create_rfq_quotations),
+    ("supplier_categories", _create_supplier_categories),
+    ("supplier_documents", _create_supplier_documents),
+    ("request_documents", _create_request_documents),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+    created = {name: create() for name, create in BASELINE_TABLES if name not in existing}
+
+    if "users" in existing:
+        align_legacy_schema(bind)
+        return
+
+    op.bulk_insert(
+        created["departments"],
+        [{"name": name, "description": description} for name, description in DEFAULT_DEPARTMENTS],
+    )
+    op.bulk_insert(
+        created["procurement_categories"],
+        [{"name": name, "description": description} for name, description in DEFAULT_CATEGORIES],
+    )
+
+
+def downgrade() -> None:
+    for name, _ in reversed(BASELINE_TABLES):
+        op.drop_table(name)
+    if op.get_bind().dialect.name == "postgresql":
+        for name in ENUM_TYPES:
+            op.execute(f"DROP TYPE IF EXISTS {name}")
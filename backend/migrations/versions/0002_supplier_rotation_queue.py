@@ -0,0 +1,91 @@
+"""Per-category supplier rotation queue
+
+Adds invitation counters and a weighted rotation score to
+supplier_categories, indexed as (name, rotation_score, last_invited_at,
+supplier_id) so supplier selection reads only the rows it invites. Existing
+invitation history is backfilled into the new columns.
+
+Revision ID: 0002_supplier_rotation_queue
+Revises: 0001_baseline
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import get_settings
+
+
+revision = "0002_supplier_rotation_queue"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_supplier_categories_rotation"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "supplier_categories",
+        sa.Column("invitations_sent", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "supplier_categories",
+        sa.Column("last_invited_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "supplier_categories",
+        sa.Column("rotation_score", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        INDEX_NAME,
+        "supplier_categories",
+        ["name", "rotation_score", "last_invited_at", "supplier_id"],
+    )
+
+    # Backfill from invitation history: one point per invitation in the
+    # category plus the non-response penalty for closed RFQs left unanswered.
+    op.execute(
+        sa.text(
+            """
+            UPDATE supplier_categories SET
+                invitations_sent = (
+                    SELECT COUNT(*) FROM rfq_invitations i
+                    JOIN rfqs r ON r.id = i.rfq_id
+                    WHERE i.supplier_id = supplier_categories.supplier_id
+                      AND r.category = supplier_categories.name
+                ),
+                last_invited_at = (
+                    SELECT MAX(i.invited_at) FROM rfq_invitations i
+                    JOIN rfqs r ON r.id = i.rfq_id
+                    WHERE i.supplier_id = supplier_categories.supplier_id
+                      AND r.category = supplier_categories.name
+                )
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            """
+            UPDATE supplier_categories SET rotation_score = invitations_sent + :penalty * (
+                SELECT COUNT(*) FROM rfq_invitations i
+                JOIN rfqs r ON r.id = i.rfq_id
+                WHERE i.supplier_id = supplier_categories.supplier_id
+                  AND r.category = supplier_categories.name
+                  AND r.status IN ('closed', 'awarded')
+                  AND NOT EXISTS (
+                      SELECT 1 FROM rfq_quotations q
+                      WHERE q.rfq_id = i.rfq_id AND q.supplier_id = i.supplier_id
+                  )
+            )
+            """
+        ).bindparams(penalty=get_settings().supplier_non_response_penalty)
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="supplier_categories")
+    with op.batch_alter_table("supplier_categories") as batch:
+        batch.drop_column("rotation_score")
+        batch.drop_column("last_invited_at")
+        batch.drop_column("invitations_sent")
@@ -0,0 +1,38 @@
+"""Unique quotation per supplier per RFQ
+
+Revision ID: 0003_unique_quotation_per_supplier
+Revises: 0002_supplier_rotation_queue
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_unique_quotation_per_supplier"
+down_revision = "0002_supplier_rotation_queue"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "uq_rfq_quotations_rfq_supplier"
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(
+        sa.text(
+            "SELECT rfq_id, supplier_id, COUNT(*) FROM rfq_quotations "
+            "GROUP BY rfq_id, supplier_id HAVING COUNT(*) > 1"
+        )
+    ).fetchall()
+    if duplicates:
+        # Quotations are supplier bids; never pick a winner silently.
+        pairs = ", ".join(f"(rfq {rfq_id}, supplier {supplier_id})" for rfq_id, supplier_id, _ in duplicates)
+        raise RuntimeError(
+            f"Duplicate quotations must be resolved before this migration can run: {pairs}"
+        )
+
+    op.create_index(INDEX_NAME, "rfq_quotations", ["rfq_id", "supplier_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="rfq_quotations")
@@ -0,0 +1,32 @@
+"""User notification frequency preference
+
+Revision ID: 0004_user_notification_frequency
+Revises: 0003_unique_quotation_per_supplier
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_user_notification_frequency"
+down_revision = "0003_unique_quotation_per_supplier"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "notification_frequency",
+            sa.String(length=20),
+            nullable=False,
+            server_default="immediate",
+        ),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("notification_frequency")
@@ -0,0 +1,53 @@
+"""Queued notification events for hourly and daily digests
+
+Creates notification_events and moves users from the interim "digest"
+preference to "hourly".
+
+Revision ID: 0005_notification_events
+Revises: 0004_user_notification_frequency
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_notification_events"
+down_revision = "0004_user_notification_frequency"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_notification_events_pending"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("subject", sa.String(length=255), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_notification_events_id", "notification_events", ["id"])
+    op.create_index(INDEX_NAME, "notification_events", ["sent_at", "user_id"])
+
+    op.execute(
+        "UPDATE users SET notification_frequency = 'hourly' WHERE notification_frequency = 'digest'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_events")
@@ -0,0 +1,41 @@
+"""Unique invitation per supplier per RFQ
+
+Adds the composite index used by supplier access checks. Like 0003, it
+refuses to run while the same supplier is invited twice to one RFQ.
+
+Revision ID: 0006_unique_invitation_per_supplier
+Revises: 0005_notification_events
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_unique_invitation_per_supplier"
+down_revision = "0005_notification_events"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "uq_rfq_invitations_rfq_supplier"
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(
+        sa.text(
+            "SELECT rfq_id, supplier_id, COUNT(*) FROM rfq_invitations "
+            "GROUP BY rfq_id, supplier_id HAVING COUNT(*) > 1"
+        )
+    ).fetchall()
+    if duplicates:
+        # Each row may carry a response; never drop one silently.
+        pairs = ", ".join(f"(rfq {rfq_id}, supplier {supplier_id})" for rfq_id, supplier_id, _ in duplicates)
+        raise RuntimeError(
+            f"Duplicate invitations must be resolved before this migration can run: {pairs}"
+        )
+
+    op.create_index(INDEX_NAME, "rfq_invitations", ["rfq_id", "supplier_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="rfq_invitations")
@@ -0,0 +1,111 @@
+"""Full-text search indexes
+
+PostgreSQL gets a weighted ``search_vector`` generated column plus a GIN
+index on each searchable table. SQLite gets an external-content FTS5 table
+per searchable table, kept current by triggers. Either way the index is
+updated by the database on every write, so no application code has to
+remember to reindex.
+
+Revision ID: 0007_full_text_search
+Revises: 0006_unique_invitation_per_supplier
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+revision = "0007_full_text_search"
+down_revision = "0006_unique_invitation_per_supplier"
+branch_labels = None
+depends_on = None
+
+# (column, weight, text search config). Identifiers and e-mail addresses use
+# the "simple" config so they are matched verbatim rather than stemmed. The
+# column order is mirrored by the bm25 weights in app/services/search.py.
+SEARCH_FIELDS = {
+    "rfqs": (
+        ("rfq_number", "A", "simple"),
+        ("title", "A", "english"),
+        ("category", "B", "english"),
+        ("description", "C", "english"),
+    ),
+    "purchase_requests": (
+        ("title", "A", "english"),
+        ("category", "B", "english"),
+        ("description", "C", "english"),
+        ("justification", "C", "english"),
+    ),
+    "supplier_profiles": (
+        ("company_name", "A", "english"),
+        ("supplier_number", "A", "simple"),
+        ("contact_email", "B", "simple"),
+        ("address", "C", "english"),
+    ),
+    "messages": (
+        ("subject", "A", "english"),
+        ("content", "B", "english"),
+    ),
+}
+
+
+def _postgres_upgrade() -> None:
+    for table, fields in SEARCH_FIELDS.items():
+        vector = " || ".join(
+            f"setweight(to_tsvector('{config}'::regconfig, coalesce({column}, '')), '{weight}')"
+            for column, weight, config in fields
+        )
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({vector}) STORED"
+        )
+        op.execute(
+            f"CREATE INDEX ix_{table}_search_vector ON {table} USING GIN (search_vector)"
+        )
+
+
+def _sqlite_upgrade() -> None:
+    for table, fields in SEARCH_FIELDS.items():
+        fts = f"{table}_fts"
+        columns = ", ".join(column for column, _, _ in fields)
+        new_values = ", ".join(f"new.{column}" for column, _, _ in fields)
+        old_values = ", ".join(f"old.{column}" for column, _, _ in fields)
+
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{columns}, content='{table}', content_rowid='id', tokenize='porter unicode61')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        # Only reindex when an indexed column changes, not on status updates.
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        _postgres_upgrade()
+    elif dialect == "sqlite":
+        _sqlite_upgrade()
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH_FIELDS:
+        if dialect == "postgresql":
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+        elif dialect == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
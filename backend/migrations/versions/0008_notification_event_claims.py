@@ -0,0 +1,36 @@
+"""Lease columns for digest delivery
+
+Digest events are claimed with a lease (claimed_at, claim_token) and only
+marked sent once the email has been accepted, so a failed send or a crashed
+worker no longer loses them.
+
+Revision ID: 0008_notification_event_claims
+Revises: 0007_full_text_search
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_notification_event_claims"
+down_revision = "0007_full_text_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "notification_events",
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "notification_events",
+        sa.Column("claim_token", sa.String(length=32), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("notification_events") as batch:
+        batch.drop_column("claim_token")
+        batch.drop_column("claimed_at")
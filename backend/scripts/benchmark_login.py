@@ -0,0 +1,127 @@
+"""Benchmark password verification throughput for the login path.
+
+Runs the same burst of bcrypt verifications three ways:
+
+* ``inline``  - on the event loop, as a naive async handler would;
+* ``threads`` - in the default thread pool, as the old synchronous
+  ``login_for_access_token`` did;
+* ``pool``    - in the process pool from ``app.services.password_hashing``.
+
+For each it reports logins per second, logins per second per core, latency
+percentiles and the worst event-loop stall seen by a 10 ms ticker (how long
+every other request on the worker would have waited)::
+
+    python scripts/benchmark_login.py --logins 64 --concurrency 32
+    python scripts/benchmark_login.py --rounds 10 --workers 4 --modes threads,pool
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.append(str(BACKEND_ROOT))
+
+MODES = ("inline", "threads", "pool")
+
+
+async def _ticker(stop: asyncio.Event, stalls: list[float], interval: float = 0.01) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        stalls.append(max(0.0, loop.time() - started - interval))
+
+
+async def _run_mode(mode: str, hashed: str, logins: int, concurrency: int) -> dict:
+    from app.services import password_hashing
+    from app.utils.security import verify_and_update_password
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def login() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            if mode == "inline":
+                verify_and_update_password("correct horse", hashed)
+            elif mode == "threads":
+                await loop.run_in_executor(None, verify_and_update_password, "correct horse", hashed)
+            else:
+                await password_hashing.verify_and_update_async("correct horse", hashed)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    if mode == "pool":
+        # Start the processes outside the timed section.
+        await asyncio.gather(*(password_hashing.verify_and_update_async("warm", hashed)
+                               for _ in range(password_hashing.pool_size())))
+
+    stop = asyncio.Event()
+    stalls: list[float] = []
+    ticker = asyncio.create_task(_ticker(stop, stalls))
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "throughput": logins / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "mean": statistics.mean(latencies),
+        "max_stall_ms": max(stalls, default=0.0) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Login password verification benchmark")
+    parser.add_argument("--logins", type=int, default=48, help="verifications per mode")
+    parser.add_argument("--concurrency", type=int, default=32, help="logins in flight at once")
+    parser.add_argument("--rounds", type=int, help="bcrypt cost (default: BCRYPT_ROUNDS)")
+    parser.add_argument("--workers", type=int, help="pool processes (default: PASSWORD_HASH_WORKERS)")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated subset of " + ", ".join(MODES))
+    args = parser.parse_args()
+
+    if args.rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    if args.workers:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    # Let the benchmark queue every login instead of shedding load.
+    os.environ.setdefault("PASSWORD_HASH_MAX_PENDING", str(max(args.logins, args.concurrency)))
+
+    from app.config import get_settings
+    from app.services.password_hashing import pool_size, shutdown_pool
+    from app.utils.security import get_password_hash
+
+    settings = get_settings()
+    hashed = get_password_hash("correct horse")
+    cores = os.cpu_count() or 1
+    print(f"bcrypt cost {settings.bcrypt_rounds}, {args.logins} logins at concurrency {args.concurrency}, "
+          f"{cores} CPU(s), pool of {pool_size()} process(es)")
+    print(f"{'mode':<8} {'logins/s':>9} {'per core':>9} {'p50 ms':>8} {'p95 ms':>8} {'max loop stall ms':>18}")
+
+    try:
+        for mode in [mode.strip() for mode in args.modes.split(",") if mode.strip()]:
+            if mode not in MODES:
+                parser.error(f"unknown mode {mode!r}")
+            result = asyncio.run(_run_mode(mode, hashed, args.logins, args.concurrency))
+            used_cores = {"inline": 1, "threads": cores, "pool": min(cores, pool_size())}[mode]
+            print(f"{mode:<8} {result['throughput']:>9.1f} {result['throughput'] / used_cores:>9.1f} "
+                  f"{result['p50']:>8.0f} {result['p95']:>8.0f} {result['max_stall_ms']:>18.0f}")
+    finally:
+        shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
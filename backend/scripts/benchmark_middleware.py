@@ -0,0 +1,103 @@
+"""Benchmark the security-header middleware: BaseHTTPMiddleware vs pure ASGI.
+
+Serves ``/health`` and a ``--file-kb`` file download through two otherwise
+identical apps:
+
+* ``before`` - the old ``@app.middleware("http")`` function, which
+  Starlette wraps in ``BaseHTTPMiddleware`` (a task and a memory stream
+  per request, and every body chunk copied through the stream);
+* ``after``  - :class:`app.middleware.SecurityHeadersMiddleware`, which
+  only edits the ``http.response.start`` message.
+
+Requests are driven in-process through ``httpx.ASGITransport`` so only
+application and middleware time is measured::
+
+    python scripts/benchmark_middleware.py --requests 3000 --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.append(str(BACKEND_ROOT))
+
+
+def _build_app(variant: str, file_path: str):
+    from fastapi import FastAPI, Request
+    from fastapi.responses import FileResponse
+
+    from app.middleware import SecurityHeadersMiddleware
+    from app.middleware.security_headers import SECURITY_HEADERS
+
+    app = FastAPI()
+
+    @app.get("/health")
+    def healthcheck() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/download")
+    def download() -> FileResponse:
+        return FileResponse(file_path, media_type="application/pdf", filename="quotation.pdf")
+
+    if variant == "before":
+        @app.middleware("http")
+        async def add_security_headers(request: Request, call_next):
+            response = await call_next(request)
+            for name, value in SECURITY_HEADERS.items():
+                response.headers[name] = value
+            return response
+    else:
+        app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+async def _run(app, path: str, requests: int, concurrency: int) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get(path)
+        assert response.status_code == 200 and response.headers["x-frame-options"] == "DENY"
+        queue = iter(range(requests))
+
+        async def worker() -> None:
+            for _ in queue:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Security header middleware benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per path and variant")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight")
+    parser.add_argument("--file-kb", type=int, default=512, help="size of the downloaded file")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as handle:
+        handle.write(os.urandom(args.file_kb * 1024))
+        file_path = handle.name
+    try:
+        print(f"{args.requests} requests per run at concurrency {args.concurrency}, {args.file_kb} KiB download")
+        print(f"{'path':<10} {'before req/s':>13} {'after req/s':>12} {'change':>8}")
+        for path in ("/health", "/download"):
+            before = asyncio.run(_run(_build_app("before", file_path), path, args.requests, args.concurrency))
+            after = asyncio.run(_run(_build_app("after", file_path), path, args.requests, args.concurrency))
+            print(f"{path:<10} {before:>13.0f} {after:>12.0f} {(after / before - 1) * 100:>+7.0f}%")
+    finally:
+        os.unlink(file_path)
+
+
+if __name__ == "__main__":
+    main()
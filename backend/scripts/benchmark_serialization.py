@@ -0,0 +1,165 @@
+"""Benchmark response serialisation for RFQs with quotations.
+
+Builds ``--rfqs`` in-memory RFQs (each with creator, documents and
+``--quotations`` quotations with their suppliers; no database needed) and
+times turning them into a JSON body the ways a route can:
+
+* ``rebuild``        - the old ``RFQWithQuotations`` routes: validate, dump to
+  a dict, add the creator, rebuild the model, then let FastAPI validate and
+  encode it again;
+* ``response_model`` - return the ORM objects and let the response model
+  validate them once and encode straight to bytes;
+* ``orjson``         - validate once, dump to Python objects, encode with
+  orjson (what a custom default response class does to model routes);
+* ``stdlib``         - validate once, dump to Python objects, encode with
+  ``json.dumps`` (FastAPI's classic ``JSONResponse`` path).
+
+All modes produce the same document; the script checks that first::
+
+    python scripts/benchmark_serialization.py --rfqs 1000 --quotations 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.append(str(BACKEND_ROOT))
+
+MODES = ("rebuild", "response_model", "orjson", "stdlib")
+
+
+def _build_rfqs(count: int, quotations: int) -> list:
+    from app.models import RFQ, Quotation, QuotationStatus, RFQDocument, RFQStatus, SupplierProfile, User, UserRole
+
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    creator = User(id=1, email="buyer@example.com", full_name="Pat Buyer", role=UserRole.procurement)
+    suppliers = [
+        SupplierProfile(id=index, company_name=f"Supplier {index} Ltd", supplier_number=f"SUP{index:05d}")
+        for index in range(1, 51)
+    ]
+    rfqs = []
+    for rfq_id in range(1, count + 1):
+        rfq = RFQ(
+            id=rfq_id,
+            rfq_number=f"RFQ-2026-{rfq_id:05d}",
+            title=f"Office supplies batch {rfq_id}",
+            description="Paper, toner and assorted stationery for the head office. " * 3,
+            category="Office Supplies",
+            budget=Decimal("12500.00"),
+            currency="ZMW",
+            deadline=now + timedelta(days=14),
+            status=RFQStatus.open,
+            response_locked=False,
+            created_at=now,
+            created_by_id=creator.id,
+        )
+        rfq.created_by = creator
+        rfq.documents = [
+            RFQDocument(id=rfq_id, file_path=f"rfqs/{rfq_id}/spec.pdf", original_filename="spec.pdf", uploaded_at=now)
+        ]
+        rfq.quotations = [
+            Quotation(
+                id=rfq_id * 100 + index,
+                rfq_id=rfq_id,
+                supplier_id=suppliers[(rfq_id + index) % len(suppliers)].id,
+                supplier=suppliers[(rfq_id + index) % len(suppliers)],
+                amount=Decimal("11875.50") + index,
+                currency="ZMW",
+                tax_type="VAT",
+                tax_amount=Decimal("1900.08"),
+                notes="Delivery within 10 working days.",
+                status=QuotationStatus.submitted,
+                submitted_at=now + timedelta(hours=index),
+                approved_at=None,
+            )
+            for index in range(quotations)
+        ]
+        rfqs.append(rfq)
+    return rfqs
+
+
+def _encoders(rfqs: list) -> dict[str, Callable[[], bytes]]:
+    import orjson
+
+    from pydantic import TypeAdapter
+
+    from app.schemas import RFQWithQuotations
+
+    adapter = TypeAdapter(list[RFQWithQuotations])
+
+    def rebuild() -> bytes:
+        result = []
+        for rfq in rfqs:
+            rfq_dict = RFQWithQuotations.model_validate(rfq).model_dump()
+            creator = getattr(rfq, "created_by", None)
+            if creator:
+                rfq_dict["created_by_name"] = getattr(creator, "full_name", None)
+                rfq_dict["created_by_role"] = getattr(creator, "role", None)
+            result.append(RFQWithQuotations(**rfq_dict))
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+
+    def response_model() -> bytes:
+        return adapter.dump_json(adapter.validate_python(rfqs, from_attributes=True))
+
+    def orjson_mode() -> bytes:
+        value = adapter.validate_python(rfqs, from_attributes=True)
+        return orjson.dumps(adapter.dump_python(value, mode="json"))
+
+    def stdlib() -> bytes:
+        value = adapter.validate_python(rfqs, from_attributes=True)
+        content = adapter.dump_python(value, mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return {"rebuild": rebuild, "response_model": response_model, "orjson": orjson_mode, "stdlib": stdlib}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RFQ serialisation benchmark")
+    parser.add_argument("--rfqs", type=int, default=1000, help="RFQs per response")
+    parser.add_argument("--quotations", type=int, default=5, help="quotations per RFQ")
+    parser.add_argument("--repeat", type=int, default=15, help="timed runs per mode")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated subset of " + ", ".join(MODES))
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode {mode!r}")
+
+    rfqs = _build_rfqs(args.rfqs, args.quotations)
+    encoders = _encoders(rfqs)
+    reference = json.loads(encoders["response_model"]())
+    for mode in modes:
+        if json.loads(encoders[mode]()) != reference:
+            sys.exit(f"{mode} produced a different document")
+
+    size_kb = len(encoders["response_model"]()) / 1024
+    print(f"{args.rfqs} RFQs x {args.quotations} quotations, {size_kb:.0f} KiB of JSON, best of {args.repeat}")
+    print(f"{'mode':<15} {'best ms':>8} {'median ms':>10} {'MB/s':>7} {'vs rebuild':>11}")
+    baseline = None
+    for mode in modes:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            encoders[mode]()
+            timings.append((time.perf_counter() - started) * 1000)
+        best = min(timings)
+        if mode == "rebuild":
+            baseline = best
+        speedup = f"{baseline / best:>10.1f}x" if baseline else f"{'':>11}"
+        print(f"{mode:<15} {best:>8.1f} {statistics.median(timings):>10.1f} "
+              f"{size_kb / 1024 / (best / 1000):>7.1f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Fire a burst of concurrent quotation submissions at a single RFQ.
+
+Simulates the deadline rush: every invited supplier submits at once and a
+share of them double-submit, which must yield exactly one quotation per
+supplier and a 409 for the duplicates.
+
+Seeds an RFQ plus ``--suppliers`` invited suppliers directly in the
+configured database, mints their access tokens, then submits either
+in-process (default) or against a running server::
+
+    python scripts/load_test_quotations.py --suppliers 300 --duplicates 0.2
+    python scripts/load_test_quotations.py --base-url http://localhost:8000
+
+When targeting a server, it must share DATABASE_URL and SECRET_KEY with
+this script.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.append(str(BACKEND_ROOT))
+
+import httpx
+
+from app.database import SessionLocal
+from app.models import (
+    RFQ,
+    Quotation,
+    RFQInvitation,
+    RFQStatus,
+    SupplierProfile,
+    User,
+    UserRole,
+)
+from app.utils.security import create_access_token
+
+
+def _seed(supplier_count: int) -> tuple[int, list[tuple[int, str]]]:
+    """Create one open RFQ and invited suppliers; return (rfq_id, [(supplier_id, token)])."""
+    run_id = uuid4().hex[:8]
+    session = SessionLocal()
+    try:
+        rfq = RFQ(
+            rfq_number=f"LOAD{run_id}",
+            title=f"Load test {run_id}",
+            description="Concurrent quotation ingestion load test",
+            category="Load Testing",
+            budget=1_000_000,
+            currency="ZMW",
+            deadline=datetime.now(timezone.utc) + timedelta(hours=1),
+            status=RFQStatus.open,
+        )
+        session.add(rfq)
+        session.flush()
+
+        suppliers: list[tuple[int, str]] = []
+        for index in range(supplier_count):
+            user = User(
+                email=f"load-{run_id}-{index}@loadtest.local",
+                full_name=f"Load Supplier {index}",
+                hashed_password="!",  # token-only account, cannot log in
+                role=UserRole.supplier,
+                is_active=True,
+            )
+            session.add(user)
+            session.flush()
+            profile = SupplierProfile(
+                user_id=user.id,
+                supplier_number=f"L{run_id}{index:05d}"[:20],
+                company_name=user.full_name,
+                contact_email=user.email,
+            )
+            session.add(profile)
+            session.flush()
+            session.add(RFQInvitation(rfq_id=rfq.id, supplier_id=profile.id))
+            suppliers.append((profile.id, create_access_token(str(user.id))))
+        session.commit()
+        return rfq.id, suppliers
+    finally:
+        session.close()
+
+
+async def _submit(
+    client: httpx.AsyncClient, rfq_id: int, token: str, amount: int, attachment: bytes | None
+) -> tuple[int, float]:
+    files = {"attachment": ("quote.pdf", attachment, "application/pdf")} if attachment else None
+    started = time.perf_counter()
+    response = await client.post(
+        f"/api/rfqs/{rfq_id}/quotations",
+        data={"amount": str(amount), "currency": "ZMW"},
+        files=files,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return response.status_code, (time.perf_counter() - started) * 1000
+
+
+async def _run(args: argparse.Namespace) -> int:
+    rfq_id, suppliers = _seed(args.suppliers)
+    attachment = b"%PDF-1.4\n" + b"0" * (args.attachment_kb * 1024) if args.attachment_kb else None
+
+    duplicate_count = int(len(suppliers) * args.duplicates)
+    jobs = [(token, 1000 + index) for index, (_, token) in enumerate(suppliers)]
+    jobs += [(token, 2000 + index) for index, (_, token) in enumerate(suppliers[:duplicate_count])]
+
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def bounded(token: str, amount: int) -> tuple[int, float]:
+            async with semaphore:
+                return await _submit(client, rfq_id, token, amount, attachment)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(bounded(token, amount) for token, amount in jobs))
+        elapsed = time.perf_counter() - started
+
+    statuses = Counter(code for code, _ in results)
+    latencies = sorted(latency for _, latency in results)
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+    session = SessionLocal()
+    try:
+        stored = session.query(Quotation).filter(Quotation.rfq_id == rfq_id).count()
+    finally:
+        session.close()
+
+    print(f"RFQ {rfq_id}: {len(jobs)} submissions from {len(suppliers)} suppliers in {elapsed:.2f}s "
+          f"({len(jobs) / elapsed:.0f} req/s, concurrency {args.concurrency})")
+    print("Status codes: " + ", ".join(f"{code}={count}" for code, count in sorted(statuses.items())))
+    print(f"Latency ms: p50={percentile(0.50):.1f} p95={percentile(0.95):.1f} "
+          f"p99={percentile(0.99):.1f} max={latencies[-1]:.1f} mean={statistics.mean(latencies):.1f}")
+    print(f"Quotations stored: {stored} (expected {len(suppliers)})")
+
+    ok = stored == len(suppliers) and statuses[201] == len(suppliers) and statuses[409] == duplicate_count
+    print("PASS" if ok else "FAIL: expected one quotation per supplier and a 409 for every duplicate")
+    return 0 if ok else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent quotation submission load test")
+    parser.add_argument("--suppliers", type=int, default=200, help="invited suppliers to simulate")
+    parser.add_argument("--duplicates", type=float, default=0.25,
+                        help="fraction of suppliers that submit twice at the same time")
+    parser.add_argument("--concurrency", type=int, default=100, help="maximum in-flight requests")
+    parser.add_argument("--attachment-kb", type=int, default=64,
+                        help="size of the attached document (0 for none)")
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    raise SystemExit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ BACKEND_ROOT = Path(__file__).resolve().parents[1]
 if str(BACKEND_ROOT) not in sys.path:
     sys.path.append(str(BACKEND_ROOT))
 
-from app.database import Base, SessionLocal, engine
+from app.database import SessionLocal, engine
 from app.models import (
     Department,
     ProcurementCategory,
@@ -23,7 +23,7 @@ from app.models import (
     User,
     UserRole,
 )
-from app.utils.migrations import run_startup_migrations
+from app.utils.migrations import upgrade_database
 from app.utils.security import get_password_hash
 
 
@@ -183,9 +183,8 @@ def reset_database() -> None:
     """Drop the existing data and seed a clean demo environment."""
     _reset_sqlite_file()
 
-    # Recreate schema and apply lightweight migrations.
-    Base.metadata.create_all(bind=engine)
-    run_startup_migrations(engine)
+    # Recreate schema through the versioned migrations.
+    upgrade_database(engine)
 
     session = SessionLocal()
     try:
@@ -0,0 +1,25 @@
+"""Send every hourly/daily notification digest that is due.
+
+Workers already do this every NOTIFICATION_DIGEST_POLL_SECONDS; run this
+from cron instead when the in-process loop is disabled (poll set to 0)::
+
+    python scripts/send_notification_digests.py
+"""
+
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.append(str(BACKEND_ROOT))
+
+from app.services.notifications import run_digest_flush
+
+
+def main() -> None:
+    sent = run_digest_flush()
+    print(f"Sent {sent} notification digest(s).")
+
+
+if __name__ == "__main__":
+    main()
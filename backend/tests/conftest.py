@@ -0,0 +1,428 @@
+"""Fixtures for the per-endpoint query budget and latency suite.
+
+The session runs against one SQLite database in a temporary directory,
+configured before the app is imported, with ``QUERY_BUDGET_STRICT`` and
+``QUERY_REPORT_HEADERS`` on: routes over their ``@query_budget`` answer
+500 and every response reports its statement count.
+
+``seeded`` is parametrized with the ``--budget-scales`` factors and set up
+once per scale, smallest first. The first scale creates the demo
+categories, users and RFQs from ``setup_demo_data.py`` through the API.
+Every scale then tops the database up to ``scale`` times a base volume of
+suppliers, RFQs with invitations and quotations, purchase requests and
+messages, inserted directly, and adds fresh targets for the write cases.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="procurahub-tests-"))
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_TMP_DIR / 'procurahub.db'}",
+    "UPLOAD_DIR": str(_TMP_DIR / "uploads"),
+    "ENVIRONMENT": "development",
+    "AUTO_MIGRATE": "false",
+    "QUERY_BUDGET_STRICT": "true",
+    "QUERY_REPORT_HEADERS": "true",
+    "RATE_LIMIT_ENABLED": "false",
+    "EMAIL_CONSOLE_FALLBACK": "true",
+})
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_READ_URL", None)
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    RFQ,
+    Department,
+    Message,
+    ProcurementCategory,
+    PurchaseRequest,
+    Quotation,
+    QuotationStatus,
+    RequestStatus,
+    RFQInvitation,
+    RFQStatus,
+    SupplierCategory,
+    SupplierCategoryType,
+    SupplierProfile,
+    User,
+    UserRole,
+)
+from app.utils.migrations import upgrade_database  # noqa: E402
+from app.utils.security import create_access_token, get_password_hash  # noqa: E402
+
+
+# Rows inserted per unit of scale
+SUPPLIERS = 10
+RFQS = 5
+INVITED_PER_RFQ = 5
+QUOTES_PER_RFQ = 3
+REQUESTS = 10
+MESSAGES = 10
+# Suppliers each invite-suppliers target invites
+INVITES_PER_REQUEST = 3
+
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup("query budget")
+    group.addoption("--budget-scales", default="1,5,20", help="comma-separated data scale factors")
+    group.addoption("--budget-repeat", type=int, default=5, help="timed requests per case")
+    group.addoption("--budget-latency-ms", type=float, default=300.0, help="default median latency ceiling")
+    group.addoption(
+        "--budget-repeat-threshold",
+        type=int,
+        default=5,
+        help="fail when one statement repeats this often (0 disables)",
+    )
+    group.addoption("--budget-growth", type=int, default=0, help="extra statements allowed at larger scales")
+
+
+def pytest_generate_tests(metafunc) -> None:
+    if "seeded" in metafunc.fixturenames:
+        scales = sorted({int(value) for value in metafunc.config.getoption("budget_scales").split(",")})
+        metafunc.parametrize("seeded", scales, ids=[f"x{scale}" for scale in scales], indirect=True, scope="session")
+
+
+def pytest_unconfigure(config) -> None:
+    engine.dispose()
+    shutil.rmtree(_TMP_DIR, ignore_errors=True)
+
+
+@dataclass
+class Dataset:
+    """What has been seeded so far; grows as later scales top it up."""
+
+    units: int = 0
+    password: str = ""
+    users: dict[str, int] = field(default_factory=dict)
+    category_names: list[str] = field(default_factory=list)
+    department_ids: list[int] = field(default_factory=list)
+    hod_ids: list[int] = field(default_factory=list)
+    requester_ids: list[int] = field(default_factory=list)
+    # Probe records the read cases are formatted with
+    ids: dict[str, int] = field(default_factory=dict)
+    # (profile id, user id) of the probe supplier, invited to every RFQ
+    probe: tuple[int, int] = (0, 0)
+    invitable_supplier_ids: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Seeded:
+    scale: int
+    ids: dict[str, int]
+    tokens: dict[str, str]
+    # Write case targets by name; each request consumes one
+    targets: dict[str, list[dict[str, Any]]]
+
+    def headers(self, role: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[role]}"}
+
+
+def _create(client, path: str, payload: dict[str, Any], headers: dict[str, str]) -> None:
+    response = client.post(path, json=payload, headers=headers)
+    # 400: already there, e.g. a category the migrations seed as reference data
+    if response.status_code not in (200, 201, 400):
+        raise RuntimeError(f"POST {path} answered {response.status_code}: {response.text[:300]}")
+
+
+def _seed_demo_fixtures(client, headers: dict[str, str]) -> None:
+    """The setup_demo_data.py fixtures, created through the API."""
+    from setup_demo_data import DEMO_CATEGORIES, DEMO_USERS, demo_rfqs
+
+    for payload in DEMO_CATEGORIES:
+        _create(client, "/api/admin/categories", payload, headers)
+    for payload in DEMO_USERS:
+        _create(client, "/api/admin/users", payload, headers)
+    for payload in demo_rfqs():
+        _create(client, "/api/rfqs/", payload, headers)
+    _create(
+        client,
+        "/api/admin/company-settings",
+        {"company_name": "ProcuraHub Ltd", "address_line1": "Plot 1, Cairo Road", "city": "Lusaka"},
+        headers,
+    )
+
+
+def _user(db, dataset: Dataset, email: str, role: UserRole) -> User:
+    account = User(email=email, full_name=email.split("@")[0].title(), hashed_password=dataset.password, role=role)
+    db.add(account)
+    return account
+
+
+def _seed_people(db, dataset: Dataset) -> None:
+    """Look up the demo users and add the heads of department."""
+    dataset.password = get_password_hash("password123")
+    dataset.category_names = [
+        name for (name,) in db.query(ProcurementCategory.name).order_by(ProcurementCategory.id)
+    ]
+    dataset.ids["category_id"] = db.query(ProcurementCategory.id).order_by(ProcurementCategory.id).first()[0]
+
+    def first(role: UserRole) -> int:
+        return db.query(User.id).filter(User.role == role).order_by(User.id).first()[0]
+
+    dataset.users.update(superadmin=first(UserRole.superadmin), procurement=first(UserRole.procurement))
+    dataset.users["finance"] = first(UserRole.finance)
+    dataset.requester_ids = [
+        user_id for (user_id,) in db.query(User.id).filter(User.role == UserRole.requester).order_by(User.id)
+    ]
+    dataset.users["requester"] = dataset.requester_ids[0]
+
+    hods = [_user(db, dataset, f"hod{n}@budget.check", UserRole.head_of_department) for n in range(3)]
+    db.flush()
+    departments = [Department(name=f"Department {n}", head_of_department_id=hod.id) for n, hod in enumerate(hods)]
+    db.add_all(departments)
+    db.flush()
+    dataset.hod_ids = [hod.id for hod in hods]
+    dataset.department_ids = [department.id for department in departments]
+    dataset.users["head_of_department"] = hods[0].id
+
+
+def _seed_unit(db, dataset: Dataset, unit: int) -> None:
+    """Insert one base volume of suppliers, RFQs, requests and messages."""
+    now = datetime.now(timezone.utc)
+    categories = dataset.category_names
+    procurement_id = dataset.users["procurement"]
+
+    suppliers = []
+    for n in range(unit * SUPPLIERS, (unit + 1) * SUPPLIERS):
+        account = _user(db, dataset, f"supplier{n}@budget.check", UserRole.supplier)
+        profile = SupplierProfile(
+            user=account,
+            supplier_number=f"SUP{n:06d}",
+            company_name=f"Supplier {n} Ltd",
+            contact_email=account.email,
+        )
+        profile.categories = [
+            SupplierCategory(name=categories[n % len(categories)], category_type=SupplierCategoryType.primary),
+            SupplierCategory(
+                name=categories[(n + 1) % len(categories)], category_type=SupplierCategoryType.secondary
+            ),
+        ]
+        suppliers.append(profile)
+    db.add_all(suppliers)
+    db.flush()
+    if unit == 0:
+        dataset.probe = (suppliers[0].id, suppliers[0].user_id)
+        dataset.ids["supplier_id"] = suppliers[0].id
+        dataset.users["supplier"] = suppliers[0].user_id
+        dataset.invitable_supplier_ids = [supplier.id for supplier in suppliers[1:1 + INVITES_PER_REQUEST]]
+        suppliers = suppliers[1:]
+    probe_id, probe_user_id = dataset.probe
+
+    rfqs = []
+    rfq_statuses = [RFQStatus.open, RFQStatus.open, RFQStatus.closed, RFQStatus.awarded]
+    quote_statuses = [QuotationStatus.submitted, QuotationStatus.pending_finance_approval, QuotationStatus.approved]
+    for n in range(unit * RFQS, (unit + 1) * RFQS):
+        rfq = RFQ(
+            rfq_number=f"RFQ-QB-{n:05d}",
+            title=f"Laptop batch {n}",
+            description="Laptops for new staff",
+            category=categories[n % len(categories)],
+            budget=Decimal("25000"),
+            deadline=now + timedelta(days=14 if n % 4 < 2 else -1),
+            status=rfq_statuses[n % len(rfq_statuses)],
+            created_by_id=procurement_id,
+        )
+        db.add(rfq)
+        db.flush()
+        invited = [(probe_id, probe_user_id)] + [
+            (supplier.id, supplier.user_id)
+            for supplier in (suppliers[(n + offset) % len(suppliers)] for offset in range(INVITED_PER_RFQ - 1))
+        ]
+        db.add_all(RFQInvitation(rfq_id=rfq.id, supplier_id=supplier_id) for supplier_id, _ in invited)
+        for index, (supplier_id, supplier_user_id) in enumerate(invited[:QUOTES_PER_RFQ]):
+            status = quote_statuses[(n + index) % len(quote_statuses)]
+            db.add(Quotation(
+                rfq_id=rfq.id,
+                supplier_id=supplier_id,
+                supplier_user_id=supplier_user_id,
+                amount=Decimal("20000") + index,
+                status=status,
+                approved_at=now if status == QuotationStatus.approved else None,
+                approved_by_id=procurement_id if status == QuotationStatus.approved else None,
+            ))
+        rfqs.append(rfq)
+    if unit == 0:
+        dataset.ids["rfq_id"] = rfqs[0].id
+
+    request_statuses = [
+        RequestStatus.pending_hod,
+        RequestStatus.pending_procurement,
+        RequestStatus.rfq_issued,
+        RequestStatus.completed,
+        RequestStatus.rejected_by_procurement,
+    ]
+    requests = []
+    for n in range(unit * REQUESTS, (unit + 1) * REQUESTS):
+        status = request_statuses[n % len(request_statuses)]
+        reviewed = status != RequestStatus.pending_hod
+        requests.append(PurchaseRequest(
+            title=f"Laptops for team {n}",
+            description="Replacement laptops",
+            justification="End of life hardware",
+            category=categories[n % len(categories)],
+            department_id=dataset.department_ids[n % len(dataset.department_ids)],
+            proposed_budget_amount=Decimal("5000"),
+            proposed_budget_currency="USD",
+            needed_by=now + timedelta(days=30),
+            status=status,
+            requester_id=dataset.requester_ids[n % len(dataset.requester_ids)],
+            hod_reviewer_id=dataset.hod_ids[n % len(dataset.hod_ids)] if reviewed else None,
+            procurement_reviewer_id=procurement_id if reviewed else None,
+            rfq_id=rfqs[n % len(rfqs)].id if status in (RequestStatus.rfq_issued, RequestStatus.completed) else None,
+        ))
+    db.add_all(requests)
+    db.flush()
+    if unit == 0:
+        dataset.ids["request_id"] = requests[1].id
+
+    for n in range(unit * MESSAGES, (unit + 1) * MESSAGES):
+        supplier_id, supplier_user_id = (
+            dataset.probe if n % 2 == 0 else (suppliers[n % len(suppliers)].id, suppliers[n % len(suppliers)].user_id)
+        )
+        outgoing = n % 3 != 0
+        db.add(Message(
+            sender_id=procurement_id if outgoing else supplier_user_id,
+            recipient_id=supplier_user_id if outgoing else procurement_id,
+            supplier_id=supplier_id,
+            subject=f"RFQ question {n}",
+            content="Could you confirm the delivery window?",
+        ))
+
+
+def _seed_write_targets(db, dataset: Dataset, scale: int, count: int) -> dict[str, list[dict[str, Any]]]:
+    """``count`` fresh records for each write case at this scale."""
+    now = datetime.now(timezone.utc)
+    probe_id, probe_user_id = dataset.probe
+    other_id = dataset.invitable_supplier_ids[0]
+    other_user_id = db.get(SupplierProfile, other_id).user_id
+    procurement_id = dataset.users["procurement"]
+    targets: dict[str, list[dict[str, Any]]] = {"submit": [], "approve": [], "invite": []}
+
+    for n in range(count):
+        rfqs = [
+            RFQ(
+                rfq_number=f"RFQ-QB-{kind}-{scale}-{n}",
+                title=f"Laptop batch {kind} {scale}-{n}",
+                description="Laptops for new staff",
+                category=dataset.category_names[0],
+                budget=Decimal("25000"),
+                deadline=now + timedelta(days=14),
+                status=RFQStatus.open,
+                created_by_id=procurement_id,
+            )
+            for kind in ("submit", "approve")
+        ]
+        db.add_all(rfqs)
+        db.flush()
+        submit_rfq, approve_rfq = rfqs
+        db.add(RFQInvitation(rfq_id=submit_rfq.id, supplier_id=probe_id))
+        db.add_all(RFQInvitation(rfq_id=approve_rfq.id, supplier_id=supplier_id) for supplier_id in (probe_id, other_id))
+        winner, loser = (
+            Quotation(
+                rfq_id=approve_rfq.id,
+                supplier_id=supplier_id,
+                supplier_user_id=supplier_user_id,
+                amount=amount,
+                status=QuotationStatus.submitted,
+            )
+            for supplier_id, supplier_user_id, amount in (
+                (probe_id, probe_user_id, Decimal("20000")),
+                (other_id, other_user_id, Decimal("21000")),
+            )
+        )
+        db.add_all([winner, loser])
+
+        request = PurchaseRequest(
+            title=f"Laptops to invite {scale}-{n}",
+            description="Replacement laptops",
+            justification="End of life hardware",
+            category=dataset.category_names[0],
+            department_id=dataset.department_ids[0],
+            proposed_budget_amount=Decimal("5000"),
+            proposed_budget_currency="USD",
+            finance_budget_amount=Decimal("5000"),
+            finance_budget_currency="USD",
+            needed_by=now + timedelta(days=30),
+            status=RequestStatus.finance_approved,
+            requester_id=dataset.users["requester"],
+            hod_reviewer_id=dataset.hod_ids[0],
+            procurement_reviewer_id=procurement_id,
+            finance_reviewer_id=dataset.users["finance"],
+        )
+        db.add(request)
+        db.flush()
+
+        targets["submit"].append({"ids": {"rfq_id": submit_rfq.id}, "data": {"amount": "19500", "currency": "USD"}})
+        targets["approve"].append({"ids": {"rfq_id": approve_rfq.id, "quotation_id": winner.id}})
+        targets["invite"].append({
+            "ids": {"request_id": request.id},
+            "json": {
+                "supplier_ids": [probe_id, *dataset.invitable_supplier_ids],
+                "rfq_deadline": (now + timedelta(days=14)).isoformat(),
+            },
+        })
+    return targets
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    upgrade_database(engine)
+    with SessionLocal() as db:
+        db.add(User(
+            email="admin@procurahub.local",
+            full_name="Super Admin",
+            hashed_password=get_password_hash("admin123"),
+            role=UserRole.superadmin,
+        ))
+        db.commit()
+
+    from app.main import create_app
+
+    with TestClient(create_app(), raise_server_exceptions=False) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def dataset(client) -> Dataset:
+    dataset = Dataset()
+    with SessionLocal() as db:
+        admin_id = db.query(User.id).filter(User.role == UserRole.superadmin).scalar()
+    _seed_demo_fixtures(client, {"Authorization": f"Bearer {create_access_token(str(admin_id))}"})
+    with SessionLocal() as db:
+        _seed_people(db, dataset)
+        db.commit()
+    return dataset
+
+
+@pytest.fixture(scope="session")
+def seeded(request, dataset: Dataset) -> Seeded:
+    scale = request.param
+    with SessionLocal() as db:
+        for unit in range(dataset.units, scale):
+            _seed_unit(db, dataset, unit)
+        dataset.units = max(dataset.units, scale)
+        # One warm-up request plus the timed ones
+        targets = _seed_write_targets(db, dataset, scale, request.config.getoption("budget_repeat") + 1)
+        db.commit()
+    tokens = {role: create_access_token(str(user_id)) for role, user_id in dataset.users.items()}
+    return Seeded(scale=scale, ids=dict(dataset.ids), tokens=tokens, targets=targets)
+
+
+@pytest.fixture(scope="session")
+def statement_baseline() -> dict[str, int]:
+    """Statements per case at the smallest scale, to compare larger ones against."""
+    return {}
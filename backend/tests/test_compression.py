@@ -0,0 +1,58 @@
+"""Content negotiation and validators of compressed responses."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import CompressionMiddleware
+from app.middleware.compression import _accepted_encodings
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", {"gzip"}),
+        ("*", {"br", "gzip", "*"}),
+        ("gzip;q=0, *", {"br", "*"}),
+        ("br;q=0, gzip;q=0, *", {"*"}),
+        ("gzip;q=0.5, br;q=0", {"gzip"}),
+        ("identity", {"identity"}),
+    ],
+)
+def test_accepted_encodings(header, expected):
+    assert _accepted_encodings(header) == expected
+
+
+@pytest.fixture
+def client(tmp_path):
+    page = tmp_path / "page.txt"
+    page.write_text("procurement " * 500)
+    app = FastAPI()
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("quotation " * 500)
+
+    @app.get("/file")
+    def file():
+        return FileResponse(page)
+
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_star_does_not_bring_back_a_refused_coding(client):
+    response = client.get("/text", headers={"Accept-Encoding": "gzip;q=0, br;q=0, *"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_file_gets_a_weak_etag(client):
+    plain = client.get("/file", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/file", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert not plain.headers["etag"].startswith("W/")
+    assert compressed.headers["etag"] == f"W/{plain.headers['etag']}"
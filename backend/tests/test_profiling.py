@@ -0,0 +1,43 @@
+"""Profiled requests report the same statements as unprofiled ones."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, get_db
+from app.middleware import ProfilingMiddleware, QueryStatsMiddleware
+from app.models import User, UserRole
+from app.utils import profiling
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def profiled_client(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling.settings, "profiling_dir", tmp_path)
+    app = FastAPI()
+
+    @app.get("/users")
+    def list_users(db: Session = Depends(get_db)):
+        return {"users": len(db.scalars(select(User.id)).all())}
+
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(QueryStatsMiddleware, report_headers=True, repeat_threshold=0)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_profiling_lookup_is_not_counted(profiled_client):
+    with SessionLocal() as db:
+        admin_id = db.scalars(select(User.id).where(User.role == UserRole.superadmin)).first()
+    headers = {"Authorization": f"Bearer {create_access_token(str(admin_id))}"}
+
+    plain = profiled_client.get("/users", headers=headers)
+    profiled = profiled_client.get("/users", headers={**headers, "X-Profile": "1"})
+
+    assert "x-profile-id" in profiled.headers
+    assert profiled.headers["x-db-query-count"] == plain.headers["x-db-query-count"] == "1"
+    assert [report.id for report in profiling.list_reports()] == [profiled.headers["x-profile-id"]]
@@ -0,0 +1,133 @@
+"""SQL statement counts and latency of every router at several data scales.
+
+Each case is requested in-process once to warm up, then ``--budget-repeat``
+times. It fails when it:
+
+* does not answer its expected status (this includes breaking its query
+  budget, which answers 500 under ``QUERY_BUDGET_STRICT``);
+* takes longer than its latency ceiling (median of the timed requests);
+* repeats one statement shape ``--budget-repeat-threshold`` times or more;
+* issues more statements at a larger scale than at the smallest one. This
+  catches N+1 patterns on routes that declare no budget.
+
+Write cases consume one fresh target per request, seeded by ``conftest.py``::
+
+    pytest tests/test_query_budget.py --budget-scales 1,5,20 --budget-latency-ms 300
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+
+@dataclass(frozen=True)
+class Case:
+    role: str
+    # Formatted with the ids of the seeded probe records, or of the target
+    path: str
+    method: str = "GET"
+    status: int = 200
+    # Write cases: the conftest target list each request takes one from
+    target: Optional[str] = None
+    # Overrides --budget-latency-ms
+    latency_ms: Optional[float] = None
+
+    @property
+    def id(self) -> str:
+        return f"{self.role} {self.method} {self.path}"
+
+
+CASES = [
+    # auth / setup
+    Case("superadmin", "/api/auth/me"),
+    Case("superadmin", "/api/setup/status"),
+    # admin
+    Case("superadmin", "/api/admin/users"),
+    Case("superadmin", "/api/admin/departments"),
+    Case("superadmin", "/api/admin/departments/stats"),
+    Case("superadmin", "/api/admin/suppliers"),
+    Case("superadmin", "/api/admin/suppliers/directory"),
+    Case("superadmin", "/api/admin/suppliers/{supplier_id}"),
+    Case("superadmin", "/api/admin/suppliers/{supplier_id}/user"),
+    Case("superadmin", "/api/admin/categories"),
+    Case("superadmin", "/api/admin/categories/{category_id}/details"),
+    Case("superadmin", "/api/admin/analytics/summary"),
+    Case("superadmin", "/api/admin/company-settings"),
+    Case("superadmin", "/api/admin/profiles"),
+    # rfqs
+    Case("procurement", "/api/rfqs/"),
+    Case("finance", "/api/rfqs/pending-finance-approvals"),
+    Case("finance", "/api/rfqs/finance-approved"),
+    Case("procurement", "/api/rfqs/purchase-orders"),
+    Case("procurement", "/api/rfqs/{rfq_id}"),
+    Case("supplier", "/api/rfqs/{rfq_id}/quotations", method="POST", status=201, target="submit"),
+    Case("procurement", "/api/rfqs/{rfq_id}/quotations/{quotation_id}/approve", method="POST", target="approve"),
+    # suppliers
+    Case("supplier", "/api/suppliers/me/profile"),
+    Case("supplier", "/api/suppliers/me/invitations"),
+    Case("supplier", "/api/suppliers/me/invitations/{rfq_id}"),
+    Case("supplier", "/api/suppliers/me/rfqs/active"),
+    Case("supplier", "/api/suppliers/me/summary"),
+    Case("supplier", "/api/suppliers/me/purchase-orders"),
+    # messages
+    Case("procurement", "/api/messages/received"),
+    Case("procurement", "/api/messages/sent"),
+    Case("procurement", "/api/messages/conversation/{supplier_id}"),
+    Case("supplier", "/api/messages/received"),
+    # requests
+    Case("requester", "/api/requests/me"),
+    Case("requester", "/api/requests/categories"),
+    Case("requester", "/api/requests/departments"),
+    Case("procurement", "/api/requests/"),
+    Case("procurement", "/api/requests/{request_id}"),
+    Case("procurement", "/api/requests/{request_id}/invite-suppliers", method="POST", target="invite"),
+    Case("head_of_department", "/api/requests/"),
+    # search
+    Case("procurement", "/api/search?q=laptop"),
+]
+
+
+def _send(client, case: Case, seeded):
+    headers = seeded.headers(case.role)
+    if case.target is None:
+        return client.request(case.method, case.path.format(**seeded.ids), headers=headers)
+    target = seeded.targets[case.target].pop()
+    return client.request(
+        case.method,
+        case.path.format(**target["ids"]),
+        headers=headers,
+        data=target.get("data"),
+        json=target.get("json"),
+    )
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case.id)
+def test_query_budget(case: Case, seeded, client, statement_baseline, pytestconfig) -> None:
+    _send(client, case, seeded)
+    timings = []
+    for _ in range(pytestconfig.getoption("budget_repeat")):
+        started = time.perf_counter()
+        response = _send(client, case, seeded)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    assert response.status_code == case.status, f"HTTP {response.status_code}: {response.text[:300]}"
+
+    ceiling = case.latency_ms or pytestconfig.getoption("budget_latency_ms")
+    median_ms = statistics.median(timings)
+    assert median_ms <= ceiling, f"{median_ms:.0f} ms (ceiling {ceiling:.0f} ms)"
+
+    repeat_threshold = pytestconfig.getoption("budget_repeat_threshold")
+    max_repeats = int(response.headers.get("x-db-max-repeats", 0))
+    if repeat_threshold:
+        assert max_repeats < repeat_threshold, f"one statement repeated {max_repeats} times (possible N+1)"
+
+    # The smallest scale runs first and sets the baseline
+    statements = int(response.headers["x-db-query-count"])
+    baseline = statement_baseline.setdefault(case.id, statements)
+    growth = pytestconfig.getoption("budget_growth")
+    assert statements <= baseline + growth, f"{statements} statements, {baseline} at the smallest scale"
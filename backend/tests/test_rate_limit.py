@@ -0,0 +1,106 @@
+"""Token buckets in each rate limit storage."""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils import rate_limit
+from app.utils.rate_limit import Limiter, RedisStorage, SQLiteStorage
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock, time=clock))
+    return clock
+
+
+@pytest.fixture
+def client():
+    limiter = Limiter("memory://")
+    app = FastAPI()
+
+    @app.get("/login", dependencies=[Depends(limiter.limit("3/minute"))])
+    def login():
+        return {}
+
+    @app.get("/exports/pdf", dependencies=[Depends(limiter.limit("4/minute", cost=2, scope="exports"))])
+    def export_pdf():
+        return {}
+
+    @app.get("/exports/csv", dependencies=[Depends(limiter.limit("4/minute", scope="exports"))])
+    def export_csv():
+        return {}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_memory_bucket_exhausts_and_refills(client, clock):
+    assert [client.get("/login").status_code for _ in range(3)] == [200, 200, 200]
+
+    blocked = client.get("/login")
+    assert blocked.status_code == 429
+    # One token every 20 seconds at 3/minute
+    assert blocked.headers["Retry-After"] == "20"
+
+    clock.now += 19
+    assert client.get("/login").status_code == 429
+    clock.now += 1
+    assert client.get("/login").status_code == 200
+    assert client.get("/login").status_code == 429
+
+
+def test_scoped_routes_share_a_bucket(client, clock):
+    assert client.get("/exports/pdf").status_code == 200
+    assert client.get("/exports/csv").status_code == 200
+    assert client.get("/exports/pdf").status_code == 429
+    assert client.get("/exports/csv").status_code == 200
+    assert client.get("/exports/csv").status_code == 429
+
+
+def test_sqlite_bucket_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    workers = [SQLiteStorage(path), SQLiteStorage(path)]
+    allowed = []
+
+    def spend(storage: SQLiteStorage) -> None:
+        for _ in range(10):
+            allowed.append(storage.consume("login:client", capacity=8, rate=8 / 86400, cost=1).allowed)
+
+    threads = [threading.Thread(target=spend, args=(workers[n % 2],)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(allowed) == 40
+    assert allowed.count(True) == 8
+
+
+def test_redis_script_against_fakeredis():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    storage = RedisStorage(fakeredis.FakeRedis())
+
+    decisions = [storage.consume("login:client", capacity=2, rate=20, cost=1) for _ in range(3)]
+    assert [decision.allowed for decision in decisions] == [True, True, False]
+    assert 0 < decisions[-1].retry_after <= 1 / 20
+
+    time.sleep(0.1)
+    assert storage.consume("login:client", capacity=2, rate=20, cost=1).allowed
+    assert storage.client.pttl(storage.prefix + "login:client") > 0
@@ -0,0 +1,174 @@
+"""Read replica routing, with two SQLite files standing in for primary and replica.
+
+The app's engines are built at import time from the suite's single
+database, so these tests swap :mod:`app.database`'s session factory and
+replica engine for ones bound to the two files, and serve a small app
+that depends on :func:`~app.database.get_read_db` directly.
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, String, create_engine, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+
+from app import database
+from app.database import READ_PRIMARY_HEADER, RoutingSession, get_async_read_db, get_read_db
+from app.middleware import ReadYourWritesMiddleware
+from app.models import Department
+from app.services.department_stats import department_stats, invalidate_department_stats
+
+
+Base = declarative_base()
+
+
+class Marker(Base):
+    __tablename__ = "markers"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(20), nullable=False)
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "primary"), (replica, "replica")):
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            db.add(Marker(id=1, name=name))
+            db.commit()
+    monkeypatch.setattr(database, "read_engine", replica)
+    monkeypatch.setattr(
+        database,
+        "SessionLocal",
+        sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=primary, replica=replica),
+    )
+    async_primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    async_replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(
+        database,
+        "AsyncSessionLocal",
+        async_sessionmaker(
+            bind=async_primary,
+            sync_session_class=RoutingSession,
+            replica=async_replica.sync_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        ),
+    )
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def client(engines):
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=10)
+
+    def read_marker(db: Session) -> str:
+        return db.execute(select(Marker.name).where(Marker.id == 1)).scalar_one()
+
+    @app.get("/marker")
+    def get_marker(db: Session = Depends(get_read_db)):
+        return {"name": read_marker(db)}
+
+    @app.get("/async-marker")
+    async def get_async_marker(db: AsyncSession = Depends(get_async_read_db)):
+        return {"name": (await db.execute(select(Marker.name).where(Marker.id == 1))).scalar_one()}
+
+    @app.get("/flush-then-read")
+    def flush_then_read(db: Session = Depends(get_read_db)):
+        before = read_marker(db)
+        db.add(Marker(id=2, name="added"))
+        db.flush()
+        return {"before": before, "after": read_marker(db)}
+
+    @app.get("/bulk-update")
+    def bulk_update(db: Session = Depends(get_read_db)):
+        db.execute(update(Marker).where(Marker.id == 1).values(name="updated"))
+        return {}
+
+    @app.post("/marker")
+    def post_marker():
+        return {}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _names(engine) -> list[str]:
+    with Session(engine) as db:
+        return list(db.scalars(select(Marker.name).order_by(Marker.id)))
+
+
+def test_get_reads_the_replica(client):
+    assert client.get("/marker").json() == {"name": "replica"}
+
+
+def test_async_get_reads_the_replica(client):
+    assert client.get("/async-marker").json() == {"name": "replica"}
+    headers = {READ_PRIMARY_HEADER: f"{time.time() + 5:.3f}"}
+    assert client.get("/async-marker", headers=headers).json() == {"name": "primary"}
+
+
+def test_reads_after_a_flush_use_the_primary(client, engines):
+    primary, replica = engines
+    assert client.get("/flush-then-read").json() == {"before": "replica", "after": "primary"}
+    assert _names(primary) == ["primary", "added"]
+    assert _names(replica) == ["replica"]
+
+
+def test_bulk_update_goes_to_the_primary(client, engines):
+    primary, replica = engines
+    assert client.get("/bulk-update").status_code == 200
+    assert _names(primary) == ["updated"]
+    assert _names(replica) == ["replica"]
+
+
+def test_pinned_client_reads_the_primary(client):
+    headers = {READ_PRIMARY_HEADER: f"{time.time() + 5:.3f}"}
+    assert client.get("/marker", headers=headers).json() == {"name": "primary"}
+
+
+def test_expired_pin_reads_the_replica(client):
+    headers = {READ_PRIMARY_HEADER: f"{time.time() - 1:.3f}"}
+    assert client.get("/marker", headers=headers).json() == {"name": "replica"}
+
+
+@pytest.mark.parametrize("until", ["inf", "nan", "1e300", "not-a-time"])
+def test_out_of_window_pin_is_ignored(client, until):
+    assert client.get("/marker", headers={READ_PRIMARY_HEADER: until}).json() == {"name": "replica"}
+
+
+def test_pin_beyond_the_sticky_window_is_ignored(client):
+    headers = {READ_PRIMARY_HEADER: f"{time.time() + 3600:.3f}"}
+    assert client.get("/marker", headers=headers).json() == {"name": "replica"}
+
+
+def test_department_stats_are_computed_on_the_primary(engines):
+    primary, replica = engines
+    for engine in engines:
+        database.Base.metadata.create_all(engine)
+    with Session(primary) as db:
+        db.add(Department(name="Only on the primary"))
+        db.commit()
+
+    invalidate_department_stats()
+    with database.SessionLocal(info={"read_only": True}) as db:
+        names = [row["name"] for row in department_stats(db)]
+    invalidate_department_stats()
+    assert names == ["Only on the primary"]
+
+
+def test_unsafe_methods_get_the_pin_header(client):
+    response = client.post("/marker")
+    until = float(response.headers[READ_PRIMARY_HEADER])
+    assert time.time() < until <= time.time() + 10
+    assert READ_PRIMARY_HEADER not in client.get("/marker").headers
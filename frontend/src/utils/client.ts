@@ -12,6 +12,11 @@ export const apiClient = axios.create({
   timeout: 30000, // 30 second timeout for Render cold starts
 });
 
+// After a write the API returns X-Read-Primary-Until; echoing it until it
+// passes keeps our reads off a lagging read replica.
+const READ_PRIMARY_HEADER = "X-Read-Primary-Until";
+let readPrimaryUntil = 0;
+
 // Add request interceptor to always include the auth token
 apiClient.interceptors.request.use(
   (config) => {
@@ -19,6 +24,9 @@ apiClient.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    if (readPrimaryUntil > Date.now() / 1000) {
+      config.headers[READ_PRIMARY_HEADER] = String(readPrimaryUntil);
+    }
     return config;
   },
   (error) => {
@@ -28,7 +36,13 @@ apiClient.interceptors.request.use(
 
 // Add response interceptor to handle authentication errors
 apiClient.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const pin = Number(response.headers[READ_PRIMARY_HEADER.toLowerCase()]);
+    if (pin > readPrimaryUntil) {
+      readPrimaryUntil = pin;
+    }
+    return response;
+  },
   (error) => {
     if (error.response?.status === 401) {
       // Token expired or invalid - clear storage and redirect to login
@@ -3,12 +3,114 @@ Demo Data Setup Script
 Creates sample users, categories, and data for testing the new features.
 """
 
-import requests
 import json
-from datetime import datetime, timedelta
+
+try:
+    import requests
+except ImportError:  # pragma: no cover - only needed to talk to a running server
+    requests = None
 
 BASE_URL = "http://localhost:8000"
 
+# Fixtures shared with the backend/tests query budget suite, which seeds
+# them through the API in-process instead of against a running server.
+DEMO_CATEGORIES = [
+    {
+        "name": "IT Equipment",
+        "description": "Computers, servers, networking equipment, software licenses"
+    },
+    {
+        "name": "Office Supplies",
+        "description": "Stationery, paper, pens, furniture, office accessories"
+    },
+    {
+        "name": "Consulting Services",
+        "description": "Professional services, advisory, training, auditing"
+    },
+    {
+        "name": "Construction Materials",
+        "description": "Building materials, cement, steel, tools"
+    },
+    {
+        "name": "Maintenance Services",
+        "description": "Facility maintenance, repairs, cleaning services"
+    },
+    {
+        "name": "Marketing & Advertising",
+        "description": "Branding, digital marketing, printing, promotional materials"
+    }
+]
+
+DEMO_USERS = [
+    {
+        "email": "jane.procurement@procurahub.local",
+        "full_name": "Jane Smith",
+        "password": "password123",
+        "role": "Procurement"
+    },
+    {
+        "email": "john.procurement@procurahub.local",
+        "full_name": "John Doe",
+        "password": "password123",
+        "role": "Procurement"
+    },
+    {
+        "email": "sarah.finance@procurahub.local",
+        "full_name": "Sarah Johnson",
+        "password": "password123",
+        "role": "Finance"
+    },
+    {
+        "email": "mike.finance@procurahub.local",
+        "full_name": "Mike Williams",
+        "password": "password123",
+        "role": "Finance"
+    },
+    {
+        "email": "lisa.requester@procurahub.local",
+        "full_name": "Lisa Brown",
+        "password": "password123",
+        "role": "Requester"
+    },
+    {
+        "email": "david.requester@procurahub.local",
+        "full_name": "David Miller",
+        "password": "password123",
+        "role": "Requester"
+    }
+]
+
+DEMO_RFQS = [
+    {
+        "title": "Office Laptops Procurement",
+        "description": "Need 20 laptops for new employees. Specs: i5/16GB/512GB SSD",
+        "category": "IT Equipment",
+        "budget": 25000,
+        "currency": "USD",
+    },
+    {
+        "title": "Annual Office Stationery Supply",
+        "description": "Bulk order for office supplies for the entire year",
+        "category": "Office Supplies",
+        "budget": 5000,
+        "currency": "USD",
+    },
+    {
+        "title": "IT Consulting Services",
+        "description": "Need consultant for digital transformation project",
+        "category": "Consulting Services",
+        "budget": 15000,
+        "currency": "USD",
+    }
+]
+
+
+def demo_rfqs(days_open=30):
+    """DEMO_RFQS as create payloads, closing ``days_open`` days from now."""
+    # The API takes the deadline as a number of days from today
+    return [{**rfq, "deadline_days": days_open} for rfq in DEMO_RFQS]
+
+
 def get_admin_token():
     """Login as SuperAdmin and get token."""
     response = requests.post(
@@ -23,37 +125,11 @@ def get_admin_token():
 
 def create_sample_categories(headers):
     """Create sample procurement categories."""
-    categories = [
-        {
-            "name": "IT Equipment",
-            "description": "Computers, servers, networking equipment, software licenses"
-        },
-        {
-            "name": "Office Supplies",
-            "description": "Stationery, paper, pens, furniture, office accessories"
-        },
-        {
-            "name": "Consulting Services",
-            "description": "Professional services, advisory, training, auditing"
-        },
-        {
-            "name": "Construction Materials",
-            "description": "Building materials, cement, steel, tools"
-        },
-        {
-            "name": "Maintenance Services",
-            "description": "Facility maintenance, repairs, cleaning services"
-        },
-        {
-            "name": "Marketing & Advertising",
-            "description": "Branding, digital marketing, printing, promotional materials"
-        }
-    ]
     
     print("\n📁 Creating Sample Categories...")
     print("=" * 60)
     
-    for cat in categories:
+    for cat in DEMO_CATEGORIES:
         try:
             response = requests.post(
                 f"{BASE_URL}/api/admin/categories",
@@ -70,49 +146,11 @@ def create_sample_categories(headers):
 
 def create_sample_users(headers):
     """Create sample users with different roles."""
-    users = [
-        {
-            "email": "jane.procurement@procurahub.local",
-            "full_name": "Jane Smith",
-            "password": "password123",
-            "role": "Procurement"
-        },
-        {
-            "email": "john.procurement@procurahub.local",
-            "full_name": "John Doe",
-            "password": "password123",
-            "role": "Procurement"
-        },
-        {
-            "email": "sarah.finance@procurahub.local",
-            "full_name": "Sarah Johnson",
-            "password": "password123",
-            "role": "Finance"
-        },
-        {
-            "email": "mike.finance@procurahub.local",
-            "full_name": "Mike Williams",
-            "password": "password123",
-            "role": "Finance"
-        },
-        {
-            "email": "lisa.requester@procurahub.local",
-            "full_name": "Lisa Brown",
-            "password": "password123",
-            "role": "Requester"
-        },
-        {
-            "email": "david.requester@procurahub.local",
-            "full_name": "David Miller",
-            "password": "password123",
-            "role": "Requester"
-        }
-    ]
     
     print("\n👥 Creating Sample Users...")
     print("=" * 60)
     
-    for user in users:
+    for user in DEMO_USERS:
         try:
             response = requests.post(
                 f"{BASE_URL}/api/admin/users",
@@ -129,40 +167,11 @@ def create_sample_users(headers):
 
 def create_sample_rfqs(headers):
     """Create sample RFQs."""
-    # Use datetime string format that the API expects
-    deadline = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S")
-    
-    rfqs = [
-        {
-            "title": "Office Laptops Procurement",
-            "description": "Need 20 laptops for new employees. Specs: i5/16GB/512GB SSD",
-            "category": "IT Equipment",
-            "budget": 25000,
-            "currency": "USD",
-            "deadline": deadline
-        },
-        {
-            "title": "Annual Office Stationery Supply",
-            "description": "Bulk order for office supplies for the entire year",
-            "category": "Office Supplies",
-            "budget": 5000,
-            "currency": "USD",
-            "deadline": deadline
-        },
-        {
-            "title": "IT Consulting Services",
-            "description": "Need consultant for digital transformation project",
-            "category": "Consulting Services",
-            "budget": 15000,
-            "currency": "USD",
-            "deadline": deadline
-        }
-    ]
     
     print("\n📝 Creating Sample RFQs...")
     print("=" * 60)
     
-    for rfq in rfqs:
+    for rfq in demo_rfqs():
         try:
             response = requests.post(
                 f"{BASE_URL}/api/rfqs/",  # Added trailing slash
@@ -222,6 +231,9 @@ def show_summary(headers):
 
 def main():
     """Main setup function."""
+    if requests is None:
+        raise SystemExit("This script needs the 'requests' package: pip install requests")
+
     print("\n" + "=" * 60)
     print("🚀 ProcuraHub Demo Data Setup")
     print("=" * 60)